@@ -26,7 +26,7 @@ from ..model.NodeRole import NodeRole
 from ..model.CPController import CPController
 from ..model.CPLogging import CPLogging as KenLog
 from ..model.Cidr import Cidr
-from ..model.StatePersistor import StatePersistor
+from ..model.StatePersistorRegistry import StatePersistorRegistry
 
 
 LOG = logging.getLogger(__name__)
@@ -50,8 +50,8 @@ class NetworkConfigController(CPController):
 
     def _initialize_cache_if_necessary(self):
         if not self._cache:
-            self._cache = StatePersistor(self._models, self._controllers,
-                                         persistence_file='ip_addresses.yml')
+            self._cache = StatePersistorRegistry.get(
+                self._models, self._controllers, 'ip_addresses.yml')
 
     @property
     def networks_json(self):
@@ -13,8 +13,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 #
-from ..model.JsonConfigFile import JsonConfigFile
-from ..model.YamlConfigFile import YamlConfigFile
+from ..model.ConfigFileCache import ConfigFileCache
 
 
 class CloudName(object):
@@ -23,15 +22,8 @@ class CloudName(object):
 
     @staticmethod
     def get_cloud_name(file_name):
-        if file_name.endswith('.json'):
-            cf = JsonConfigFile('cloudConfig', file_name)
-            cf.load()
-
-        elif file_name.endswith('.yml') or file_name.endswith('.yaml'):
-            cf = YamlConfigFile('cloudConfig', file_name)
-            cf.load()
-
-        else:
+        cf = ConfigFileCache.load(file_name, 'cloudConfig')
+        if not cf:
             return ''
 
         element = cf.contents
@@ -0,0 +1,74 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import heapq
+from collections import namedtuple
+
+
+AddressRange = namedtuple('AddressRange', ['name', 'start', 'end', 'value'])
+
+
+class AddressRanges(object):
+    """A set of named, inclusive address ranges.
+
+    start and end are netaddr IPAddress objects (or anything with an
+    int() value and a version).  Ranges of different IP versions never
+    overlap.
+    """
+    def __init__(self):
+        self._ranges = []
+
+    def add(self, name, start, end, value=None):
+        self._ranges.append(AddressRange(name, start, end, value))
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def overlaps(self):
+        """Return every pair of ranges that share at least one address,
+        including ranges that contain each other.
+
+        The ranges are sorted by start address and swept once, keeping
+        the ranges that are still open in a heap ordered on their end
+        address, so this is O(n log n + number of overlaps).  Pairs are
+        returned in sweep order, with the range that comes first in the
+        sort as the first item: the one that starts first, then the one
+        that ends first, then the one that was added first.
+        """
+        ordered = sorted(
+            enumerate(self._ranges),
+            key=lambda r: (r[1].start.version, int(r[1].start),
+                           int(r[1].end), r[0]))
+
+        result = []
+        open_ranges = []
+        version = None
+        for index, addr_range in ordered:
+            start = int(addr_range.start)
+            if addr_range.start.version != version:
+                version = addr_range.start.version
+                open_ranges = []
+
+            while open_ranges and open_ranges[0][0] < start:
+                heapq.heappop(open_ranges)
+
+            for _, other_index, other in sorted(open_ranges,
+                                                key=lambda r: r[1]):
+                result.append((other, addr_range))
+
+            heapq.heappush(open_ranges,
+                           (int(addr_range.end), index, addr_range))
+
+        return result
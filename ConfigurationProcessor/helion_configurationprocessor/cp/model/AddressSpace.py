@@ -0,0 +1,122 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from netaddr import IPNetwork, IPAddress, AddrFormatError
+
+
+class AddressSpace(object):
+    """The addresses of a network that can be given to hosts.
+
+    These are the addresses of the cidr less the first (network) and
+    last (broadcast) addresses, narrowed by start-address and
+    end-address, and without the gateway-ip.  Addresses are handled as
+    integer values, so no operation depends on the size of the network,
+    and IPv4 and IPv6 networks are treated alike.
+    """
+    def __init__(self, cidr, start_address=None, end_address=None,
+                 gateway_ip=None):
+        self.cidr = IPNetwork(unicode(cidr))
+        self.version = self.cidr.version
+
+        self.cidr_start = self.cidr[1]
+        self.cidr_end = self.cidr[-2]
+
+        self.start = self.cidr_start
+        if start_address is not None:
+            self.start = IPAddress(start_address)
+
+        self.end = self.cidr_end
+        if end_address is not None:
+            self.end = IPAddress(end_address)
+
+        self.gateway = None
+        if gateway_ip is not None:
+            self.gateway = IPAddress(gateway_ip)
+
+        self.first = int(self.start)
+        self.last = int(self.end)
+
+        self._gateway = None
+        if self.gateway is not None and self.gateway.version == self.version:
+            self._gateway = int(self.gateway)
+
+    @classmethod
+    def from_network(cls, net):
+        return cls(net['cidr'], net.get('start-address'),
+                   net.get('end-address'), net.get('gateway-ip'))
+
+    @property
+    def size(self):
+        size = max(self.last - self.first + 1, 0)
+        if self._gateway is not None and \
+                self.first <= self._gateway <= self.last:
+            size -= 1
+
+        return size
+
+    def _parse(self, address):
+        if isinstance(address, IPAddress):
+            return address
+
+        try:
+            return IPAddress(address)
+        except (AddrFormatError, ValueError, TypeError):
+            return None
+
+    def in_range(self, address):
+        """Whether address is between the start and end addresses.  The
+        gateway is not excluded.
+        """
+        ip_addr = self._parse(address)
+        return (ip_addr is not None and ip_addr.version == self.version and
+                self.first <= ip_addr.value <= self.last)
+
+    def value(self, address):
+        """Return the integer value of address if it can be given to a
+        host, otherwise None.
+        """
+        if not self.in_range(address):
+            return None
+
+        value = self._parse(address).value
+        if value == self._gateway:
+            return None
+
+        return value
+
+    def has_value(self, value):
+        """Whether the integer value of an address of this version can be
+        given to a host.
+        """
+        return self.first <= value <= self.last and value != self._gateway
+
+    def next_value(self, value):
+        """Return the lowest value at or above value that can be given to
+        a host, or None if there is none.
+        """
+        value = max(value, self.first)
+        if value == self._gateway:
+            value += 1
+
+        if value > self.last:
+            return None
+
+        return value
+
+    def address(self, value):
+        return str(IPAddress(value, self.version))
+
+    def __contains__(self, address):
+        return self.value(address) is not None
@@ -54,6 +54,12 @@ class BuilderPlugin(PluginBase):
         """
         pass
 
+    def get_worker_state(self):
+        return self._warnings, self._errors, self._artifacts
+
+    def set_worker_state(self, state):
+        self._warnings, self._errors, self._artifacts = state
+
     def get_artifacts(self):
         """ The builder is responsible for keeping track of the artifacts
         that it generates.  This would include paths to created or modified
@@ -14,8 +14,7 @@
 # under the License.
 #
 import os
-from .JsonConfigFile import JsonConfigFile
-from .YamlConfigFile import YamlConfigFile
+from .ConfigFileCache import ConfigFileCache
 
 
 class CPConfigFile(object):
@@ -34,8 +33,7 @@ class CPConfigFile(object):
 
     @staticmethod
     def parse_json(filename):
-        json_config = JsonConfigFile('json_file', filename)
-        json_config.load()
+        json_config = ConfigFileCache.load(filename, 'json_file')
         if json_config.is_valid():
             return json_config.contents
 
@@ -43,8 +41,7 @@ class CPConfigFile(object):
 
     @staticmethod
     def parse_yaml(filename):
-        yaml_config = YamlConfigFile('yaml_file', filename)
-        yaml_config.load()
+        yaml_config = ConfigFileCache.load(filename, 'yaml_file')
         if yaml_config.is_valid():
             return yaml_config.contents
 
@@ -71,8 +68,7 @@ class CPConfigFile(object):
 
     @staticmethod
     def get_json_errors(filename):
-        json_config = JsonConfigFile('json_file', filename)
-        json_config.load()
+        json_config = ConfigFileCache.load(filename, 'json_file')
         if json_config.is_valid():
             return None
 
@@ -80,8 +76,7 @@ class CPConfigFile(object):
 
     @staticmethod
     def get_yaml_errors(filename):
-        yaml_config = YamlConfigFile('yaml_file', filename)
-        yaml_config.load()
+        yaml_config = ConfigFileCache.load(filename, 'yaml_file')
         if yaml_config.is_valid():
             return None
 
@@ -89,8 +84,7 @@ class CPConfigFile(object):
 
     @staticmethod
     def get_yaml_warnings(filename):
-        yaml_config = YamlConfigFile('yaml_file', filename)
-        yaml_config.load()
+        yaml_config = ConfigFileCache.load(filename, 'yaml_file')
         return yaml_config.warnings
 
     @staticmethod
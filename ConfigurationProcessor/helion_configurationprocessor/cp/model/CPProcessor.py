@@ -19,9 +19,8 @@ import logging
 from abc import ABCMeta
 from abc import abstractmethod
 
-from stevedore import driver
-
 from .CPLogging import CPLogging as KenLog
+from .PluginRegistry import PluginRegistry
 from ..model.DependencyCalculator import DependencyCalculator
 
 
@@ -39,6 +38,10 @@ class CPProcessor(object):
         self._errors = []
         self._warnings = []
 
+        # Plugins instantiated by this processor, keyed on namespace and
+        # name, so that each is only constructed once per stage
+        self._plugins = dict()
+
     @abstractmethod
     def process(self):
         """ This is called to perform the process, kinda like the command
@@ -58,11 +61,14 @@ class CPProcessor(object):
         self.log_and_print_message(KenLog.fcn(), msg)
 
     def load_plugin(self, namespace, plugin_name, invoke_args):
+        key = (namespace, plugin_name)
+        if key in self._plugins:
+            return self._plugins[key]
+
         try:
-            mgr = driver.DriverManager(
-                namespace='helion.configurationprocessor.%s' % namespace,
-                name=plugin_name, invoke_on_load=True,
-                invoke_args=invoke_args)
+            mgr = PluginRegistry.load(
+                'helion.configurationprocessor.%s' % namespace,
+                plugin_name, invoke_args)
         except RuntimeError as e:
             msg = '%s %s Failed to load: %s' % (
                 self._processor_type, plugin_name, e)
@@ -74,13 +80,15 @@ class CPProcessor(object):
             self.log_and_print_error(KenLog.fcn(), msg)
             return None
 
+        self._plugins[key] = mgr
         return mgr
 
     def validate_plugin_version(self, mgr, _):
         return (int(mgr.driver.get_model_version()) !=
                 int(self._instructions['model_version']))
 
-    def get_plugin_order(self, plugin_type_s, plugin_type_p, invoke_args):
+    def _calculate_plugin_order(self, plugin_type_s, plugin_type_p,
+                                invoke_args):
         plugins = []
 
         for p in self._instructions[plugin_type_p]:
@@ -88,6 +96,9 @@ class CPProcessor(object):
             if not mgr:
                 continue
 
+            # The stage runs plugins by slug, so make sure it gets this
+            # instance back from load_plugin()
+            self._plugins[(plugin_type_s, mgr.driver.slug)] = mgr
             plugins.append(mgr.driver)
 
         calculator = DependencyCalculator(plugins)
@@ -96,8 +107,24 @@ class CPProcessor(object):
         if not calculator.ok:
             self.add_errors(calculator.errors)
 
+        return calculator
+
+    def get_plugin_order(self, plugin_type_s, plugin_type_p, invoke_args):
+        calculator = self._calculate_plugin_order(
+            plugin_type_s, plugin_type_p, invoke_args)
+
         return calculator.get()
 
+    def get_plugin_levels(self, plugin_type_s, plugin_type_p, invoke_args):
+        """ Like get_plugin_order(), but the plugins are grouped into
+        levels.  The plugins in a level only depend on plugins in earlier
+        levels, so they can be run concurrently.
+        """
+        calculator = self._calculate_plugin_order(
+            plugin_type_s, plugin_type_p, invoke_args)
+
+        return calculator.get_levels()
+
     def _build_line(self, plugin_name, output_type, output_text):
         line = '#   %s' % plugin_name
         while len(line) < 30:
@@ -14,10 +14,15 @@
 # under the License.
 #
 import os
+import re
 import json
 import yaml
 import base64
 import string
+import binascii
+import multiprocessing
+
+import six
 
 from cryptography.fernet import Fernet
 from cryptography.fernet import InvalidToken
@@ -46,7 +51,44 @@ def ispunct(s):
     return any(c in string.punctuation for c in s)
 
 
+# A Fernet token is the url-safe base64 encoding of a version byte, an 8
+# byte timestamp, a 16 byte IV, whole 16 byte blocks of ciphertext and a
+# 32 byte HMAC
+_TOKEN_VERSION = 0x80
+_TOKEN_OVERHEAD = 1 + 8 + 16 + 32
+_TOKEN_MIN_LENGTH = _TOKEN_OVERHEAD + 16
+_TOKEN_MIN_CHARS = -(-_TOKEN_MIN_LENGTH * 4 // 3)
+
+# A token as CPSecurity writes it into a file.  The version byte and the
+# high bytes of the timestamp, which are zero until 2106, encode as gAAAA
+_TOKEN_SPAN = re.compile(r'(?<![A-Za-z0-9_-])gAAAA[A-Za-z0-9_-]+={0,2}')
+
+# Batches smaller than this are not worth sending to worker processes
+_MIN_PARALLEL_BATCH = 256
+
+
+def _encrypt_chunk(args):
+    secret, plaintexts = args
+    return [CPSecurity.encrypt(secret, p) for p in plaintexts]
+
+
+def _decrypt_chunk(args):
+    secret, ciphertexts = args
+
+    plaintexts = []
+    for ciphertext in ciphertexts:
+        try:
+            plaintexts.append(CPSecurity.decrypt(secret, ciphertext))
+        except TypeError:
+            # Not a string, so not a token
+            plaintexts.append(None)
+
+    return plaintexts
+
+
 class CPSecurity(object):
+    # Fernet objects, keyed on the secret they were made from
+    _fernets = dict()
 
     @classmethod
     def make_key(cls, secret):
@@ -59,14 +101,27 @@ class CPSecurity(object):
         dec_secret = unpad(base64.urlsafe_b64decode(secret))
         return dec_secret
 
+    @classmethod
+    def _get_fernet(cls, secret):
+        f = cls._fernets.get(secret)
+        if f is None:
+            f = Fernet(secret)
+            cls._fernets[secret] = f
+
+        return f
+
+    @classmethod
+    def clear(cls):
+        cls._fernets.clear()
+
     @classmethod
     def encrypt(cls, secret, plaintext):
-        f = Fernet(secret)
+        f = cls._get_fernet(secret)
         return f.encrypt(bytes(plaintext))
 
     @classmethod
     def decrypt(cls, secret, ciphertext):
-        f = Fernet(secret)
+        f = cls._get_fernet(secret)
 
         try:
             plaintext = f.decrypt(ciphertext)
@@ -74,6 +129,111 @@ class CPSecurity(object):
         except InvalidToken:
             return None
 
+    @classmethod
+    def is_token(cls, value):
+        """Whether value has the form of a Fernet token.  This is a cheap
+        check of its length and decoded layout, so that only likely tokens
+        are given to decrypt().  The value is decoded the same way Fernet
+        decodes it, so any value that decrypt() accepts is a token.
+        """
+        if (not isinstance(value, six.string_types) or
+                len(value) < _TOKEN_MIN_CHARS):
+            return False
+
+        try:
+            data = base64.urlsafe_b64decode(str(value))
+        except (TypeError, ValueError, binascii.Error):
+            return False
+
+        return (len(data) >= _TOKEN_MIN_LENGTH and
+                (len(data) - _TOKEN_OVERHEAD) % 16 == 0 and
+                six.indexbytes(data, 0) == _TOKEN_VERSION)
+
+    @classmethod
+    def find_tokens(cls, text):
+        """Return the tokens written in text.  Only the token itself is
+        returned, without any quotes or punctuation around it.
+        """
+        return [t for t in _TOKEN_SPAN.findall(text) if cls.is_token(t)]
+
+    @classmethod
+    def replace_tokens(cls, text, plaintexts):
+        """Replace each token in text that has an entry in plaintexts,
+        a dict of token to plaintext, leaving the text around it as is.
+        """
+        def _replace(match):
+            plaintext = plaintexts.get(match.group(0))
+            if plaintext is None:
+                return match.group(0)
+
+            return plaintext
+
+        return _TOKEN_SPAN.sub(_replace, text)
+
+    @classmethod
+    def _map(cls, function, secret, values, workers):
+        values = list(values)
+
+        if workers > 1 and len(values) >= _MIN_PARALLEL_BATCH:
+            size = -(-len(values) // workers)
+            chunks = [(secret, values[i:i + size])
+                      for i in range(0, len(values), size)]
+            try:
+                pool = multiprocessing.Pool(min(workers, len(chunks)))
+            except Exception:
+                # For example in a daemonic worker process
+                pool = None
+
+            if pool:
+                try:
+                    results = pool.map(function, chunks)
+                finally:
+                    pool.close()
+                    pool.join()
+
+                return [v for chunk in results for v in chunk]
+
+        return function((secret, values))
+
+    @classmethod
+    def encrypt_many(cls, secret, plaintexts, workers=1):
+        """Encrypt each of plaintexts, returning the ciphertexts in the
+        same order.  Large batches are split across workers processes.
+        """
+        return cls._map(_encrypt_chunk, secret, plaintexts, workers)
+
+    @classmethod
+    def decrypt_many(cls, secret, ciphertexts, workers=1):
+        """Decrypt each of ciphertexts, returning the plaintexts in the
+        same order, with None for any that secret does not decrypt.
+        Large batches are split across workers processes.
+        """
+        return cls._map(_decrypt_chunk, secret, ciphertexts, workers)
+
+    @classmethod
+    def rekey(cls, prev_secret, secret, ciphertexts, workers=1):
+        """Re-encrypt a list of values from prev_secret to secret.
+
+        The new values are returned in the same order.  A value is None
+        if prev_secret does not decrypt it, or if its new ciphertext does
+        not decrypt back to the same plaintext.  Large batches are split
+        across workers processes.
+        """
+        plaintexts = cls.decrypt_many(prev_secret, ciphertexts, workers)
+        indexes = [i for i, p in enumerate(plaintexts) if p is not None]
+
+        new_ciphertexts = cls.encrypt_many(
+            secret, [plaintexts[i] for i in indexes], workers)
+        checked = cls.decrypt_many(secret, new_ciphertexts, workers)
+
+        result = [None] * len(plaintexts)
+        for i, new_ciphertext, plaintext in zip(indexes, new_ciphertexts,
+                                                checked):
+            if plaintext == plaintexts[i]:
+                result[i] = new_ciphertext
+
+        return result
+
     @classmethod
     def validate(cls, cloud_input_path, secret):
         status = True
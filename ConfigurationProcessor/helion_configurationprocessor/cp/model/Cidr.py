@@ -18,7 +18,7 @@ import logging
 from netaddr import IPNetwork
 
 from .CPLogging import CPLogging as KenLog
-from .StatePersistor import StatePersistor
+from .StatePersistorRegistry import StatePersistorRegistry
 
 
 LOG = logging.getLogger(__name__)
@@ -63,8 +63,8 @@ class Cidr(object):
         if not self._models or not self._controllers:
             return
 
-        cache = StatePersistor(
-            self._models, self._controllers, persistence_file='cidr.yml')
+        cache = StatePersistorRegistry.get(
+            self._models, self._controllers, 'cidr.yml')
 
         elem = dict()
         elem['ip_index_start'] = self._ip_index_start
@@ -79,8 +79,8 @@ class Cidr(object):
         if not self._models or not self._controllers:
             return
 
-        cache = StatePersistor(
-            self._models, self._controllers, persistence_file='cidr.yml')
+        cache = StatePersistorRegistry.get(
+            self._models, self._controllers, 'cidr.yml')
 
         cached_info = cache.recall_info([self._cidr])
         return cached_info
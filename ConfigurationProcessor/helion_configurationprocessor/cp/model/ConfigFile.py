@@ -89,5 +89,16 @@ class ConfigFile(object):
     def add_error(self, error):
         self._errors.append(error)
 
+    def get_load_state(self):
+        return (self._contents, self._warnings, self._errors,
+                self._is_loaded)
+
+    def set_load_state(self, state):
+        contents, warnings, errors, is_loaded = state
+        self._contents = contents
+        self._warnings = list(warnings)
+        self._errors = list(errors)
+        self._is_loaded = is_loaded
+
     def add_warning(self, warning):
         self._warnings.append(warning)
@@ -0,0 +1,169 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import logging
+import multiprocessing
+
+from .CPLogging import CPLogging as KenLog
+from .JsonConfigFile import JsonConfigFile
+from .YamlConfigFile import YamlConfigFile
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _parse_file(args):
+    config_class, file_name = args
+
+    config_file = config_class('config_file', file_name)
+    try:
+        config_file.load()
+    except Exception:
+        # Leave the file for ConfigFileCache.load() so that the problem
+        # is reported in the usual way
+        return None
+
+    return config_file.get_load_state()
+
+
+class ConfigFileCache(object):
+    """Per-run cache of loaded config files.
+
+    Each entry is the loaded JsonConfigFile/YamlConfigFile, so the
+    contents, warnings and errors of a file are produced by a single
+    parse.  An entry is only reused while the file's mtime and size
+    are unchanged.  ConfigurationProcessor clears the cache at the
+    start of every run.
+
+    When a ParsedFileStore is attached, files that are not in the cache
+    are restored from (or recorded in) the store instead of being parsed
+    directly.
+    """
+    _documents = dict()
+    _store = None
+
+    @classmethod
+    def load(cls, file_name, name=None):
+        config_class = cls._get_config_class(file_name)
+        if not config_class:
+            return None
+
+        key = os.path.abspath(file_name)
+        stamp = cls.get_stamp(key)
+
+        entry = cls._documents.get(key)
+        if entry and stamp and entry[0] == stamp:
+            return entry[1]
+
+        config_file = config_class(name or 'config_file', file_name)
+        if cls._store:
+            cls._store.load(config_file)
+        else:
+            config_file.load()
+
+        if stamp:
+            cls._documents[key] = (stamp, config_file)
+
+        return config_file
+
+    @classmethod
+    def preload(cls, file_names, workers):
+        """Parse the files that are not already cached in a pool of
+        worker processes.  Any file the pool could not handle is left
+        to be parsed serially by load().
+        """
+        LOG.info('%s(): workers=%d' % (KenLog.fcn(), workers))
+
+        pending = []
+        for file_name in file_names:
+            config_class = cls._get_config_class(file_name)
+            if not config_class:
+                continue
+
+            key = os.path.abspath(file_name)
+            stamp = cls.get_stamp(key)
+            if not stamp:
+                continue
+
+            entry = cls._documents.get(key)
+            if entry and entry[0] == stamp:
+                continue
+
+            config_file = config_class('config_file', file_name)
+            if cls._store and cls._store.restore(config_file):
+                cls._documents[key] = (stamp, config_file)
+                continue
+
+            pending.append((key, stamp, config_file))
+
+        if workers < 2 or len(pending) < 2:
+            return
+
+        try:
+            pool = multiprocessing.Pool(min(workers, len(pending)))
+        except Exception as e:
+            LOG.warning('Could not start worker processes, parsing '
+                        'serially: %s' % e)
+            return
+
+        try:
+            results = pool.map(
+                _parse_file,
+                [(cf.__class__, cf.path) for _, _, cf in pending])
+        except Exception as e:
+            LOG.warning('Parallel parsing failed, parsing serially: %s' % e)
+            return
+        finally:
+            pool.close()
+            pool.join()
+
+        for (key, stamp, config_file), state in zip(pending, results):
+            if state is None:
+                continue
+
+            config_file.set_load_state(state)
+            if cls._store:
+                cls._store.record(config_file)
+
+            cls._documents[key] = (stamp, config_file)
+
+    @classmethod
+    def clear(cls):
+        cls._documents.clear()
+        cls._store = None
+
+    @classmethod
+    def attach_store(cls, store):
+        cls._store = store
+
+    @staticmethod
+    def _get_config_class(file_name):
+        if file_name.endswith('.json'):
+            return JsonConfigFile
+
+        if file_name.endswith('.yml') or file_name.endswith('.yaml'):
+            return YamlConfigFile
+
+        return None
+
+    @staticmethod
+    def get_stamp(path):
+        try:
+            st = os.stat(path)
+        except (OSError, IOError):
+            return None
+
+        return st.st_mtime, st.st_size
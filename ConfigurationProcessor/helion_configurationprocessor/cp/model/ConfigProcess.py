@@ -17,8 +17,7 @@ import os
 import logging
 from abc import ABCMeta
 
-from .JsonConfigFile import JsonConfigFile
-from .YamlConfigFile import YamlConfigFile
+from .ConfigFileCache import ConfigFileCache
 from .CPLogging import CPLogging as KenLog
 
 
@@ -63,26 +62,13 @@ class ConfigProcess(object):
                                           ', '.join(paths)))
             return False
 
-        if self._file_name.endswith('.json'):
-            json_file = JsonConfigFile(self._name, path)
-            json_file.load()
-
-            if not json_file.is_valid():
-                self.add_errors(json_file.errors)
-                return False
-
-            self._model = json_file.contents
-
-        elif (self._file_name.endswith('.yaml') or
-              self._file_name.endswith('.yml')):
-            yaml_file = YamlConfigFile(self._name, path)
-            yaml_file.load()
-
-            if not yaml_file.is_valid():
-                self.add_errors(yaml_file.errors)
+        config_file = ConfigFileCache.load(path, self._name)
+        if config_file:
+            if not config_file.is_valid():
+                self.add_errors(config_file.errors)
                 return False
 
-            self._model = yaml_file.contents
+            self._model = config_file.contents
 
         return True
 
@@ -13,10 +13,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 #
+import heapq
+
 from .DependencyElement import DependencyElement
 
 
 class DependencyCalculator(object):
+    """Orders plugins so that each comes after the plugins it depends on.
+
+    Plugins are ordered with Kahn's algorithm, always taking the ready
+    plugin that came first in the input, so the order is the same as a
+    plugin-by-plugin scan of the input would give.  The plugins are
+    also grouped into levels: the plugins in a level only depend on
+    plugins in earlier levels, so they can be run in any order.
+    """
     def __init__(self, plugins):
         self._plugins = []
         for elem_p in plugins:
@@ -24,46 +34,107 @@ class DependencyCalculator(object):
             self._plugins.append(de)
 
         self._ordered_plugins = []
+        self._levels = []
         self._errors = []
 
     def __repr__(self):
         return 'DependencyCalculator: %s' % self.to_string()
 
     def calculate(self):
-        while len(self._plugins) > 0:
-            np = self._process()
-            if np == 0 and len(self._plugins) > 0:
-                if self._circular():
-                    self._ordered_plugins = []
-                    break
-
-    def get(self):
-        return [op.slug for op in self._ordered_plugins]
-
-    def _circular(self):
-        is_circular = False
+        self._ordered_plugins = []
+        self._levels = []
+        self._errors = []
 
-        for elem_p1 in self._plugins:
-            for elem_p2 in self._plugins:
-                if elem_p1 == elem_p2:
+        indexes = dict()
+        for index, elem_p in enumerate(self._plugins):
+            indexes.setdefault(elem_p.slug, []).append(index)
+
+        # For each plugin, how many dependencies are still to be run, and
+        # which plugins depend on it
+        waiting = [0] * len(self._plugins)
+        dependents = [[] for _ in self._plugins]
+        for index, elem_p in enumerate(self._plugins):
+            for slug in set(elem_p.dependencies):
+                if slug not in indexes:
+                    self._errors.append(
+                        'Missing dependency detected: %s depends on %s, '
+                        'which has not been loaded' % (elem_p.slug, slug))
+                    waiting[index] += 1
                     continue
 
-                if (elem_p1.has_dependency(elem_p2.slug) and
-                        elem_p2.has_dependency(elem_p1.slug)):
-                    error1 = 'Circular dependency detected: %s and %s are ' \
-                             'both dependent upon each other' % (
-                                 elem_p1.slug, elem_p2.slug)
-                    error2 = 'Circular dependency detected: %s and %s are ' \
-                             'both dependent upon each other' % (
-                                 elem_p2.slug, elem_p1.slug)
+                for dep_index in indexes[slug]:
+                    waiting[index] += 1
+                    dependents[dep_index].append(index)
+
+        ready = [index for index, count in enumerate(waiting) if count == 0]
+        heapq.heapify(ready)
+
+        level_of = [0] * len(self._plugins)
+        while ready:
+            index = heapq.heappop(ready)
+            elem_p = self._plugins[index]
+            self._ordered_plugins.append(elem_p)
+
+            if level_of[index] == len(self._levels):
+                self._levels.append([])
+            self._levels[level_of[index]].append(elem_p)
+
+            for dep_index in dependents[index]:
+                level_of[dep_index] = max(level_of[dep_index],
+                                          level_of[index] + 1)
+                waiting[dep_index] -= 1
+                if waiting[dep_index] == 0:
+                    heapq.heappush(ready, dep_index)
+
+        if len(self._ordered_plugins) < len(self._plugins):
+            self._find_cycles(indexes, waiting)
+
+        if self._errors:
+            self._ordered_plugins = []
+            self._levels = []
+
+    def _find_cycles(self, indexes, waiting):
+        # Every plugin left waiting depends on another plugin left waiting
+        # (or on a missing plugin), so following those dependencies from
+        # any of them either reaches a missing plugin or goes round a cycle
+        explored = set()
+        for start, elem_p in enumerate(self._plugins):
+            if not waiting[start] or start in explored:
+                continue
+
+            path = []
+            on_path = dict()
+            index = start
+            while index is not None and index not in explored:
+                on_path[index] = len(path)
+                path.append(index)
+                explored.add(index)
+
+                next_index = None
+                for slug in self._plugins[index].dependencies:
+                    for dep_index in indexes.get(slug, []):
+                        if waiting[dep_index]:
+                            next_index = dep_index
+                            break
+                    if next_index is not None:
+                        break
+
+                if next_index in on_path:
+                    cycle = [self._plugins[i].slug
+                             for i in path[on_path[next_index]:]]
+                    cycle.append(cycle[0])
+                    self._errors.append(
+                        'Circular dependency detected: %s' %
+                        ' -> '.join(cycle))
+                    break
 
-                    if (error1 not in self._errors and
-                            error2 not in self._errors):
-                        self._errors.append(error1)
+                index = next_index
 
-                    is_circular = True
+    def get(self):
+        return [op.slug for op in self._ordered_plugins]
 
-        return is_circular
+    def get_levels(self):
+        return [[op.slug for op in level] for level in self._levels]
 
     @property
     def ok(self):
@@ -80,20 +151,3 @@ class DependencyCalculator(object):
             rv += '%s, ' % elem_op.slug
 
         return rv
-
-    def _process(self):
-        for elem_p in self._plugins:
-            if not elem_p.has_dependencies():
-                self._plugins.remove(elem_p)
-                self._ordered_plugins.append(elem_p)
-                self._remove_dependency(elem_p)
-                return 1
-
-        return 0
-
-    def _remove_dependency(self, plugin):
-        for elem_op in self._plugins:
-            if elem_op == plugin:
-                continue
-
-            elem_op.remove_dependency(plugin.slug)
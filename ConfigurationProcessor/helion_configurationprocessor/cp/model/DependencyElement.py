@@ -18,7 +18,8 @@
 class DependencyElement(object):
     def __init__(self, plugin):
         self._plugin = plugin
-        self._dependencies = plugin.get_dependencies()
+        # Take a copy; the same plugin instance is run after ordering
+        self._dependencies = list(plugin.get_dependencies())
 
     @property
     def slug(self):
@@ -87,7 +87,7 @@ class ExplainerPlugin(PluginBase):
         return fp
 
     def version(self):
-        return Version.get(self.instructions['cloud_input_path'])
+        return Version.get_cloud_version(self.instructions)
 
     def _close_explainer_file(self, fp):
         fp.close()
@@ -84,7 +84,7 @@ class FinalizerPlugin(PluginBase):
         self._artifacts.append(a)
 
     def version(self):
-        return Version.get(self.instructions['cloud_input_path'])
+        return Version.get_cloud_version(self.instructions)
 
     @property
     def models(self):
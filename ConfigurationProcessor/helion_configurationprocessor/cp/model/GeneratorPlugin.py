@@ -54,7 +54,7 @@ class GeneratorPlugin(PluginBase):
         pass
 
     def version(self):
-        return Version.get(self.instructions['cloud_input_path'])
+        return Version.get_cloud_version(self.instructions)
 
     @property
     def models(self):
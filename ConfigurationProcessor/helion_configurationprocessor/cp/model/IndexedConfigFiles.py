@@ -0,0 +1,67 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import six
+
+
+class IndexedConfigFiles(list):
+    """The merged input config files (one dict per model version) with
+    an index from version and lower-cased section name to the section's
+    values.
+
+    The index and the by-name views are built on first use, so the
+    config files must not be changed once lookups have started.
+    """
+    def __init__(self, config_files=None):
+        super(IndexedConfigFiles, self).__init__(config_files or [])
+
+        self._index = None
+        self._by_name = dict()
+
+    def _build_index(self):
+        self._index = dict()
+
+        this_version = 0.0
+        for version_dict in self:
+            for key, value in six.iteritems(version_dict):
+                if key.lower() == 'version':
+                    this_version = value
+
+            for key, value in six.iteritems(version_dict):
+                index_key = (float(this_version), key.lower())
+                if index_key not in self._index:
+                    self._index[index_key] = value
+
+    def get_config_value(self, version, config_key):
+        if self._index is None:
+            self._build_index()
+
+        return self._index.get((float(version), config_key.lower()))
+
+    def get_config_dict(self, version, config_key):
+        """Return the values of a section keyed by their name.  The dict
+        is shared between callers and must be treated as read-only.
+        """
+        view_key = (float(version), config_key.lower())
+        if view_key not in self._by_name:
+            by_name = dict()
+            config_value = self.get_config_value(version, config_key)
+            if config_value:
+                for value in config_value:
+                    by_name[value['name']] = value
+
+            self._by_name[view_key] = by_name
+
+        return self._by_name[view_key]
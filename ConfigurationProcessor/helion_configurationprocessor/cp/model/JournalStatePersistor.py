@@ -0,0 +1,168 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import logging
+import os
+
+import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader
+    from yaml import SafeDumper
+
+from .StatePersistor import StatePersistor
+
+
+LOG = logging.getLogger(__name__)
+
+
+class JournalStatePersistor(StatePersistor):
+    """StatePersistor that appends each change to a journal next to the
+    YAML file, rather than rewriting the whole file.
+
+    The state is the YAML file (the snapshot) with the journal replayed
+    on top of it.  The journal is compacted into a new snapshot by
+    export_yaml(), which is called at the end of every run and before
+    the persistent state is checkpointed, or when it holds more than
+    COMPACT_THRESHOLD records.
+
+    A run that is interrupted leaves the journal behind, and it is
+    replayed by the next run.  A record that was only partly written is
+    discarded, and cut from the journal before anything else is
+    appended to it.
+    """
+
+    JOURNAL_SUFFIX = '.journal'
+    COMPACT_THRESHOLD = 1000
+
+    def __init__(self, models, controllers,
+                 persistence_file='general.yml',
+                 persistence_path=None,
+                 write_behind=False):
+        self._pending = []
+
+        StatePersistor.__init__(self, models, controllers,
+                                persistence_file=persistence_file,
+                                persistence_path=persistence_path,
+                                write_behind=write_behind)
+
+    @classmethod
+    def persisted_files(cls, persistence_path):
+        """The names of the files in persistence_path that have a
+        journal.
+        """
+        if not os.path.isdir(persistence_path):
+            return []
+
+        return sorted(name[:-len(cls.JOURNAL_SUFFIX)]
+                      for name in os.listdir(persistence_path)
+                      if name.endswith(cls.JOURNAL_SUFFIX))
+
+    @property
+    def journal_file(self):
+        return self.persistence_file + self.JOURNAL_SUFFIX
+
+    def _load(self):
+        self._data_dict = self._read_yaml() or dict()
+        self._journal_records = 0
+        self._pending = []
+
+        if os.path.isfile(self.journal_file):
+            with open(self.journal_file) as fp:
+                text = fp.read()
+
+            # Every record ends with a "..." line, so anything after the
+            # last one is a record that was only partly written
+            records = text.split('\n...\n')
+            if records[-1]:
+                LOG.warning('Discarding a partly written record at the '
+                            'end of %s' % self.journal_file)
+                self._truncate_journal(len(text) - len(records[-1]))
+
+            for record in records[:-1]:
+                self._apply(yaml.load(record, Loader=SafeLoader))
+                self._journal_records += 1
+
+        StatePersistor._uncommitted.discard(self)
+
+    def _truncate_journal(self, size):
+        # Records are appended after the last complete one, so the file
+        # can still be parsed as a stream of YAML documents
+        with open(self.journal_file, 'r+') as fp:
+            fp.truncate(size)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+    def _apply(self, record):
+        if not isinstance(record, dict):
+            return
+
+        if 'persist' in record:
+            self._data_dict.update(record['persist'])
+        if 'delete' in record:
+            for key in record['delete']:
+                self._data_dict.pop(key, None)
+
+    def _record(self, record):
+        self._apply(record)
+        self._pending.append(record)
+        self._changed()
+
+    def persist_info(self, info_dict):
+        self._record({'persist': dict(info_dict)})
+
+    def delete_info(self, keys):
+        self._record({'delete': list(keys)})
+
+    def _write(self):
+        if not self._pending:
+            return
+
+        if self._journal_records + len(self._pending) > \
+                self.COMPACT_THRESHOLD:
+            self._compact()
+            return
+
+        with open(self.journal_file, 'a') as fp:
+            yaml.dump_all(self._pending, fp, Dumper=SafeDumper,
+                          explicit_start=True, explicit_end=True,
+                          allow_unicode=False, default_flow_style=False)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        self._journal_records += len(self._pending)
+        self._pending = []
+
+    def _compact(self):
+        # The snapshot is replaced before the journal is removed.  If
+        # that is interrupted the journal is replayed over the new
+        # snapshot, which leaves the same state
+        self._write_yaml(self._data_dict)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+
+        self._journal_records = 0
+        self._pending = []
+
+    def export_yaml(self):
+        """Compact the journal into the persistence file, so that it
+        holds all of the committed state.
+        """
+        self.commit()
+        if self._journal_records or not os.path.exists(
+                self.persistence_file):
+            self._compact()
@@ -39,7 +39,7 @@ class MigratorPlugin(PluginBase):
         self._errors = []
 
     def version(self):
-        return Version.get(self._instructions['cloud_input_path'])
+        return Version.get_cloud_version(self._instructions)
 
     @abstractmethod
     def migrate(self, model):
@@ -22,6 +22,8 @@ from abc import abstractmethod
 import six
 
 from helion_configurationprocessor.cp.model.ConfigProcess import ConfigProcess
+from helion_configurationprocessor.cp.model.IndexedConfigFiles \
+    import IndexedConfigFiles
 from helion_configurationprocessor.cp.model.v2_0.CloudModel import CloudModel
 from helion_configurationprocessor.cp.model.Version import Version
 from CPLogging import CPLogging as KenLog
@@ -38,6 +40,9 @@ class ModelInitializerBase(object):
         self._version = version
         self._instructions = instructions
         self._models = models
+
+        if not isinstance(config_files, IndexedConfigFiles):
+            config_files = IndexedConfigFiles(config_files)
         self._config_files = config_files
         self._cloud_path = cloud_path
         self._site_path = site_path
@@ -71,8 +76,8 @@ class ModelInitializerBase(object):
             raise Exception('Could not load model "%s"' % name)
 
     def version(self):
-        return Version.normalize(Version.get(
-            self._instructions['cloud_input_path']))
+        return Version.normalize(
+            Version.get_cloud_version(self._instructions))
 
     def load_empty_model(self, name, config_key):
         LOG.info('%s()' % KenLog.fcn())
@@ -97,13 +102,4 @@ class ModelInitializerBase(object):
             raise Exception('Could not load model key "%s"' % config_key)
 
     def _get_config_value(self, version, config_key):
-        this_version = 0.0
-        for version_dict in self._config_files:
-            for key, value in six.iteritems(version_dict):
-                if key.lower() == 'version':
-                    this_version = value
-            if float(this_version) == float(version):
-                for key, value in six.iteritems(version_dict):
-                    if key.lower() == config_key.lower():
-                        return value
-        return None
+        return self._config_files.get_config_value(version, config_key)
@@ -0,0 +1,119 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from netaddr import IPAddress, AddrFormatError
+
+from .NetworkTable import NetworkTable
+
+
+class NetworkAddressIndex(object):
+    """Maps an address to the network whose usable range contains it.
+
+    The usable range of a network is its cidr less the network and
+    broadcast addresses, narrowed by start-address and end-address.
+    Networks are held in a hash table per prefix length, so a lookup
+    is a longest-prefix match that probes each prefix length in use
+    at most once, rather than a scan of every network.
+
+    get() builds the index of a set of networks once per run, so that
+    the validators and the generator share it.  ConfigurationProcessor
+    clears the cache at the start of every run.
+    """
+    # Indexes, keyed on the networks they were built from
+    _indexes = dict()
+
+    def __init__(self, networks):
+        """networks is a list of network dicts, or a dict of them keyed
+        by name.  Networks without a valid cidr are ignored.
+        """
+        networks = self._sorted(networks)
+
+        # {(version, prefixlen): {network int: [(start, end, name), ...]}}
+        self._tables = dict()
+        for net in networks:
+            if 'cidr' not in net:
+                continue
+
+            try:
+                space = NetworkTable.compile(net)
+            except (AddrFormatError, IndexError, ValueError):
+                continue
+
+            # Keyed on the network address, as the cidr may have host
+            # bits set
+            table = self._tables.setdefault(
+                (space.version, space.cidr.prefixlen), dict())
+            table.setdefault(space.cidr.first, []).append(
+                (space.first, space.last, net['name']))
+
+        self._prefixes = sorted(self._tables, reverse=True)
+
+    @staticmethod
+    def _sorted(networks):
+        if isinstance(networks, dict):
+            networks = networks.values()
+
+        return sorted(networks, key=lambda net: net.get('name'))
+
+    @staticmethod
+    def _key(net):
+        return (net.get('name'), net['cidr'], net.get('start-address'),
+                net.get('end-address'))
+
+    @classmethod
+    def get(cls, networks):
+        """Return the index of a list or dict of networks, building it
+        the first time that these networks are asked for in this run.
+        """
+        key = tuple(cls._key(net) for net in cls._sorted(networks)
+                    if 'cidr' in net)
+        index = cls._indexes.get(key)
+        if index is None:
+            index = cls(networks)
+            cls._indexes[key] = index
+
+        return index
+
+    @classmethod
+    def clear(cls):
+        cls._indexes.clear()
+
+    def lookup(self, address):
+        """Return the name of the network that address belongs to, or
+        None if it is not a valid address or not in any network.
+        """
+        try:
+            ip_addr = IPAddress(address)
+        except (AddrFormatError, ValueError, TypeError):
+            return None
+
+        return self.lookup_value(ip_addr.version, ip_addr.value)
+
+    def lookup_value(self, version, value):
+        """Like lookup(), for the integer value of an address of an IP
+        version.
+        """
+        width = 32 if version == 4 else 128
+        for table_version, prefixlen in self._prefixes:
+            if table_version != version:
+                continue
+
+            mask = ((1 << prefixlen) - 1) << (width - prefixlen)
+            for start, end, name in self._tables[(version, prefixlen)].get(
+                    value & mask, []):
+                if start <= value <= end:
+                    return name
+
+        return None
@@ -0,0 +1,120 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from collections import namedtuple
+
+from netaddr import IPNetwork
+
+from .AddressSpace import AddressSpace
+
+
+CidrInfo = namedtuple('CidrInfo', ['version', 'network', 'netmask',
+                                   'prefixlen'])
+
+
+class CompiledNetwork(AddressSpace):
+    """The address space of a network, with the other values that are
+    worked out from its definition.
+    """
+    def __init__(self, net):
+        AddressSpace.__init__(self, net['cidr'], net.get('start-address'),
+                              net.get('end-address'), net.get('gateway-ip'))
+
+        self.name = net.get('name')
+        self.vlanid = net.get('vlanid')
+        self.tagged_vlan = net.get('tagged-vlan', True)
+
+        self.prefixlen = self.cidr.prefixlen
+        self.network = str(self.cidr.network)
+        self.netmask = str(self.cidr.netmask)
+
+
+class NetworkTable(object):
+    """The compiled networks of a cloud, keyed by name.
+
+    Networks are compiled once per run, however many plugins ask for
+    them, and ConfigurationProcessor clears the cache at the start of
+    every run, so building a table from the networks in the internal
+    model is cheap.  Tables are not kept in the model itself, which must
+    stay serializable.  Networks without a cidr are not in the table.
+    """
+    # Compiled networks, keyed on the values they are compiled from
+    _compiled = dict()
+
+    # CidrInfo, keyed on cidr
+    _cidrs = dict()
+
+    def __init__(self, networks):
+        """networks is a list of network dicts, or a dict of them keyed
+        by name.
+        """
+        if isinstance(networks, dict):
+            networks = networks.values()
+
+        self._networks = dict()
+        for net in networks:
+            if 'cidr' in net:
+                self._networks[net['name']] = self.compile(net)
+
+    @staticmethod
+    def _key(net):
+        return (net.get('name'), net['cidr'], net.get('start-address'),
+                net.get('end-address'), net.get('gateway-ip'),
+                net.get('vlanid'), net.get('tagged-vlan', True))
+
+    @classmethod
+    def compile(cls, net):
+        """Return the CompiledNetwork for a network dict with a cidr."""
+        key = cls._key(net)
+        compiled = cls._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledNetwork(net)
+            cls._compiled[key] = compiled
+
+        return compiled
+
+    @classmethod
+    def cidr_info(cls, cidr):
+        """Return the network address, netmask and prefix length of any
+        cidr, such as the destination of a route.
+        """
+        info = cls._cidrs.get(cidr)
+        if info is None:
+            ip_net = IPNetwork(unicode(cidr))
+            info = CidrInfo(ip_net.version, str(ip_net.network),
+                            str(ip_net.netmask), ip_net.prefixlen)
+            cls._cidrs[cidr] = info
+
+        return info
+
+    @classmethod
+    def clear(cls):
+        cls._compiled.clear()
+        cls._cidrs.clear()
+
+    def get(self, name, default=None):
+        return self._networks.get(name, default)
+
+    def __getitem__(self, name):
+        return self._networks[name]
+
+    def __contains__(self, name):
+        return name in self._networks
+
+    def __iter__(self):
+        return iter(sorted(self._networks))
+
+    def __len__(self):
+        return len(self._networks)
@@ -0,0 +1,142 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import hashlib
+import logging
+import tempfile
+
+import yaml
+from six.moves import cPickle as pickle
+
+from .CPLogging import CPLogging as KenLog
+from ..lib.CloudName import CloudName
+from .YamlConfigFile import YamlLoader
+
+
+LOG = logging.getLogger(__name__)
+
+# Change the revision whenever the config file loaders change what a
+# parse produces, so that stores written by older code are discarded
+PARSER_VERSION = 'pyyaml-%s-%s/2' % (yaml.__version__,
+                                     YamlLoader.__bases__[0].__name__)
+
+
+class ParsedFileStore(object):
+    """On-disk store of parsed config files that is shared across runs.
+
+    Entries are keyed on the file path and a hash of its contents, and
+    hold the contents, warnings and errors of the parse in pickled form
+    so that callers always get fresh objects.  Only entries used by the
+    current run are written back by flush().
+    """
+    @staticmethod
+    def for_run(instructions, file_name):
+        """Return the store called file_name in the run's input cache
+        directory, or None if the input cache is not enabled.
+        """
+        if not instructions.get('input_cache', False):
+            return None
+
+        cloud_name = CloudName.get_cloud_name(
+            instructions['cloud_input_path'])
+        path = instructions['input_cache_path']
+        path = path.replace('@CLOUD_NAME@', cloud_name.replace(' ', '_'))
+
+        return ParsedFileStore(os.path.join(path, file_name))
+
+    def __init__(self, path):
+        LOG.info('%s(): path="%s"' % (KenLog.fcn(), path))
+
+        self._path = path
+        self._entries = dict()
+        self._used = dict()
+        self._keys = dict()
+        self._dirty = False
+
+        self._read()
+
+    def _read(self):
+        if not os.path.isfile(self._path):
+            return
+
+        try:
+            with open(self._path, 'rb') as fp:
+                version, entries = pickle.load(fp)
+        except Exception as e:
+            LOG.warning('Ignoring unreadable input cache %s: %s' % (
+                self._path, e))
+            return
+
+        if version == PARSER_VERSION:
+            self._entries = entries
+
+    def _get_key(self, file_name):
+        if file_name not in self._keys:
+            try:
+                with open(file_name, 'rb') as fp:
+                    digest = hashlib.sha1(fp.read()).hexdigest()
+            except (OSError, IOError):
+                return None
+
+            self._keys[file_name] = (file_name, digest)
+
+        return self._keys[file_name]
+
+    def restore(self, config_file):
+        key = self._get_key(config_file.path)
+        entry = self._entries.get(key)
+        if not entry:
+            return False
+
+        config_file.set_load_state(pickle.loads(entry))
+
+        self._used[key] = entry
+        return True
+
+    def record(self, config_file):
+        key = self._get_key(config_file.path)
+        if not key:
+            return
+
+        self._used[key] = pickle.dumps(config_file.get_load_state(),
+                                       pickle.HIGHEST_PROTOCOL)
+        self._dirty = True
+
+    def load(self, config_file):
+        if not self.restore(config_file):
+            config_file.load()
+            self.record(config_file)
+
+    def flush(self):
+        if not self._dirty and len(self._used) == len(self._entries):
+            return
+
+        path = os.path.dirname(self._path)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        fd, temp_name = tempfile.mkstemp(dir=path)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump((PARSER_VERSION, self._used), fp,
+                            pickle.HIGHEST_PROTOCOL)
+            os.rename(temp_name, self._path)
+        except Exception:
+            os.remove(temp_name)
+            raise
+
+        self._entries = dict(self._used)
+        self._dirty = False
@@ -106,5 +106,25 @@ class PluginBase(KenLog):
     def get_dependencies(self):
         return self._default_dependencies
 
+    def is_parallel_safe(self):
+        """ Whether the plugin can be run in a worker process when the
+        stage runs plugins in parallel.  Plugins with side effects other
+        than the files they write (such as updates to the persistent
+        state or output to the console) must return False, so that they
+        are run in the main process.
+        :return: True if the plugin can run in a worker process
+        """
+        return True
+
+    def get_worker_state(self):
+        """ The results of running the plugin in a worker process, which
+        are passed back to the plugin in the main process.  They must be
+        picklable.
+        """
+        return self._warnings, self._errors
+
+    def set_worker_state(self, state):
+        self._warnings, self._errors = state
+
     def unit_test_set_dependencies(self, dependencies):
         self._default_dependencies = dependencies
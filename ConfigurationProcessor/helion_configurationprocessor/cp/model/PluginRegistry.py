@@ -0,0 +1,88 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import logging
+
+from stevedore import extension
+
+from .CPLogging import CPLogging as KenLog
+
+
+LOG = logging.getLogger(__name__)
+
+
+class LoadedPlugin(object):
+    """A plugin instance, with the same driver attribute as the
+    stevedore DriverManager it replaces.
+    """
+    def __init__(self, name, plugin):
+        self.name = name
+        self.driver = plugin
+
+
+class PluginRegistry(object):
+    """Process-wide registry of the plugin classes in each namespace.
+
+    The entry points of a namespace are scanned and imported the first
+    time a plugin from that namespace is asked for.  A plugin that
+    could not be imported is remembered, and the error is raised each
+    time it is asked for.
+    """
+    _namespaces = dict()
+
+    @classmethod
+    def _load_namespace(cls, namespace):
+        LOG.info('%s(): namespace="%s"' % (KenLog.fcn(), namespace))
+
+        plugins = dict()
+
+        def on_load_failure(manager, entry_point, error):
+            plugins[entry_point.name] = error
+
+        mgr = extension.ExtensionManager(
+            namespace=namespace, invoke_on_load=False,
+            on_load_failure_callback=on_load_failure)
+
+        for ext in mgr:
+            if ext.name in plugins:
+                plugins[ext.name] = RuntimeError(
+                    'Multiple %r drivers found: %s' % (namespace, ext.name))
+            else:
+                plugins[ext.name] = ext.plugin
+
+        return plugins
+
+    @classmethod
+    def get(cls, namespace, name):
+        if namespace not in cls._namespaces:
+            cls._namespaces[namespace] = cls._load_namespace(namespace)
+
+        plugin = cls._namespaces[namespace].get(name)
+        if plugin is None:
+            raise RuntimeError('No %r driver found, looking for %r' %
+                               (namespace, name))
+
+        if isinstance(plugin, Exception):
+            raise plugin
+
+        return plugin
+
+    @classmethod
+    def load(cls, namespace, name, invoke_args):
+        return LoadedPlugin(name, cls.get(namespace, name)(*invoke_args))
+
+    @classmethod
+    def clear(cls):
+        cls._namespaces.clear()
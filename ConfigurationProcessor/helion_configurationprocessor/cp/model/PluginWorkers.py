@@ -0,0 +1,229 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import time
+import logging
+import multiprocessing
+import timeit
+import traceback
+
+from .CPLogging import CPLogging as KenLog
+
+
+LOG = logging.getLogger(__name__)
+
+# The plugins being run in worker processes.  The workers are forked
+# once this has been set, so they find the plugins here rather than
+# having them pickled.
+_pool_plugins = []
+
+# The pid of the worker that started each of _pool_plugins, in memory
+# shared with the workers
+_pool_started = None
+
+# How often results() checks that the workers are alive while it waits
+_POLL_INTERVAL = 0.5
+
+# How long results() waits, once a worker has died, for plugins that no
+# worker has started.  The worker that died may have taken them.
+_LOST_TIMEOUT = 10
+
+
+def run_plugin(plugin, method_name):
+    """Run a plugin's method, returning the time it took, or the error
+    and traceback if it raised an exception.
+    """
+    try:
+        duration = timeit.timeit(getattr(plugin, method_name), number=1)
+    except Exception as e:
+        return None, '%s' % e, traceback.format_exc()
+
+    return duration, None, None
+
+
+def _run_in_worker(args):
+    index, method_name = args
+
+    _pool_started[index] = os.getpid()
+    plugin = _pool_plugins[index]
+    result = run_plugin(plugin, method_name)
+
+    return result, plugin.get_worker_state()
+
+
+class PluginWorkers(object):
+    """Runs a method of some plugins in a pool of forked worker
+    processes.
+
+    The plugins in the parent process are updated with the warnings and
+    errors (and any other state from get_worker_state()) of their copy
+    in the worker.  Plugins that the pool could not run are left out of
+    the results, for the caller to run itself.  A plugin whose worker
+    dies while running it (for example when it is killed for using too
+    much memory) gets an error result instead, as the pool would never
+    return its result.
+    """
+    def __init__(self, plugins, method_name, workers):
+        global _pool_plugins
+        global _pool_started
+
+        self._plugins = plugins
+        self._pool = None
+        self._pending = dict()
+        self._workers = dict()
+
+        if workers < 2 or len(plugins) < 2:
+            return
+
+        LOG.info('%s(): method=%s workers=%d' % (
+            KenLog.fcn(), method_name, workers))
+
+        _pool_plugins = [plugin for _, plugin in plugins]
+        try:
+            _pool_started = multiprocessing.RawArray('i', len(plugins))
+            self._pool = multiprocessing.Pool(min(workers, len(plugins)))
+        except Exception as e:
+            LOG.warning('Could not start worker processes, running '
+                        'serially: %s' % e)
+            _pool_plugins = []
+            _pool_started = None
+            return
+
+        for index, (name, plugin) in enumerate(plugins):
+            self._pending[name] = (index, plugin, self._pool.apply_async(
+                _run_in_worker, ((index, method_name),)))
+
+        self._pool.close()
+        self._update_workers()
+
+    def is_running(self, name):
+        return name in self._pending
+
+    def _update_workers(self):
+        # The pool replaces workers that die, so keep every worker it
+        # has had, keyed on pid
+        for process in self._pool._pool:
+            self._workers.setdefault(process.pid, process)
+
+    def _exit_code(self, pid):
+        """Return None if the worker with pid is running, otherwise its
+        exit code (or 'unknown' if it was replaced before it was seen).
+        """
+        process = self._workers.get(pid)
+        if process is not None:
+            return process.exitcode
+
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return 'unknown'
+
+        return None
+
+    def _wait(self):
+        """Wait for the workers to finish, and return the names of the
+        plugins that were lost because their worker died, with a
+        message for each.
+        """
+        lost = dict()
+        lost_since = None
+        while True:
+            waiting = [(name, index, async_result)
+                       for name, (index, _, async_result)
+                       in self._pending.items()
+                       if name not in lost and not async_result.ready()]
+            if not waiting:
+                return lost
+
+            waiting[0][2].wait(_POLL_INTERVAL)
+
+            # Workers only exit by themselves once every plugin has been
+            # taken, so until one exits nothing can have been lost
+            self._update_workers()
+            if all(process.exitcode is None
+                   for process in self._workers.values()):
+                continue
+
+            running = False
+            for name, index, async_result in waiting:
+                pid = _pool_started[index]
+                if not pid or async_result.ready():
+                    continue
+
+                exit_code = self._exit_code(pid)
+                if exit_code is None:
+                    running = True
+                else:
+                    lost[name] = ('the worker process running it exited '
+                                  'unexpectedly (exit code %s)' % exit_code)
+
+            # Plugins that have not started while no worker is busy were
+            # taken by a worker that died before it could start them
+            if running:
+                lost_since = None
+            elif lost_since is None:
+                lost_since = time.time()
+            elif time.time() - lost_since > _LOST_TIMEOUT:
+                for name, index, async_result in waiting:
+                    if not _pool_started[index] and name not in lost:
+                        lost[name] = None
+
+    def results(self):
+        """Wait for the workers to finish and return the run_plugin()
+        result of each plugin that they ran, keyed on its name.
+        """
+        global _pool_plugins
+        global _pool_started
+
+        results = dict()
+        if not self._pool:
+            return results
+
+        lost = self._wait()
+
+        for name, plugin in self._plugins:
+            index, plugin, async_result = self._pending[name]
+            if name in lost:
+                if lost[name]:
+                    LOG.error('%s could not be run: %s' % (name, lost[name]))
+                    results[name] = (None, lost[name], '')
+                else:
+                    LOG.warning('%s was not run by a worker process, '
+                                'running serially' % name)
+                continue
+
+            try:
+                result, state = async_result.get()
+            except Exception as e:
+                LOG.warning('%s could not be run in a worker process, '
+                            'running serially: %s' % (name, e))
+                continue
+
+            plugin.set_worker_state(state)
+            results[name] = result
+
+        # A pool that has lost a task never finishes on its own
+        if lost:
+            self._pool.terminate()
+        else:
+            self._pool.join()
+
+        self._pool = None
+        self._workers = dict()
+        _pool_plugins = []
+        _pool_started = None
+
+        return results
@@ -0,0 +1,135 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import pprint
+from collections import deque
+
+import yaml
+from jsonschema import _utils
+from six.moves import reprlib
+
+
+DEFAULT_ERROR_LIMIT = 20
+DEFAULT_EXCERPT_SIZE = 200
+
+
+class SchemaDiagnostic(object):
+    def __init__(self, error):
+        self.path = deque(error.path)
+        self.keyword = error.validator
+        self.expected = error.validator_value
+        self.message = error.message
+        self.value = error.instance
+
+
+class SchemaErrorReport(object):
+    """The schema validation errors for one piece of input.
+
+    Only the first error_limit errors are kept, and the report is only
+    rendered when it is converted to a string.  Each error shows the
+    path of the erroneous value, the schema keyword that failed and an
+    excerpt of at most excerpt_size characters of the value.  The whole
+    input is only dumped when full_dump is set.
+    """
+    def __init__(self, data, errors, more_errors=False,
+                 error_limit=DEFAULT_ERROR_LIMIT,
+                 excerpt_size=DEFAULT_EXCERPT_SIZE, full_dump=False):
+        self._data = data
+        self._diagnostics = [SchemaDiagnostic(e) for e in errors]
+        self._more_errors = more_errors
+        self._error_limit = error_limit
+        self._excerpt_size = excerpt_size
+        self._full_dump = full_dump
+        self._text = None
+
+    @classmethod
+    def from_validator(cls, validator, data, instructions):
+        error_limit = instructions.get('schema_error_limit',
+                                       DEFAULT_ERROR_LIMIT)
+        errors = []
+        more_errors = False
+        for error in validator.iter_errors(data):
+            if error_limit and len(errors) >= error_limit:
+                more_errors = True
+                break
+
+            errors.append(error)
+
+        if not errors:
+            return None
+
+        return cls(data, errors, more_errors=more_errors,
+                   error_limit=error_limit,
+                   excerpt_size=instructions.get('schema_error_excerpt',
+                                                 DEFAULT_EXCERPT_SIZE),
+                   full_dump=instructions.get('schema_error_full_dump',
+                                              False))
+
+    @property
+    def diagnostics(self):
+        return self._diagnostics
+
+    def _truncate(self, text):
+        if self._excerpt_size and len(text) > self._excerpt_size:
+            text = text[:self._excerpt_size] + '...'
+
+        return text
+
+    def _excerpt(self, value):
+        if self._full_dump or not self._excerpt_size:
+            return pprint.pformat(value, width=72)
+
+        # reprlib bounds the work done on large values before truncating
+        short_repr = reprlib.Repr()
+        short_repr.maxstring = self._excerpt_size
+        short_repr.maxother = self._excerpt_size
+        return self._truncate(short_repr.repr(value))
+
+    def _render(self):
+        if self._full_dump:
+            text = '\n\nInput\n%s\n\nCould not be validated - list of errors:\n' % (
+                _utils.indent(yaml.dump(self._data, default_flow_style=False,
+                                        indent=4)))
+        else:
+            sections = []
+            if isinstance(self._data, dict):
+                sections = sorted(k for k in self._data if k != 'product')
+            text = '\n\nInput "%s" could not be validated - list of errors:\n' % (
+                ', '.join(sections))
+
+        for d in self._diagnostics:
+            text += "%s\n%s\n%s\n%s\n%s\n" % (
+                _utils.indent("Index of error:       %s" %
+                              _utils.format_as_index(d.path)),
+                _utils.indent("    Schema keyword:      %s" % d.keyword),
+                _utils.indent("    Error:               %s" %
+                              self._truncate(d.message)),
+                _utils.indent("    Erroneous value:     %s" %
+                              self._excerpt(d.value)),
+                _utils.indent("    Expected type:       %s" %
+                              self._truncate(str(d.expected))))
+
+        if self._more_errors:
+            text += _utils.indent(
+                "Stopped after %d errors; further errors not shown" %
+                self._error_limit) + '\n'
+
+        return text
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._render()
+
+        return self._text
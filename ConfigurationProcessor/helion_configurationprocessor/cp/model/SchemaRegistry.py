@@ -0,0 +1,103 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import logging
+
+from jsonschema import SchemaError
+from jsonschema import RefResolver
+from jsonschema import validators
+from jsonschema import Draft4Validator
+
+from .CPConfigFile import CPConfigFile
+from .CPLogging import CPLogging as KenLog
+from .ConfigFileCache import ConfigFileCache
+
+
+LOG = logging.getLogger(__name__)
+
+
+class CompiledSchema(object):
+    def __init__(self, schema_file):
+        LOG.info('%s(): schema_file="%s"' % (KenLog.fcn(), schema_file))
+
+        self._schema_file = schema_file
+        self._validator = None
+        self._schema_error = None
+
+        # We've already checked the input files for errors, but not the
+        # schema files
+        self._contents = CPConfigFile.parse(schema_file)
+        self._warnings = CPConfigFile.warnings(schema_file) or []
+        self._errors = CPConfigFile.errors(schema_file) or []
+        if self._errors:
+            return
+
+        try:
+            schema_check = validators.validator_for(self._contents)
+            schema_check.check_schema(self._contents)
+        except SchemaError as e:
+            self._schema_error = e
+            return
+
+        resolver = RefResolver.from_schema(self._contents)
+        self._validator = Draft4Validator(self._contents, resolver=resolver)
+
+    @property
+    def contents(self):
+        return self._contents
+
+    @property
+    def warnings(self):
+        return self._warnings
+
+    @property
+    def errors(self):
+        return self._errors
+
+    @property
+    def schema_error(self):
+        return self._schema_error
+
+    @property
+    def validator(self):
+        return self._validator
+
+
+class SchemaRegistry(object):
+    """Process-wide registry of schemas that have been loaded and checked
+    against their meta-schema.  A schema is compiled again only when its
+    file's mtime or size changes.
+    """
+    _schemas = dict()
+
+    @classmethod
+    def get(cls, schema_file):
+        key = os.path.abspath(schema_file)
+        stamp = ConfigFileCache.get_stamp(key)
+
+        entry = cls._schemas.get(key)
+        if entry and stamp and entry[0] == stamp:
+            return entry[1]
+
+        schema = CompiledSchema(schema_file)
+        if stamp:
+            cls._schemas[key] = (stamp, schema)
+
+        return schema
+
+    @classmethod
+    def clear(cls):
+        cls._schemas.clear()
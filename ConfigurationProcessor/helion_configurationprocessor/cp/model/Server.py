@@ -20,8 +20,8 @@ from helion_configurationprocessor.cp.model.ControlPlane import ControlPlane
 from helion_configurationprocessor.cp.model.CloudModel import CloudModel
 from helion_configurationprocessor.cp.model.ResourceNode import ResourceNode
 
-from helion_configurationprocessor.cp.model.StatePersistor \
-    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
 
 
 class Server(object):
@@ -44,9 +44,8 @@ class Server(object):
 
     @staticmethod
     def is_deleted(models, controllers, elem_s):
-        state_persistor = StatePersistor(
-            models, controllers,
-            persistence_file='server_allocations.yml')
+        state_persistor = StatePersistorRegistry.get(
+            models, controllers, 'server_allocations.yml')
 
         info = state_persistor.recall_info()
         for k, v in six.iteritems(info):
@@ -0,0 +1,256 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import sqlite3
+
+import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader
+    from yaml import SafeDumper
+
+from .StatePersistor import StatePersistor
+
+
+def _encode(value):
+    return yaml.dump(value, Dumper=SafeDumper, allow_unicode=False,
+                     default_flow_style=True)
+
+
+def _decode(text):
+    return yaml.load(text, Loader=SafeLoader)
+
+
+class SqliteStatePersistor(StatePersistor):
+    """StatePersistor that keeps its dict in an SQLite database in the
+    persistent state directory, with one row per top-level key.
+
+    Keys are looked up in the database as they are asked for, rather
+    than the whole file being read up front, and each commit updates
+    only the keys that have changed, in a single transaction.
+
+    A file's YAML file is imported when the file is opened, if the YAML
+    file has changed since it was last imported or exported, so that an
+    edited or restored YAML file replaces the state in the database.
+    export_yaml() writes the state back out in the YAML layout, for the
+    checkpointers and for people to read.
+    """
+
+    DATABASE_FILE = 'persistent_state.db'
+
+    def __init__(self, models, controllers,
+                 persistence_file='general.yml',
+                 persistence_path=None,
+                 write_behind=False):
+        self._db = None
+        self._name = persistence_file
+
+        StatePersistor.__init__(self, models, controllers,
+                                persistence_file=persistence_file,
+                                persistence_path=persistence_path,
+                                write_behind=write_behind)
+
+    @classmethod
+    def _open_database(cls, persistence_path):
+        db = sqlite3.connect(os.path.join(persistence_path,
+                                          cls.DATABASE_FILE))
+        db.text_factory = str
+
+        with db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS state ('
+                'file TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+                'PRIMARY KEY (file, key))')
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS yaml_files ('
+                'file TEXT NOT NULL PRIMARY KEY, stamp TEXT NOT NULL)')
+
+        return db
+
+    @classmethod
+    def persisted_files(cls, persistence_path):
+        """The names of the files that have state in the database in
+        persistence_path.
+        """
+        if not os.path.isfile(os.path.join(persistence_path,
+                                           cls.DATABASE_FILE)):
+            return []
+
+        db = cls._open_database(persistence_path)
+        try:
+            rows = db.execute('SELECT file FROM state UNION '
+                              'SELECT file FROM yaml_files').fetchall()
+        finally:
+            db.close()
+
+        return sorted(row[0] for row in rows)
+
+    def _connect(self):
+        if self._db:
+            return
+
+        self._db = self._open_database(self._persistence_path)
+
+        self._import_yaml()
+
+    def _yaml_stamp(self):
+        try:
+            st = os.stat(self.persistence_file)
+        except OSError:
+            return None
+
+        return '%r %d %d' % (st.st_mtime, st.st_size, st.st_ino)
+
+    def _import_yaml(self):
+        stamp = self._yaml_stamp()
+        if stamp is None:
+            return
+
+        row = self._db.execute('SELECT stamp FROM yaml_files WHERE file = ?',
+                               (self._name,)).fetchone()
+        if row and row[0] == stamp:
+            return
+
+        data_dict = self._read_yaml() or dict()
+        with self._db:
+            self._db.execute('DELETE FROM state WHERE file = ?',
+                             (self._name,))
+            self._db.executemany(
+                'INSERT INTO state (file, key, value) VALUES (?, ?, ?)',
+                [(self._name, _encode(k), _encode(v))
+                 for k, v in data_dict.items()])
+            self._db.execute(
+                'INSERT OR REPLACE INTO yaml_files (file, stamp) '
+                'VALUES (?, ?)', (self._name, stamp))
+
+    def _load(self):
+        self._connect()
+
+        # The values read or changed in this run.  Once _complete is set
+        # it holds every key
+        self._data_dict = dict()
+        self._complete = False
+        self._deleted = set()
+        self._changed_keys = set()
+        self._has_rows = None
+
+        StatePersistor._uncommitted.discard(self)
+
+    def _load_all(self):
+        if self._complete:
+            return
+
+        rows = self._db.execute('SELECT key, value FROM state WHERE file = ?',
+                                (self._name,))
+        for key_text, value_text in rows:
+            key = _decode(key_text)
+            if key not in self._data_dict and key not in self._deleted:
+                self._data_dict[key] = _decode(value_text)
+
+        self._complete = True
+
+    def _get(self, key):
+        if key in self._data_dict:
+            return self._data_dict[key]
+
+        if self._complete or key in self._deleted:
+            return None
+
+        row = self._db.execute(
+            'SELECT value FROM state WHERE file = ? AND key = ?',
+            (self._name, _encode(key))).fetchone()
+        if not row:
+            return None
+
+        value = _decode(row[0])
+        self._data_dict[key] = value
+        return value
+
+    def _is_empty(self):
+        if self._complete or self._deleted:
+            self._load_all()
+            return not self._data_dict
+
+        if self._data_dict:
+            return False
+
+        if self._has_rows is None:
+            row = self._db.execute('SELECT 1 FROM state WHERE file = ? '
+                                   'LIMIT 1', (self._name,)).fetchone()
+            self._has_rows = bool(row)
+
+        return not self._has_rows
+
+    def persist_info(self, info_dict):
+        self._data_dict.update(info_dict)
+        self._deleted.difference_update(info_dict)
+        self._changed_keys.update(info_dict)
+        self._changed()
+
+    def delete_info(self, keys):
+        for key in keys:
+            self._data_dict.pop(key, None)
+            self._deleted.add(key)
+            self._changed_keys.add(key)
+
+        self._changed()
+
+    def recall_info(self, lookup_array=None):
+        if self._is_empty():
+            return dict()
+
+        if not lookup_array:
+            self._load_all()
+            return self._data_dict
+
+        current_dict = self._get(lookup_array[0])
+        for key in lookup_array[1:]:
+            current_dict = current_dict.get(key)
+
+        return current_dict
+
+    def _write(self):
+        with self._db:
+            for key in self._changed_keys:
+                if key in self._data_dict:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO state (file, key, value) '
+                        'VALUES (?, ?, ?)',
+                        (self._name, _encode(key),
+                         _encode(self._data_dict[key])))
+                else:
+                    self._db.execute(
+                        'DELETE FROM state WHERE file = ? AND key = ?',
+                        (self._name, _encode(key)))
+
+        self._changed_keys = set()
+        self._has_rows = None
+
+    def export_yaml(self):
+        """Write the committed state to the persistence file in the YAML
+        layout used by StatePersistor.
+        """
+        self.commit()
+        self._load_all()
+        self._write_yaml(self._data_dict)
+
+        # So that the file is not imported again
+        with self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO yaml_files (file, stamp) '
+                'VALUES (?, ?)', (self._name, self._yaml_stamp()))
@@ -15,12 +15,29 @@
 #
 import yaml
 import os
+import tempfile
 
 
 class StatePersistor():
+    """A dict that is kept in a YAML file in the cloud's persistent state.
+
+    By default every change is written to the file straight away.  With
+    write_behind, changes are only kept in memory until commit() is
+    called, or the persistor is used as a context manager and the block
+    completes.  Changes that have not been committed by the end of a
+    stage are committed by commit_all().
+
+    The file is replaced atomically, so after a crash it holds either
+    the state before or after a commit, and never a partial write.
+    """
+
+    # Write-behind persistors with uncommitted changes
+    _uncommitted = set()
+
     def __init__(self, models, controllers,
                  persistence_file='general.yml',
-                 persistence_path=None):
+                 persistence_path=None,
+                 write_behind=False):
 
         if persistence_path:
             self._persistence_path = persistence_path
@@ -29,31 +46,53 @@ class StatePersistor():
             self._persistence_path = cloud_config.get_persistent_path(models)
 
         self.persistence_file = self._persistence_path + persistence_file
+        self._write_behind = write_behind
 
         if not os.path.isdir(self._persistence_path):
             os.makedirs(self._persistence_path)
 
+        self._load()
+
+    def _load(self):
+        self._data_dict = self._read_yaml()
+
+        StatePersistor._uncommitted.discard(self)
+
+    def _read_yaml(self):
         if (os.path.isfile(self.persistence_file) and
                 os.stat(self.persistence_file).st_size != 0):
-            self._data_dict = yaml.load(open(self.persistence_file))
+            with open(self.persistence_file) as fp:
+                return yaml.load(fp)
+
+        return dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is None:
+            self.commit()
         else:
-            self._data_dict = dict()
+            self.rollback()
+
+        return False
+
+    def _changed(self):
+        if self._write_behind:
+            StatePersistor._uncommitted.add(self)
+        else:
+            self._write()
 
     def persist_info(self, info_dict):
         self._data_dict.update(info_dict)
-
-        with open(self.persistence_file, 'w') as yaml_file:
-            yaml.safe_dump(self._data_dict, yaml_file,
-                           allow_unicode=False, default_flow_style=False)
+        self._changed()
 
     def delete_info(self, keys):
         for key in keys:
             if key in self._data_dict:
                 del self._data_dict[key]
 
-        with open(self.persistence_file, 'w') as yaml_file:
-            yaml.safe_dump(self._data_dict, yaml_file,
-                           allow_unicode=False, default_flow_style=False)
+        self._changed()
 
     def recall_info(self, lookup_array=None):
         if not self._data_dict:
@@ -67,3 +106,46 @@ class StatePersistor():
             current_dict = current_dict.get(key)
 
         return current_dict
+
+    def commit(self):
+        if self in StatePersistor._uncommitted:
+            self._write()
+            StatePersistor._uncommitted.discard(self)
+
+    def rollback(self):
+        """Discard the uncommitted changes."""
+        if self in StatePersistor._uncommitted:
+            self._load()
+
+    @classmethod
+    def commit_all(cls):
+        for persistor in list(cls._uncommitted):
+            persistor.commit()
+
+    def _write(self):
+        self._write_yaml(self._data_dict)
+
+    def _write_yaml(self, data_dict):
+        path, name = os.path.split(self.persistence_file)
+        fd, temp_name = tempfile.mkstemp(dir=path, prefix='.%s.' % name)
+        try:
+            with os.fdopen(fd, 'w') as yaml_file:
+                yaml.safe_dump(data_dict, yaml_file,
+                               allow_unicode=False, default_flow_style=False)
+                yaml_file.flush()
+                os.fsync(yaml_file.fileno())
+
+            os.chmod(temp_name, self._get_file_mode())
+            os.rename(temp_name, self.persistence_file)
+        except Exception:
+            os.remove(temp_name)
+            raise
+
+    def _get_file_mode(self):
+        # Keep the mode the file would have had if written in place
+        try:
+            return os.stat(self.persistence_file).st_mode & 0o777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
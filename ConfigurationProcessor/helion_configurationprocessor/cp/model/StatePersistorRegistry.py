@@ -0,0 +1,92 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+
+from .JournalStatePersistor import JournalStatePersistor
+from .SqliteStatePersistor import SqliteStatePersistor
+from .StatePersistor import StatePersistor
+
+
+class StatePersistorRegistry(object):
+    """Run-scoped registry that hands out one shared StatePersistor per
+    persistent state file, so that a file is only read once per run and
+    every user sees the changes made by the others.
+
+    The persistors are write-behind: their changes are written when
+    they are committed, or at the end of the stage.
+    ConfigurationProcessor configures and clears the registry at the
+    start of every run.  The persistent_state_backend instruction
+    selects how the state is stored: "yaml" (the default) keeps one
+    YAML file per persistor, "journal" appends the changes to a journal
+    next to each YAML file, and "sqlite" keeps them in one database.
+    export_all() brings the YAML files up to date for the latter two;
+    it is called at the end of every run and before a checkpoint.
+    """
+    _backends = {
+        'yaml': StatePersistor,
+        'journal': JournalStatePersistor,
+        'sqlite': SqliteStatePersistor,
+    }
+
+    _persistor_class = StatePersistor
+    _persistors = dict()
+
+    @classmethod
+    def configure(cls, instructions):
+        backend = instructions.get('persistent_state_backend', 'yaml')
+        if backend not in cls._backends:
+            raise ValueError('Unknown persistent state backend %r, '
+                             'expected one of: %s' % (
+                                 backend, ', '.join(sorted(cls._backends))))
+
+        cls._persistor_class = cls._backends[backend]
+
+    @classmethod
+    def get(cls, models, controllers, persistence_file):
+        cloud_config = controllers['CloudConfig']
+        path = cloud_config.get_persistent_path(models)
+
+        key = os.path.abspath(path + persistence_file)
+        if key not in cls._persistors:
+            cls._persistors[key] = cls._persistor_class(
+                models, controllers, persistence_file,
+                persistence_path=path, write_behind=True)
+
+        return cls._persistors[key]
+
+    @classmethod
+    def export_all(cls, models, controllers):
+        """Bring the YAML files of the persistent state up to date, for
+        backends that do not keep their state in them.  Files that have
+        not been used in this run are opened too, so that this also
+        works in a run that only checkpoints.
+        """
+        persisted_files = getattr(cls._persistor_class, 'persisted_files',
+                                  None)
+        if persisted_files:
+            cloud_config = controllers['CloudConfig']
+            for persistence_file in persisted_files(
+                    cloud_config.get_persistent_path(models)):
+                cls.get(models, controllers, persistence_file)
+
+        for key in sorted(cls._persistors):
+            persistor = cls._persistors[key]
+            if hasattr(persistor, 'export_yaml'):
+                persistor.export_yaml()
+
+    @classmethod
+    def clear(cls):
+        cls._persistors.clear()
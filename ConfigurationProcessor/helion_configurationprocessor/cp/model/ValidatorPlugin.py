@@ -16,21 +16,16 @@
 import os
 import six
 import logging
-import yaml
-import pprint
-
-from jsonschema import SchemaError
-from jsonschema import _utils
-from jsonschema import validators
-from jsonschema import Draft4Validator
-from collections import deque
 
 from abc import ABCMeta
 from abc import abstractmethod
 
 from .CPConfigFile import CPConfigFile
+from .IndexedConfigFiles import IndexedConfigFiles
 from .CPLogging import CPLogging as KenLog
 from .PluginBase import PluginBase
+from .SchemaRegistry import SchemaRegistry
+from .SchemaErrorReport import SchemaErrorReport
 from Version import Version
 
 LOG = logging.getLogger(__name__)
@@ -51,6 +46,9 @@ class ValidatorPlugin(PluginBase):
         LOG.info('%s()' % KenLog.fcn())
 
         self._is_valid_anywhere = ['_comment']
+
+        if not isinstance(config_files, IndexedConfigFiles):
+            config_files = IndexedConfigFiles(config_files)
         self._config_files = config_files
 
     @property
@@ -67,7 +65,7 @@ class ValidatorPlugin(PluginBase):
         pass
 
     def version(self):
-        return Version.get(self.instructions['cloud_input_path'])
+        return Version.get_cloud_version(self.instructions)
 
     def get_path(self, path, file_type):
         cloud_config = os.path.basename(self._instructions['cloud_input_path'])
@@ -156,46 +154,29 @@ class ValidatorPlugin(PluginBase):
         schema_file = self.get_schema_path(file_base)
 
         try:
-            schema_contents = CPConfigFile.parse(schema_file)
+            schema = SchemaRegistry.get(schema_file)
             data_contents = CPConfigFile.parse(data_file)
-            # We've already checked the input files for errors, but not the
-            # schema files
-            schema_errors = CPConfigFile.errors(schema_file)
-            schema_warnings = CPConfigFile.warnings(schema_file)
-            if schema_warnings:
-                self._warnings += schema_warnings
-            if schema_errors:
-                self._errors += schema_errors
+            if schema.warnings:
+                self._warnings += schema.warnings
+            if schema.errors:
+                self._errors += schema.errors
                 return False
         except Exception as e:
             msg = ('Syntax errors detected, data:"%s" schema "%s" errors "%s" '
                    % (data_file, schema_file, e))
             self.add_error(msg)
-            return_value = False
+            return False
 
-        try:
-            schema_check = validators.validator_for(schema_contents)
-            schema_check.check_schema(schema_contents)
-        except SchemaError as e:
+        if schema.schema_error:
             self.add_error('Schema "%s" is invalid: %s' % (
-                schema_contents, e))
+                schema.contents, schema.schema_error))
             return False
 
         try:
-            validate = Draft4Validator(schema_contents)
-            error_list = [err for err in validate.iter_errors(data_contents)]
-            if len(error_list) > 0:
-                error_string = '\n\nInput\n%s\n\nCould not be validated - list of errors:\n' % (
-                    _utils.indent(yaml.dump(data_contents, default_flow_style=False, indent=4)))
-                for e in error_list:
-                    error_string += "%s\n%s\n%s\n" % (
-                        _utils.indent("Index of error:       %s" %
-                                      _utils.format_as_index(deque(e.path))),
-                        _utils.indent("    Erroneous value:     %s" %
-                                      pprint.pformat(e.instance, width=72)),
-                        _utils.indent("    Expected type:       %s" %
-                                      e.validator_value))
-                self.add_error(error_string)
+            report = SchemaErrorReport.from_validator(
+                schema.validator, data_contents, self._instructions)
+            if report:
+                self.add_error(report)
                 return_value = False
 
         except Exception as e:
@@ -209,6 +190,11 @@ class ValidatorPlugin(PluginBase):
     def load(self):
         return self.validate_parsing()
 
+    def get_worker_state(self):
+        # Render schema error reports in the worker, rather than pickling
+        # them along with the input they hold
+        return self._warnings, ['%s' % e for e in self._errors]
+
     def check_dependency_success(self):
         for dependency in self.get_dependencies():
             if not self._instructions['validator_success'][dependency]:
@@ -291,21 +277,7 @@ class ValidatorPlugin(PluginBase):
         return None
 
     def _get_config_value(self, version, config_key):
-        this_version = 0.0
-        for version_dict in self._config_files:
-            for key, value in six.iteritems(version_dict):
-                if key.lower() == 'version':
-                    this_version = value
-            if float(this_version) == float(version):
-                for key, value in six.iteritems(version_dict):
-                    if key.lower() == config_key.lower():
-                        return value
-        return None
+        return self._config_files.get_config_value(version, config_key)
 
     def _get_dict_from_config_value(self, version, config_key):
-        return_value = dict()
-        config_value = self._get_config_value(version, config_key)
-        if config_value:
-            for value in config_value:
-                return_value[value['name']] = value
-        return return_value
+        return self._config_files.get_config_dict(version, config_key)
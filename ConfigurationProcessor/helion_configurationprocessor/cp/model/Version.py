@@ -13,23 +13,28 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 #
+import os
+
 from ..model.CPVariables import MODEL_VERSION
-from ..model.JsonConfigFile import JsonConfigFile
-from ..model.YamlConfigFile import YamlConfigFile
+from ..model.ConfigFileCache import ConfigFileCache
 
 
 class Version(object):
+    # Resolved versions keyed on the absolute path of the cloud config,
+    # reused while the file's mtime and size are unchanged
+    _versions = dict()
+
     @staticmethod
     def get(file_name):
-        if file_name.endswith('.json'):
-            cf = JsonConfigFile('cloudConfig', file_name)
-            cf.load()
+        key = os.path.abspath(file_name)
+        stamp = ConfigFileCache.get_stamp(key)
 
-        elif file_name.endswith('.yml') or file_name.endswith('.yaml'):
-            cf = YamlConfigFile('cloudConfig', file_name)
-            cf.load()
+        entry = Version._versions.get(key)
+        if entry and stamp and entry[0] == stamp:
+            return entry[1]
 
-        else:
+        cf = ConfigFileCache.load(file_name, 'cloudConfig')
+        if not cf:
             return MODEL_VERSION
 
         element = cf.contents
@@ -37,8 +42,23 @@ class Version(object):
         elem_p = element.get('product', dict())
         elem_v = elem_p.get('version', MODEL_VERSION)
 
+        if stamp:
+            Version._versions[key] = (stamp, elem_v)
+
         return elem_v
 
+    @staticmethod
+    def get_cloud_version(instructions):
+        """Return the version of the cloud model being processed.
+
+        ConfigurationProcessor resolves the version once per run and
+        stores it in the instructions as 'cloud_version'.
+        """
+        if 'cloud_version' in instructions:
+            return instructions['cloud_version']
+
+        return Version.get(instructions['cloud_input_path'])
+
     @staticmethod
     def validate(file_name, model):
         cloud_version = Version.get(file_name)
@@ -17,14 +17,17 @@ import yaml
 from yaml.constructor import ConstructorError
 
 try:
-    from yaml import CLoader as Loader
+    from yaml import CSafeLoader as SafeLoader
 except ImportError:
-    from yaml import Loader
+    from yaml import SafeLoader
 
 from .ConfigFile import ConfigFile
 from .ConfigFile import ConfigFileFormat
 
 
+MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+
 class OurYamlException(Exception):
     def __init__(self, exceptions):
         self.exceptions = exceptions
@@ -36,26 +39,37 @@ class OurYamlException(Exception):
         return "\n".join(lines)
 
 
-def no_duplicates_constructor(loader, node, deep=False):
-    """Check for duplicate keys."""
+class YamlLoader(SafeLoader):
+    """Safe loader (LibYAML-backed when available) that records duplicate
+    keys while the document is constructed, instead of failing on them.
+    The last value given for a duplicated key is the one that is kept.
+    """
+    def __init__(self, stream, check_duplicates=True):
+        SafeLoader.__init__(self, stream)
 
-    mapping = {}
-    errors = []
-    for key_node, value_node in node.value:
-        key = loader.construct_object(key_node, deep=deep)
-        value = loader.construct_object(value_node, deep=deep)
-        if key in mapping:
-            errors.append(ConstructorError("while constructing a mapping", node.start_mark,
-                                           "found duplicate key (%s)" % key, key_node.start_mark))
-        mapping[key] = value
+        self.check_duplicates = check_duplicates
+        self.duplicate_keys = []
 
-    if len(errors) > 0:
-        raise OurYamlException(errors)
-    return loader.construct_mapping(node, deep)
+    def construct_mapping(self, node, deep=False):
+        if self.check_duplicates and isinstance(node, yaml.MappingNode):
+            keys = set()
+            for key_node, _ in node.value:
+                if key_node.tag == MERGE_TAG:
+                    continue
 
+                key = self.construct_object(key_node, deep=deep)
+                try:
+                    if key in keys:
+                        self.duplicate_keys.append(ConstructorError(
+                            "while constructing a mapping", node.start_mark,
+                            "found duplicate key (%s)" % key,
+                            key_node.start_mark))
+                    keys.add(key)
+                except TypeError:
+                    # Unhashable keys are reported by the base class
+                    pass
 
-def constructor(loader, node, deep=False):
-    return loader.construct_mapping(node, deep)
+        return SafeLoader.construct_mapping(self, node, deep)
 
 
 class YamlConfigFile(ConfigFile):
@@ -87,28 +101,22 @@ class YamlConfigFile(ConfigFile):
             self.add_error(msg)
             return
 
-        if check_duplicates:
-            yaml.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                                 no_duplicates_constructor)
-        else:
-            yaml.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                                 constructor)
-
+        loader = YamlLoader(fp, check_duplicates=check_duplicates)
         try:
-            lines = fp.readlines()
-            self._contents = yaml.load(''.join(lines))
+            self._contents = loader.get_single_data()
 
-        except (ConstructorError, OurYamlException) as e:
-            msg = 'Found issues in file %s\n%s' % (self.path, e)
-            self.add_warning(msg)
-            self.load(check_duplicates=False)
-
-        except (TypeError, ValueError) as e:
+        except (ConstructorError, TypeError, ValueError) as e:
             msg = 'Cannot parse file %s\n%s' % (self.path, e)
             self.add_error(msg)
             return
 
         finally:
+            loader.dispose()
             fp.close()
 
+        if loader.duplicate_keys:
+            msg = 'Found issues in file %s\n%s' % (
+                self.path, OurYamlException(loader.duplicate_keys))
+            self.add_warning(msg)
+
         self.is_loaded = True
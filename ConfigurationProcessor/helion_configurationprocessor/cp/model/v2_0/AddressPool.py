@@ -0,0 +1,131 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+class AddressPool(object):
+    """The addresses of a network that can be allocated.
+
+    Each address is a dict with addr, free, used-by, host and server-id
+    items.  The pool covers an AddressSpace, but only holds dicts for
+    the addresses it has been given (persisted allocations and server
+    addresses) or has handed out; every other address in the space is
+    free.  The dicts are indexed by integer value and by
+    (used-by, host), with a cursor to the lowest free address, so that
+    neither building the pool nor finding an address depends on the
+    size of the network.
+
+    Addresses only stop being free, so the cursor only moves forward.
+    Use allocate() to change an address, so that the indexes are kept
+    up to date.
+    """
+    def __init__(self, space=None, addresses=None):
+        self._space = space
+        self._addresses = dict()
+        self._by_user = dict()
+        self._free_cursor = None
+        if space:
+            self._free_cursor = space.next_value(space.first)
+
+        for f in addresses or []:
+            value = space.value(f['addr'])
+            self._addresses[value] = f
+            self._index_user(value, f)
+
+    def __iter__(self):
+        """Iterate over the addresses that the pool holds dicts for, in
+        address order.
+        """
+        for value in sorted(self._addresses):
+            yield self._addresses[value]
+
+    @staticmethod
+    def _user_key(f):
+        # Addresses that are not used by anything are found through the
+        # free cursor rather than this index
+        if not f.get('used-by'):
+            return None
+
+        return f['used-by'], f.get('host')
+
+    def _index_user(self, value, f):
+        key = self._user_key(f)
+        if key:
+            self._by_user.setdefault(key, set()).add(value)
+
+    def _unindex_user(self, value, f):
+        key = self._user_key(f)
+        if key in self._by_user:
+            self._by_user[key].discard(value)
+            if not self._by_user[key]:
+                del self._by_user[key]
+
+    def _get_value(self, value):
+        f = self._addresses.get(value)
+        if f is None:
+            f = {'addr': self._space.address(value),
+                 'free': True,
+                 'used-by': "",
+                 'host': "",
+                 'server-id': "",
+                 'persisted': False,
+                 'allocated': False}
+            self._addresses[value] = f
+
+        return f
+
+    def get(self, addr):
+        """Return the address dict for addr, or None if it is not in the
+        pool.
+        """
+        if not self._space:
+            return None
+
+        value = self._space.value(addr)
+        if value is None:
+            return None
+
+        return self._get_value(value)
+
+    def get_used_by(self, used_by, host):
+        """Return the lowest address used by used_by on host, or None."""
+        values = self._by_user.get((used_by, host))
+        if not values:
+            return None
+
+        return self._addresses[min(values)]
+
+    def get_free(self):
+        """Return the lowest free address, or None if there is none."""
+        while self._free_cursor is not None:
+            f = self._addresses.get(self._free_cursor)
+            if f is None or f['free']:
+                return self._get_value(self._free_cursor)
+
+            self._free_cursor = self._space.next_value(self._free_cursor + 1)
+
+        return None
+
+    def allocate(self, f, used_by, host, server_id):
+        value = self._space.value(f['addr'])
+        self._unindex_user(value, f)
+
+        f['free'] = False
+        f['used-by'] = used_by
+        f['host'] = host
+        f['server-id'] = server_id
+        f['allocated'] = True
+
+        self._index_user(value, f)
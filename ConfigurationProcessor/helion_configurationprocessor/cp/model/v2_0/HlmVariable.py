@@ -13,10 +13,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 #
-from stevedore import driver
-
-from helion_configurationprocessor.cp.model.StatePersistor \
-    import StatePersistor
+from helion_configurationprocessor.cp.model.PluginRegistry \
+    import PluginRegistry
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
 from helion_configurationprocessor.cp.model.Version \
     import Version
 from helion_configurationprocessor.cp.model.CPSecurity \
@@ -34,7 +34,8 @@ class HlmVariable(object):
         if value.count('%') != 2:
             return value
 
-        sp = StatePersistor(models, controllers, 'private_data.yml')
+        sp = StatePersistorRegistry.get(models, controllers,
+                                        'private_data.yml')
 
         if not instructions['refresh_passwords']:
             ri = sp.recall_info([name])
@@ -60,9 +61,8 @@ class HlmVariable(object):
         try:
             namespace = 'helion.configurationprocessor.variable'
 
-            mgr = driver.DriverManager(
-                namespace=namespace, name=variable_type, invoke_on_load=True,
-                invoke_args=(instructions, models, controllers))
+            mgr = PluginRegistry.load(
+                namespace, variable_type, (instructions, models, controllers))
 
         except RuntimeError as e:
             return value
@@ -0,0 +1,225 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import heapq
+
+
+class ServerGroupIndex(object):
+    """Indexes the servers and networks in a tree of Server Groups, to
+    answer the same questions as the ServerGroup search functions
+    without walking the tree each time.  Each group is indexed the
+    first time it is searched, so the index must be created after the
+    groups have been linked and their networks added.  Servers and sub
+    groups can be added at any time: each search checks the number of
+    servers and sub groups of every group under the one it searches,
+    and indexes it again if they have changed.
+
+    For get_server() the servers under each group are indexed by role
+    and state, in the order that ServerGroup.get_server() would search
+    them: the group's own servers, then those of each of its sub groups
+    in turn.  A group is indexed with the states its servers have the
+    first time it is searched.  A server that has left that state since
+    is dropped from the index when it is next reached, so searches stay
+    correct as servers are allocated.  A server that is moved into a
+    state after that must be moved with set_state(), so that it is
+    added to the index under its new state.
+    """
+    def __init__(self):
+        # {id(group): [server, ...]} in search order
+        self._servers = dict()
+
+        # {id(group): [(group or sub group, servers, sub groups), ...]}
+        # with the number of servers and sub groups when it was indexed
+        self._shapes = dict()
+
+        # {id(group): {id(server): position}}
+        self._positions = dict()
+
+        # {id(group): set of server ids}
+        self._server_ids = dict()
+
+        # {id(group): {(role, state): [(position, server), ...]}}
+        self._available = dict()
+
+        # {id(group): {network group: network}}, including the networks
+        # of the group's parents
+        self._networks = dict()
+
+    @staticmethod
+    def _shape(sg):
+        return sg, len(sg.get('servers', [])), len(sg.get('groups', []))
+
+    def _search_order(self, group):
+        # Servers in the order ServerGroup.get_server() searches them
+        key = id(group)
+        if key in self._servers:
+            for sg, servers, groups in self._shapes[key]:
+                if self._shape(sg) != (sg, servers, groups):
+                    # Servers or groups have been added since the group
+                    # was indexed
+                    for cache in (self._servers, self._server_ids,
+                                  self._available, self._positions):
+                        cache.pop(key, None)
+                    break
+
+        if key not in self._servers:
+            order = []
+            shapes = []
+            visited = set()
+
+            def _add(sg):
+                if id(sg) in visited:
+                    return
+                visited.add(id(sg))
+
+                shapes.append(self._shape(sg))
+                order.extend(sg.get('servers', []))
+                for child in sg.get('groups', []):
+                    _add(child)
+
+            _add(group)
+            self._servers[key] = order
+            self._shapes[key] = shapes
+
+        return self._servers[key]
+
+    def _index(self, group):
+        key = id(group)
+        order = self._search_order(group)
+        if key not in self._available:
+            entries = dict()
+            positions = dict()
+            for position, server in enumerate(order):
+                entries.setdefault((server['role'], server['state']),
+                                   []).append((position, server))
+                positions[id(server)] = position
+
+            # Each list is already in position order, and so is a heap
+            self._available[key] = entries
+            self._positions[key] = positions
+
+        return self._available[key]
+
+    def set_state(self, server, state):
+        """Set the state of a server, and index it under that state in
+        every group that has been indexed.
+        """
+        server['state'] = state
+        for key, positions in self._positions.iteritems():
+            position = positions.get(id(server))
+            if position is not None:
+                heapq.heappush(
+                    self._available[key].setdefault(
+                        (server['role'], state), []),
+                    (position, server))
+
+    def _first(self, group, state, roles):
+        entries = self._index(group)
+
+        res = None
+        for (role, entry_state), heap in entries.iteritems():
+            if entry_state != state or role not in roles:
+                continue
+
+            # Drop servers that are no longer in this state
+            while heap and heap[0][1]['state'] != state:
+                heapq.heappop(heap)
+
+            if heap and (res is None or heap[0][0] < res[0]):
+                res = heap[0]
+
+        if res:
+            return res[1]
+
+        return None
+
+    def get_server(self, sg_list, state, roles, default=None):
+        """Find an available server in a list of server groups, as
+        ServerGroup.get_server() does, returning the server and the
+        name of the group in sg_list that it was found under.
+        """
+        for sg in sg_list:
+            res = self._first(sg, state, roles)
+            if res:
+                return res, sg.get('name', None)
+
+        # None found - try the default
+        if default:
+            return self.get_server([default], state, roles)
+        else:
+            return None, None
+
+    def _ids_under(self, group):
+        key = id(group)
+        order = self._search_order(group)
+        if key not in self._server_ids:
+            self._server_ids[key] = set(s['id'] for s in order)
+
+        return self._server_ids[key]
+
+    def get_zone(self, sg_list, server_id, default=None):
+        """Find the group in a list of server groups that a server is
+        in, directly or through a sub group, as ServerGroup.get_zone()
+        does.
+        """
+        for sg in sg_list:
+            if server_id in self._ids_under(sg):
+                return sg.get('name', None)
+
+        # None found - try the default
+        if default:
+            return self.get_zone([default], server_id)
+        else:
+            return None
+
+    def _networks_of(self, group):
+        key = id(group)
+        if key not in self._networks:
+            # Walk up the chain of parents, so that the networks of a
+            # group hide those of its parents
+            chain = []
+            visited = set()
+            sg = group
+            while sg and id(sg) not in self._networks and id(sg) not in visited:
+                chain.append(sg)
+                visited.add(id(sg))
+                sg = sg.get('parent')
+
+            networks = dict()
+            if sg and id(sg) in self._networks:
+                networks = self._networks[id(sg)]
+
+            for sg in reversed(chain):
+                networks = dict(networks)
+                networks.update(sg.get('network-groups', {}))
+                self._networks[id(sg)] = networks
+
+        return self._networks[key]
+
+    def find_network(self, elem_sg, net_group, default=None):
+        """Find the network in a network group for a server group, from
+        the group or the nearest of its parents, as
+        ServerGroup.find_network() does.
+        """
+        if elem_sg:
+            res = self._networks_of(elem_sg).get(net_group)
+            if res:
+                return res
+
+        # None found - try the default
+        if default:
+            return self.find_network(default, net_group)
+        else:
+            return None
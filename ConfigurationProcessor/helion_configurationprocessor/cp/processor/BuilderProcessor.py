@@ -14,11 +14,11 @@
 # under the License.
 #
 import logging
-import timeit
-import traceback
 
 from ..model.CPProcessor import CPProcessor
 from ..model.CPLogging import CPLogging as KenLog
+from ..model.PluginWorkers import PluginWorkers
+from ..model.PluginWorkers import run_plugin
 
 
 LOG = logging.getLogger(__name__)
@@ -49,6 +49,11 @@ class BuilderProcessor(CPProcessor):
         invoke_args = (self._instructions, self._models,
                        self._controllers)
 
+        workers = self._instructions.get('builder_workers', 1)
+        if workers > 1:
+            self._run_builders_in_parallel(invoke_args, workers)
+            return return_value
+
         order = self.get_plugin_order('builder', 'builders', invoke_args)
         for builder in order:
             mgr = self.load_plugin('builder', builder, invoke_args)
@@ -59,26 +64,65 @@ class BuilderProcessor(CPProcessor):
                 continue
 
             self.start_plugin(builder)
+            self._process_result(builder, mgr,
+                                 run_plugin(mgr.driver, 'build'))
 
-            try:
-                duration = timeit.timeit(mgr.driver.build, number=1)
-            except Exception as e:
-                msg = 'Builder %s encountered an exception: %s\n' % (
-                    builder, e)
-                self.log_and_print_error(KenLog.fcn(), msg
-                                         + traceback.format_exc())
-                continue
+        return return_value
 
-            self.process_warnings(mgr, builder)
+    def _run_builders_in_parallel(self, invoke_args, workers):
+        LOG.info('%s(): workers=%d' % (KenLog.fcn(), workers))
 
-            if not self.process_errors(mgr, builder):
-                continue
+        levels = self.get_plugin_levels('builder', 'builders', invoke_args)
+        for level in levels:
+            builders = []
+            for builder in level:
+                mgr = self.load_plugin('builder', builder, invoke_args)
+                if not mgr:
+                    continue
 
-            self.process_artifacts(mgr, builder)
+                if not mgr.driver.is_compatible_with_cloud(invoke_args):
+                    continue
 
-            self.complete_plugin(builder, duration)
+                builders.append((builder, mgr))
 
-        return return_value
+            # Builders that opt out (or that the pool could not run) are
+            # built here while the workers run the rest of the level
+            pool = PluginWorkers(
+                [(b, m.driver) for b, m in builders
+                 if m.driver.is_parallel_safe()], 'build', workers)
+
+            results = dict()
+            for builder, mgr in builders:
+                if not pool.is_running(builder):
+                    results[builder] = run_plugin(mgr.driver, 'build')
+
+            results.update(pool.results())
+
+            # Report in plugin order so that the output is the same as
+            # for a serial build
+            for builder, mgr in builders:
+                if builder not in results:
+                    results[builder] = run_plugin(mgr.driver, 'build')
+
+                self.start_plugin(builder)
+                self._process_result(builder, mgr, results[builder])
+
+    def _process_result(self, builder, mgr, result):
+        duration, error, error_traceback = result
+        if error is not None:
+            msg = 'Builder %s encountered an exception: %s\n' % (
+                builder, error)
+            self.log_and_print_error(KenLog.fcn(), msg + error_traceback)
+            return
+
+        self.process_warnings(mgr, builder)
+
+        if not self.process_errors(mgr, builder):
+            return
+
+        self.process_artifacts(mgr, builder)
+
+        self.complete_plugin(builder, duration)
 
     @property
     def models(self):
@@ -62,4 +62,4 @@ class CleanUpStageProcessor(CPProcessor):
         return float(input_version) >= float(2)
 
     def version(self):
-        return Version.get(self.instructions['cloud_input_path'])
+        return Version.get_cloud_version(self._instructions)
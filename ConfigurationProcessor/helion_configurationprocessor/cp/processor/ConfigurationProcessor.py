@@ -33,6 +33,11 @@ from .InputProcessor import InputProcessor
 from .CleanUpStageProcessor import CleanUpStageProcessor
 
 from ..model.Version import Version
+from ..model.ConfigFileCache import ConfigFileCache
+from ..model.StatePersistor import StatePersistor
+from ..model.StatePersistorRegistry import StatePersistorRegistry
+from ..model.NetworkTable import NetworkTable
+from ..model.NetworkAddressIndex import NetworkAddressIndex
 
 from ..model.CPLogging import CPLogging as KenLog
 
@@ -59,6 +64,12 @@ class ConfigurationProcessor(KenLog):
 
         LOG.info('%s()' % KenLog.fcn())
 
+        ConfigFileCache.clear()
+        StatePersistorRegistry.clear()
+        StatePersistorRegistry.configure(self._instructions)
+        NetworkTable.clear()
+        NetworkAddressIndex.clear()
+
         self._establish_version()
 
     def _establish_version(self):
@@ -66,6 +77,8 @@ class ConfigurationProcessor(KenLog):
 
         try:
             version = Version.get(self._instructions['cloud_input_path'])
+            self._instructions['cloud_version'] = version
+
             version = Version.normalize(version)
             self._instructions['model_version'] = version
 
@@ -73,6 +86,8 @@ class ConfigurationProcessor(KenLog):
             self._establish_path('network_output_path', version)
             self._establish_path('persistent_state', version)
             self._establish_path('cloud_checkpoint_path', version)
+            if 'input_cache_path' in self._instructions:
+                self._establish_path('input_cache_path', version)
         except Exception as e:
             msg = 'Configuration Processor encountered an exception: %s\n' % e
             LOG.error(msg + traceback.format_exc())
@@ -86,6 +101,14 @@ class ConfigurationProcessor(KenLog):
         val = val.replace('@CLOUD_VERSION@', version)
         self._instructions[element] = val
 
+    def _run_stage(self, processor):
+        try:
+            return timeit.timeit(processor.process, number=1)
+        finally:
+            # Write any state that plugins have left uncommitted, so that
+            # the next stage sees it on disk
+            StatePersistor.commit_all()
+
     def process_input(self):
         LOG.error('%s()' % KenLog.fcn())
         print("\n%s Input Processing Started %s" % (
@@ -98,7 +121,7 @@ class ConfigurationProcessor(KenLog):
             return True
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -120,7 +143,7 @@ class ConfigurationProcessor(KenLog):
         processor = ValidatorProcessor(self._instructions, self._config_files)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -141,7 +164,7 @@ class ConfigurationProcessor(KenLog):
         processor = ModelProcessor(self._instructions, self._config_files)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -164,7 +187,7 @@ class ConfigurationProcessor(KenLog):
             self._instructions, self._models)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -188,7 +211,7 @@ class ConfigurationProcessor(KenLog):
             self._instructions, self._models, self._controllers)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -211,7 +234,7 @@ class ConfigurationProcessor(KenLog):
         processor = CleanUpStageProcessor(self._instructions, self._models)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -233,7 +256,7 @@ class ConfigurationProcessor(KenLog):
             self._instructions, self._models, self._controllers)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -255,7 +278,7 @@ class ConfigurationProcessor(KenLog):
             self._instructions, self._models, self._controllers)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -277,7 +300,7 @@ class ConfigurationProcessor(KenLog):
             self._instructions, self._models, self._controllers)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -299,7 +322,7 @@ class ConfigurationProcessor(KenLog):
             self._instructions, self._models, self._controllers)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
@@ -322,12 +345,16 @@ class ConfigurationProcessor(KenLog):
             self._config_files)
 
         try:
-            duration = timeit.timeit(processor.process, number=1)
+            duration = self._run_stage(processor)
+            exported = self._export_persistent_state()
             self.add_warnings(processor.warnings)
             if not processor.ok:
                 self.add_errors(processor.errors)
                 return False
 
+            if not exported:
+                return False
+
             print('\nFinalize Process Succeeded in %0.3fs' % duration)
             return True
 
@@ -335,6 +362,18 @@ class ConfigurationProcessor(KenLog):
             print('Unknown Exception: %s' % e)
             return False
 
+    def _export_persistent_state(self):
+        # Finalize is the last stage of every run that changes the
+        # persistent state
+        try:
+            StatePersistorRegistry.export_all(self._models,
+                                              self._controllers)
+        except Exception as e:
+            self.add_error('Could not export the persistent state: %s' % e)
+            return False
+
+        return True
+
     @property
     def errors(self):
         return self._errors
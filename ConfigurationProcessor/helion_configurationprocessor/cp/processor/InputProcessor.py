@@ -21,6 +21,9 @@ import traceback
 
 from ..model.CPProcessor import CPProcessor
 from ..model.CPConfigFile import CPConfigFile
+from ..model.ConfigFileCache import ConfigFileCache
+from ..model.ParsedFileStore import ParsedFileStore
+from ..model.IndexedConfigFiles import IndexedConfigFiles
 from ..model.CPLogging import CPLogging as KenLog
 from ..model.Version import Version
 
@@ -51,11 +54,19 @@ class InputProcessor(CPProcessor):
         self._cloud_service_dir = os.path.join(self._cloud_service_path,
                                                'services')
 
-        self._config_files = []
+        # Number of worker processes used to parse input files; 1 parses
+        # them serially
+        self._input_workers = instructions.get('input_workers', 1)
+
+        self._config_files = IndexedConfigFiles()
 
     def process(self):
         LOG.info('%s()' % KenLog.fcn())
         self._errors = []
+
+        store = ParsedFileStore.for_run(self.instructions,
+                                        'input_cache.pickle')
+        ConfigFileCache.attach_store(store)
         try:
             self._load_inputs(self._cloud_path,
                               exclude=['services', 'service-components'])
@@ -65,6 +76,14 @@ class InputProcessor(CPProcessor):
             self.log_and_print_error(KenLog.fcn(), msg
                                      + traceback.format_exc())
             self.add_error(e)
+        finally:
+            ConfigFileCache.attach_store(None)
+
+        if store:
+            try:
+                store.flush()
+            except Exception as e:
+                self.add_warning('Could not write the input cache: %s' % e)
 
         return len(self._errors) == 0
 
@@ -72,12 +91,18 @@ class InputProcessor(CPProcessor):
         return float(input_version) >= float(2)
 
     def version(self):
-        return Version.get(self.instructions['cloud_input_path'])
+        return Version.get_cloud_version(self.instructions)
 
     def _load_inputs(self, path, exclude=[]):
         LOG.info('%s()' % KenLog.fcn())
         exclude = [a.lower() for a in exclude]
-        for filename in self._walk_dir(path):
+        filenames = list(self._walk_dir(path))
+        if self._input_workers > 1:
+            # Files are still merged below in walk order, so the result
+            # is the same as a serial load
+            ConfigFileCache.preload(filenames, self._input_workers)
+
+        for filename in filenames:
             try:
                 file_contents = self._load_file(filename, exclude=exclude)
             except Exception as e:
@@ -126,10 +151,12 @@ class InputProcessor(CPProcessor):
             if key.lower() == 'product':
                 element['version'] = float(value['version'])
             else:
+                # Copy the list so that merging in _add_file_contents
+                # never modifies the cached contents of the file
                 if not isinstance(value, list):
                     element[key] = [value]
                 else:
-                    element[key] = value
+                    element[key] = list(value)
         return element
 
     def _create_content(self, version, key, value):
@@ -14,11 +14,13 @@
 # under the License.
 #
 import logging
-import timeit
-import traceback
 
 from ..model.CPProcessor import CPProcessor
 from ..model.CPLogging import CPLogging as KenLog
+from ..model.ConfigFileCache import ConfigFileCache
+from ..model.ParsedFileStore import ParsedFileStore
+from ..model.PluginWorkers import PluginWorkers
+from ..model.PluginWorkers import run_plugin
 
 
 LOG = logging.getLogger(__name__)
@@ -37,8 +39,30 @@ class ValidatorProcessor(CPProcessor):
     def process(self):
         LOG.info('%s()' % KenLog.fcn())
 
+        # Keep the parsed schema files in the input cache when it is
+        # enabled; SchemaRegistry compiles each schema once per process
+        store = ParsedFileStore.for_run(self._instructions,
+                                        'schema_cache.pickle')
+        ConfigFileCache.attach_store(store)
+        try:
+            self._run_validators()
+        finally:
+            ConfigFileCache.attach_store(None)
+
+        if store:
+            try:
+                store.flush()
+            except Exception as e:
+                self.add_warning('Could not write the schema cache: %s' % e)
+
+    def _run_validators(self):
         invoke_args = (self._instructions, self._config_files)
 
+        workers = self._instructions.get('validator_workers', 1)
+        if workers > 1:
+            self._run_validators_in_parallel(invoke_args, workers)
+            return
+
         order = self.get_plugin_order('validator', 'validators', invoke_args)
         for validator in order:
             mgr = self.load_plugin('validator', validator, invoke_args)
@@ -52,24 +76,89 @@ class ValidatorProcessor(CPProcessor):
 
             if mgr.driver.check_dependency_success():
                 self.start_plugin(validator)
-                try:
-                    duration = timeit.timeit(mgr.driver.validate, number=1)
-                except Exception as e:
-                    msg = 'Validator %s encountered an exception: %s\n' % (
-                        validator, e)
-                    self.log_and_print_error(KenLog.fcn(), msg
-                                             + traceback.format_exc())
-                    self._instructions['validator_success'][validator] = False
+                result = run_plugin(mgr.driver, 'validate')
+                self._instructions['validator_success'][validator] = \
+                    self._process_result(validator, mgr, result)
+            else:
+                self._skip_validator(validator)
+
+    def _run_validators_in_parallel(self, invoke_args, workers):
+        LOG.info('%s(): workers=%d' % (KenLog.fcn(), workers))
+
+        calculator = self._calculate_plugin_order(
+            'validator', 'validators', invoke_args)
+
+        # Run the validators level by level, so that each one knows
+        # whether the validators it depends on succeeded
+        results = dict()
+        for level in calculator.get_levels():
+            validators = []
+            for validator in level:
+                mgr = self.load_plugin('validator', validator, invoke_args)
+                if not mgr:
                     continue
 
-                self.process_warnings(mgr, validator)
-
-                if not self.process_errors(mgr, validator):
-                    self._instructions['validator_success'][validator] = False
+                if not mgr.driver.is_compatible_with_cloud(invoke_args):
                     continue
 
-                self.complete_plugin(validator, duration)
-            else:
-                msg = 'Validator %s skipped since a dependent validator failed' % validator
-                self.log_and_print_message(KenLog.fcn(), msg)
-                self._instructions['validator_success'][validator] = False
+                self._instructions['validator_success'][validator] = True
+
+                if mgr.driver.check_dependency_success():
+                    validators.append((validator, mgr))
+                else:
+                    self._instructions['validator_success'][validator] = \
+                        False
+                    results[validator] = None
+
+            pool = PluginWorkers(
+                [(v, m.driver) for v, m in validators
+                 if m.driver.is_parallel_safe()], 'validate', workers)
+
+            for validator, mgr in validators:
+                if not pool.is_running(validator):
+                    results[validator] = run_plugin(mgr.driver, 'validate')
+
+            results.update(pool.results())
+
+            for validator, mgr in validators:
+                if validator not in results:
+                    results[validator] = run_plugin(mgr.driver, 'validate')
+
+                duration, error, _ = results[validator]
+                if error is not None or not mgr.driver.ok:
+                    self._instructions['validator_success'][validator] = \
+                        False
+
+        # Report in the same order as a serial run
+        for validator in calculator.get():
+            if validator not in results:
+                continue
+
+            if results[validator] is None:
+                self._skip_validator(validator)
+                continue
+
+            mgr = self.load_plugin('validator', validator, invoke_args)
+            self.start_plugin(validator)
+            self._process_result(validator, mgr, results[validator])
+
+    def _process_result(self, validator, mgr, result):
+        duration, error, error_traceback = result
+        if error is not None:
+            msg = 'Validator %s encountered an exception: %s\n' % (
+                validator, error)
+            self.log_and_print_error(KenLog.fcn(), msg + error_traceback)
+            return False
+
+        self.process_warnings(mgr, validator)
+
+        if not self.process_errors(mgr, validator):
+            return False
+
+        self.complete_plugin(validator, duration)
+        return True
+
+    def _skip_validator(self, validator):
+        msg = 'Validator %s skipped since a dependent validator failed' % validator
+        self.log_and_print_message(KenLog.fcn(), msg)
+        self._instructions['validator_success'][validator] = False
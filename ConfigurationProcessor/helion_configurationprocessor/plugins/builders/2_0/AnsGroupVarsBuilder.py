@@ -403,5 +403,9 @@ class AnsGroupVarsBuilder(BuilderPlugin):
                         if tag['name'] not in net_group_tag_values:
                             net_group_tag_values[tag['name']] = tag['values']
 
+    def is_parallel_safe(self):
+        # Generated variable values are recorded in the persistent state
+        return False
+
     def get_dependencies(self):
         return []
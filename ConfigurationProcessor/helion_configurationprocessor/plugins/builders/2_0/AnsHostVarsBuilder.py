@@ -13,7 +13,6 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 #
-import netaddr
 import os
 import logging
 import logging.config
@@ -33,6 +32,8 @@ from helion_configurationprocessor.cp.model.BuilderPlugin \
     import ArtifactMode
 from helion_configurationprocessor.cp.model.CPLogging \
     import CPLogging as KenLog
+from helion_configurationprocessor.cp.model.NetworkTable \
+    import NetworkTable
 from helion_configurationprocessor.cp.lib.DataTransformer \
     import DataTransformer
 
@@ -68,6 +69,8 @@ class AnsHostVarsBuilder(BuilderPlugin):
         pass_through = CloudModel.get(self._cloud_internal, 'pass_through')
         components = CloudModel.get(self._cloud_internal, 'components')
         services = CloudModel.get(self._cloud_internal, 'services')
+        self._network_table = NetworkTable(
+            CloudModel.get(self._cloud_internal, 'networks'))
 
         for cp_name, cp in control_planes.iteritems():
             for cluster in cp['clusters']:
@@ -414,17 +417,6 @@ class AnsHostVarsBuilder(BuilderPlugin):
             if interface['device'] in devices_to_vips:
                 interface['vips'] = list(devices_to_vips[interface['device']])
 
-    def _cidr_to_mask(self, cidr):
-
-        mask = int(str.split(cidr, '/')[1])
-        bits = 0
-        for i in xrange(32 - mask, 32):
-            bits |= (1 << i)
-        return "%d.%d.%d.%d" % ((bits & 0xff000000) >> 24,
-                                (bits & 0xff0000) >> 16,
-                                (bits & 0xff00) >> 8,
-                                (bits & 0xff))
-
     def _build_network_host_vars(self, server):
         server_bond_dictionary = {}
         server_ether_dictionary = {}
@@ -666,9 +658,11 @@ class AnsHostVarsBuilder(BuilderPlugin):
             rte_netmask = '0.0.0.0'
         else:
             # If route is not 'default',
-            ipNetwork = netaddr.IPNetwork(route['cidr'])
-            rte_network = str(ipNetwork.network)
-            rte_netmask = str(ipNetwork.netmask)
+            net = self._network_table.get(route.get('net_name'))
+            if not net:
+                net = NetworkTable.cidr_info(route['cidr'])
+            rte_network = net.network
+            rte_netmask = net.netmask
         return rte_network, rte_netmask, gateway
 
     def migrateBondOptions(self, options):
@@ -850,5 +844,10 @@ class AnsHostVarsBuilder(BuilderPlugin):
 
         return firewall
 
+    def is_parallel_safe(self):
+        # The cloud firewall is added to the cloud model for the
+        # firewall-info builder, and warnings are printed to the console
+        return False
+
     def get_dependencies(self):
         return []
@@ -201,5 +201,9 @@ class AnsibleHostsBuilder(BuilderPlugin):
                         f.write("%s\n" % server['hostname'])
                 f.write("\n")
 
+    def is_parallel_safe(self):
+        # Warnings are printed to the console
+        return False
+
     def get_dependencies(self):
         return []
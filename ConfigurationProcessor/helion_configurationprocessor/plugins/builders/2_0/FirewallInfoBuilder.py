@@ -99,5 +99,9 @@ class FirewallInfoBuilder(BuilderPlugin):
         with open(filename, 'w') as fp:
             yaml.dump(sorted_firewall, fp, default_flow_style=False, indent=4)
 
+    def is_parallel_safe(self):
+        # The firewall settings are printed to the console
+        return False
+
     def get_dependencies(self):
         return ['ans-host-vars-2.0']
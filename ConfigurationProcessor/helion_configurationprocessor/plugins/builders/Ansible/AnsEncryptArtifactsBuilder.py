@@ -85,24 +85,13 @@ class AnsEncryptArtifactsBuilder(BuilderPlugin):
             fp.close()
             os.remove(pw_file_name)
 
-    def _decrypt_file_contents(self, file_name):
-        fp = open(file_name, 'r')
-        lines = fp.readlines()
-        fp.close()
-
+    def _decrypt_file_contents(self, file_name, lines, plaintexts):
         need_to_write = False
         for i in range(len(lines)):
-            line = lines[i]
-            if line.find('='):
-                tokens = line.split()
-                for t in tokens:
-                    if t.endswith('='):
-                        plaintext = CPSecurity.decrypt(
-                            self._instructions['encryption_key'], t)
-
-                        if plaintext is not None:
-                            lines[i] = line.replace(t, plaintext)
-                            need_to_write = True
+            line = CPSecurity.replace_tokens(lines[i], plaintexts)
+            if line != lines[i]:
+                lines[i] = line
+                need_to_write = True
 
         if need_to_write:
             fp = open(file_name, 'w')
@@ -119,12 +108,29 @@ class AnsEncryptArtifactsBuilder(BuilderPlugin):
         sh.ansible_vault.encrypt(file_name, pw_file_arg)
 
     def _encrypt_directory(self, directory):
+        contents = []
         for root, dirs, files in os.walk(directory):
             for f in files:
                 file_name = os.path.join(root, f)
                 if os.path.isfile(file_name):
-                    self._decrypt_file_contents(file_name)
-                    self._encrypt_file(file_name)
+                    fp = open(file_name, 'r')
+                    contents.append((file_name, fp.readlines()))
+                    fp.close()
+
+        # Decrypt the tokens of all of the files in one batch
+        tokens = set()
+        for file_name, lines in contents:
+            for line in lines:
+                tokens.update(CPSecurity.find_tokens(line))
+
+        tokens = sorted(tokens)
+        plaintexts = dict(zip(tokens, CPSecurity.decrypt_many(
+            self._instructions['encryption_key'], tokens,
+            workers=self._instructions.get('builder_workers', 1))))
+
+        for file_name, lines in contents:
+            self._decrypt_file_contents(file_name, lines, plaintexts)
+            self._encrypt_file(file_name)
 
     def get_dependencies(self):
         return ['ans-host-vars-2.0',
@@ -28,6 +28,8 @@ from helion_configurationprocessor.cp.model.CheckpointerPlugin \
     import ArtifactMode
 from helion_configurationprocessor.cp.model.CPLogging \
     import CPLogging as KenLog
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
 
 
 LOG = logging.getLogger(__name__)
@@ -53,6 +55,13 @@ class PersistentStateCheckpointer(CheckpointerPlugin):
         src = self._get_from()
         dst = self._get_to()
 
+        # Make sure the YAML files hold the state of this run
+        try:
+            StatePersistorRegistry.export_all(self._models,
+                                              self._controllers)
+        except Exception as e:
+            self.add_error('Could not export the persistent state: %s' % e)
+
         for o in os.listdir(src):
             src_obj = os.path.join(src, o)
             dst_obj = os.path.join(dst, o)
@@ -21,6 +21,10 @@ from helion_configurationprocessor.cp.model.v2_0.CloudModel \
     import CloudModel
 from helion_configurationprocessor.cp.model.v2_0.ServerGroup \
     import ServerGroup
+from helion_configurationprocessor.cp.model.v2_0.ServerGroupIndex \
+    import ServerGroupIndex
+from helion_configurationprocessor.cp.model.v2_0.AddressPool \
+    import AddressPool
 
 from helion_configurationprocessor.cp.model.CPLogging \
     import CPLogging as KenLog
@@ -32,15 +36,19 @@ from helion_configurationprocessor.cp.model.v2_0 \
 from helion_configurationprocessor.cp.model.v2_0 \
     import ServerState
 
-from helion_configurationprocessor.cp.model.StatePersistor \
-    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
+from helion_configurationprocessor.cp.model.NetworkTable \
+    import NetworkTable
+from helion_configurationprocessor.cp.model.NetworkAddressIndex \
+    import NetworkAddressIndex
 
 from helion_configurationprocessor.cp.model.v2_0.HlmPaths \
     import HlmPaths
 
 
 from copy import deepcopy
-from netaddr import IPNetwork, IPAddress
+from netaddr import IPAddress, AddrFormatError
 
 LOG = logging.getLogger(__name__)
 
@@ -54,10 +62,10 @@ class CloudCpLiteGenerator(GeneratorPlugin):
 
         LOG.info('%s()' % KenLog.fcn())
 
-        self._address_state_persistor = StatePersistor(
+        self._address_state_persistor = StatePersistorRegistry.get(
             self._models, self._controllers, 'ip_addresses.yml')
 
-        self._server_allocation_state_persistor = StatePersistor(
+        self._server_allocation_state_persistor = StatePersistorRegistry.get(
             self._models, self._controllers, 'server_allocations.yml')
 
         self.cloud_desc = self._models['CloudDescription']['cloud']
@@ -90,7 +98,12 @@ class CloudCpLiteGenerator(GeneratorPlugin):
 
     def generate(self):
         LOG.info('%s()' % KenLog.fcn())
-        self._generate_cp_lite()
+
+        # Address and server allocations are written once, when the
+        # model has been generated
+        with self._address_state_persistor, \
+                self._server_allocation_state_persistor:
+            self._generate_cp_lite()
 
     def _generate_cp_lite(self):
         LOG.info('%s()' % KenLog.fcn())
@@ -154,36 +167,24 @@ class CloudCpLiteGenerator(GeneratorPlugin):
         for net in CloudModel.get(cloud_version, 'networks'):
             networks[net['name']] = net
 
-            network_addresses[net['name']] = []
-            if 'cidr' in net:
-                # Find the first and last address of the cidr
-                cidr_start = None
-                cidr_end = None
-                for ipaddr in IPNetwork(unicode(net['cidr'])).iter_hosts():
-                    if not cidr_start:
-                        cidr_start = ipaddr
-                    cidr_end = ipaddr
-
-                if 'start-address' in net:
-                    net_start = IPAddress(net['start-address'])
-                else:
-                    net_start = cidr_start
+        # Sort the persisted and server addresses into the networks whose
+        # address space they are in, using the index shared with the
+        # validators
+        network_index = NetworkAddressIndex.get(networks)
+        persisted_addresses = self._addresses_by_network(
+            network_index,
+            self._address_values(self._address_state_persistor.recall_info()))
+        server_address_values = self._addresses_by_network(
+            network_index, self._address_values(server_addresses))
 
-                # Check end Address is valid
-                if 'end-address' in net:
-                    net_end = IPAddress(net['end-address'])
-                else:
-                    net_end = cidr_end
-
-                for ipaddr in IPNetwork(unicode(net['cidr'])).iter_hosts():
-                    addr = str(ipaddr)
-                    if (addr != net.get('gateway-ip', '') and
-                            ipaddr >= net_start and ipaddr <= net_end):
-                        network_addresses[net['name']].append(
-                            {'addr': str(addr),
-                             'free': True})
-                self.generate_addresses(network_addresses[net['name']],
-                                        server_addresses)
+        for net in CloudModel.get(cloud_version, 'networks'):
+            network_addresses[net['name']] = AddressPool()
+            if 'cidr' in net:
+                space = NetworkTable.compile(net)
+                network_addresses[net['name']] = AddressPool(
+                    space, self.generate_addresses(
+                        space, persisted_addresses.get(net['name'], {}),
+                        server_address_values.get(net['name'], {})))
 
         # Interface Models
         for iface in CloudModel.get(cloud_version, 'interface-models'):
@@ -500,6 +501,10 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                 ServerGroup.add_network(default_server_group, net_name,
                                         net['network-group'])
 
+        # Index the server groups, now that they are linked and have their
+        # networks.  Servers are indexed when their groups are first searched
+        server_index = ServerGroupIndex()
+
         # Establish the min and max size of each cluster and resource group
         for cp_name, cp in control_planes.iteritems():
             for cluster in cp.get('clusters', []):
@@ -561,8 +566,8 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                         server_group = server_groups[s['server-group']]
                     else:
                         server_group = None
-                    net_name = ServerGroup.find_network(server_group, net_group,
-                                                        default_server_group)
+                    net_name = server_index.find_network(server_group, net_group,
+                                                         default_server_group)
                     if net_name:
                         network = networks[net_name]
                         iface['networks'][network['name']] = deepcopy(network)
@@ -809,8 +814,8 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                 # Restore the existing Allocations
                 for alloc in allocations.get(ServerState.ALLOCATED, []):
                     server = alloc['server']
-                    zone = ServerGroup.get_zone(failure_zone_groups,
-                                                server['id'])
+                    zone = server_index.get_zone(failure_zone_groups,
+                                                 server['id'])
                     if zone:
                         allocated_zones.add(zone)
                     elif failure_zones:
@@ -847,8 +852,8 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                         continue
                     else:
                         server = alloc['server']
-                        zone = ServerGroup.get_zone(failure_zone_groups,
-                                                    server['id'])
+                        zone = server_index.get_zone(failure_zone_groups,
+                                                     server['id'])
 
                         if not zone and failure_zones:
                             msg = ("Previously deleted server %s in cluster %s:%s "
@@ -907,10 +912,10 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                     s = None
                     self.explain("Searching for server with role %s in zones: %s" %
                                  (cluster['server-role'], search_zones))
-                    s, zone_name = ServerGroup.get_server(from_zones,
-                                                          state=ServerState.AVAILABLE,
-                                                          roles=cluster['server-role'],
-                                                          default=default_server_group)
+                    s, zone_name = server_index.get_server(from_zones,
+                                                           state=ServerState.AVAILABLE,
+                                                           roles=cluster['server-role'],
+                                                           default=default_server_group)
 
                     if s:
                         self.explain("Allocated server '%s' (%s)" %
@@ -989,8 +994,8 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                     # Restore the existing Allocations
                     for alloc in allocations.get(ServerState.ALLOCATED, []):
                         server = alloc['server']
-                        zone = ServerGroup.get_zone(failure_zone_groups,
-                                                    server['id'])
+                        zone = server_index.get_zone(failure_zone_groups,
+                                                     server['id'])
                         if zone:
                             allocated_zones.add(zone)
                         elif failure_zones:
@@ -1027,8 +1032,8 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                             continue
                         else:
                             server = alloc['server']
-                            zone = ServerGroup.get_zone(failure_zone_groups,
-                                                        server['id'])
+                            zone = server_index.get_zone(failure_zone_groups,
+                                                         server['id'])
                             if not zone and failure_zones:
                                 msg = ("Previously deleted server %s in resource group %s:%s "
                                        "can not be restored as it is not "
@@ -1089,10 +1094,10 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                         s = None
                         self.explain("Searching for server with role %s in zones: %s" %
                                      (resources['server-role'], search_zones))
-                        s, zone_name = ServerGroup.get_server(from_zones,
-                                                              state=ServerState.AVAILABLE,
-                                                              roles=resources['server-role'],
-                                                              default=default_server_group)
+                        s, zone_name = server_index.get_server(from_zones,
+                                                               state=ServerState.AVAILABLE,
+                                                               roles=resources['server-role'],
+                                                               default=default_server_group)
 
                         if s:
                             self.explain("Allocated server '%s' (%s)" %
@@ -2017,34 +2022,66 @@ class CloudCpLiteGenerator(GeneratorPlugin):
         return network
 
     #
-    # Generate addresses and load persisted address allocations
+    # Map the integer value of each address in a dict keyed by address
+    # to the address and its data
     #
-    def generate_addresses(self, addresses, server_addresses):
-        for f in addresses:
-            addr = f['addr']
-
-            pi = self._address_state_persistor.recall_info([addr])
-            if pi:
-                f['free'] = bool(pi['free'])
-                f['used-by'] = pi['used-by']
-                f['host'] = pi['host']
-                f['server-id'] = pi.get('server-id')
-                f['persisted'] = True
-                f['allocated'] = False
-            elif addr in server_addresses:
-                f['free'] = False
-                f['used-by'] = ""
-                f['host'] = ""
-                f['server-id'] = server_addresses[addr]
-                f['persisted'] = False
-                f['allocated'] = False
-            else:
-                f['free'] = True
-                f['used-by'] = ""
-                f['host'] = ""
-                f['server-id'] = ""
-                f['persisted'] = False
-                f['allocated'] = False
+    @staticmethod
+    def _address_values(addresses):
+        values = {}
+        for addr, data in addresses.iteritems():
+            try:
+                ipaddr = IPAddress(addr)
+            except (AddrFormatError, ValueError, TypeError):
+                continue
+
+            # Only addresses written the way we write them match
+            if str(ipaddr) == addr:
+                values[(ipaddr.version, ipaddr.value)] = (addr, data)
+
+        return values
+
+    #
+    # Split a dict returned by _address_values() into a dict for each
+    # network, keyed by network name.  Addresses that are not in any
+    # network are dropped
+    #
+    @staticmethod
+    def _addresses_by_network(network_index, address_values):
+        by_network = {}
+        for (version, value), address in address_values.iteritems():
+            net_name = network_index.lookup_value(version, value)
+            if net_name:
+                by_network.setdefault(net_name, {})[(version, value)] = address
+
+        return by_network
+
+    #
+    # Load the persisted address allocations and server addresses in an
+    # address space.  Any other address in the space is free
+    #
+    def generate_addresses(self, space, persisted_addresses, server_addresses):
+        addresses = {}
+        for (version, value), (addr, server_id) in server_addresses.iteritems():
+            if version == space.version and space.has_value(value):
+                addresses[value] = {'addr': addr,
+                                    'free': False,
+                                    'used-by': "",
+                                    'host': "",
+                                    'server-id': server_id,
+                                    'persisted': False,
+                                    'allocated': False}
+
+        for (version, value), (addr, pi) in persisted_addresses.iteritems():
+            if version == space.version and space.has_value(value) and pi:
+                addresses[value] = {'addr': addr,
+                                    'free': bool(pi['free']),
+                                    'used-by': pi['used-by'],
+                                    'host': pi['host'],
+                                    'server-id': pi.get('server-id'),
+                                    'persisted': True,
+                                    'allocated': False}
+
+        return [addresses[value] for value in sorted(addresses)]
 
     #
     # Allocate an address from a network or return a previously allocated
@@ -2053,8 +2090,8 @@ class CloudCpLiteGenerator(GeneratorPlugin):
     def allocate_address(self, addresses, used_by, host="", net_name="",
                          addr=None, server_id=None):
 
-        """ Allocate an address from a list of addresses
-        :param addresses:  A list of address structures to allocate from
+        """ Allocate an address from an address pool
+        :param addresses:  The AddressPool of the network to allocate from
         :param used_by: A string that records what the address is being used by
         :param host: The host name to be assocated with the address
         :param net_name:  The name of the network we're allocating from
@@ -2064,16 +2101,13 @@ class CloudCpLiteGenerator(GeneratorPlugin):
         """
 
         result = None
-        for f in addresses:
-
-            if addr:
-                if f['addr'] != addr:
-                    continue
-                elif f['free'] or f['host'] == host or f['server-id'] == server_id:
+        if addr:
+            f = addresses.get(addr)
+            if f:
+                if f['free'] or f['host'] == host or f['server-id'] == server_id:
                     result = f
                     self.explain("Using address %s for %s %s on network %s" %
                                  (addr, used_by, host, net_name))
-                    break
                 else:
                     msg = ("Could not allocate address %s from network %s "
                            "for %s %s, already used by %s %s" %
@@ -2081,32 +2115,25 @@ class CloudCpLiteGenerator(GeneratorPlugin):
                             used_by, host, f['used-by'], f['host']))
                     self.add_error(msg)
 
-            elif f['used-by'] == used_by and f['host'] == host:
-                result = f
+        else:
+            result = addresses.get_used_by(used_by, host)
+            if result:
                 self.explain("Using persisted address %s for %s %s on network %s" %
-                             (f['addr'], used_by, host, net_name))
-                break
+                             (result['addr'], used_by, host, net_name))
 
-        # Didn't find one, so look for a free address
-        if not result and not addr:
-            for f in addresses:
-                if f['free']:
+            # Didn't find one, so look for a free address
+            else:
+                result = addresses.get_free()
+                if result:
                     self.explain("Allocated address %s for %s %s on network %s" %
-                                 (f['addr'], used_by, host, net_name))
-                    result = f
-                    break
+                                 (result['addr'], used_by, host, net_name))
 
         if result:
             # Always (re)persist the allocation, so that if we've changed the
             # set of data it gets updated
-            addr = f['addr']
-            f['free'] = False
-            f['used-by'] = used_by
-            f['host'] = host
-            f['server-id'] = server_id
-            f['allocated'] = True
-
-            pi = {addr: f}
+            addresses.allocate(result, used_by, host, server_id)
+
+            pi = {result['addr']: result}
             self._address_state_persistor.persist_info(pi)
 
             return result['addr']
@@ -2140,19 +2167,9 @@ class CloudCpLiteGenerator(GeneratorPlugin):
     # ----------------------------------------------
     def consume_address(self, addr, net):
 
-        ip_net = IPNetwork(unicode(net['cidr']))
-        net_start = ip_net[1]
-        net_end = ip_net[-2]
-
         # Note:  Start and End address (if present) have
         # already been validated to be in the cidr
-        if 'start-address' in net:
-            net_start = IPAddress(net['start-address'])
-
-        if 'end-address' in net:
-            net_end = IPAddress(net['end-address'])
-
-        if net_start <= IPAddress(addr) <= net_end:
+        if NetworkTable.compile(net).in_range(addr):
             return addr
         else:
             return None
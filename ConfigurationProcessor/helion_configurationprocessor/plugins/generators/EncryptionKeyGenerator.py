@@ -13,16 +13,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 #
-import six
 import logging
 import logging.config
+import multiprocessing
 
 from helion_configurationprocessor.cp.model.GeneratorPlugin \
     import GeneratorPlugin
 from helion_configurationprocessor.cp.model.CPSecurity \
     import CPSecurity
-from helion_configurationprocessor.cp.model.StatePersistor \
-    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
 from helion_configurationprocessor.cp.model.CPLogging \
     import CPLogging as KenLog
 
@@ -79,30 +79,45 @@ class EncryptionKeyGenerator(GeneratorPlugin):
             self.log_and_add_error(message)
             return False
 
-        self._encrypt_validator(encryption_key)
-        self._migrate_keys(prev_encryption_key, encryption_key)
-
-        return True
+        return self._migrate_keys(prev_encryption_key, encryption_key)
 
     def _migrate_keys(self, prev_encryption_key, encryption_key):
-        state_persistor = StatePersistor(
-            self._models, self._controllers,
-            persistence_file='private_data.yml')
+        state_persistor = StatePersistorRegistry.get(
+            self._models, self._controllers, 'private_data.yml')
 
         all_private_data = state_persistor.recall_info()
 
-        for k, v in six.iteritems(all_private_data):
+        names = []
+        for k in sorted(all_private_data):
             if k == 'encryption_key_checker':
                 continue
 
-            if not self._was_persisted_value_encrypted(k):
+            # Values generated in a run without a key are stored in
+            # plaintext, with __is_secure set to False
+            secure_property_name = '%s__is_secure' % k
+            if all_private_data.get(secure_property_name) in (None, False):
                 continue
 
-            v = CPSecurity.decrypt(prev_encryption_key, v)
-            v = CPSecurity.encrypt(encryption_key, v)
+            names.append(k)
+
+        values = CPSecurity.rekey(prev_encryption_key, encryption_key,
+                                  [all_private_data[k] for k in names],
+                                  workers=multiprocessing.cpu_count())
 
-            info = {k: v}
-            state_persistor.persist_info(info)
+        # Nothing is changed unless every value could be re-encrypted
+        failed = [k for k, v in zip(names, values) if v is None]
+        if failed:
+            message = 'The following values could not be re-encrypted ' \
+                      'with the new encryption key, so the stored values ' \
+                      'have not been changed: %s' % ', '.join(failed)
+            self.log_and_add_error(message)
+            return False
+
+        state_persistor.persist_info(dict(zip(names, values)))
+        self._encrypt_validator(encryption_key)
+        state_persistor.commit()
+
+        return True
 
     def _validate_encryption_key(self, secret):
         value = self._get_encrypted_validator()
@@ -117,18 +132,16 @@ class EncryptionKeyGenerator(GeneratorPlugin):
         return False
 
     def _get_encrypted_validator(self):
-        state_persistor = StatePersistor(
-            self._models, self._controllers,
-            persistence_file='private_data.yml')
+        state_persistor = StatePersistorRegistry.get(
+            self._models, self._controllers, 'private_data.yml')
 
         property_name = 'encryption_key_checker'
         value = state_persistor.recall_info([property_name])
         return value
 
     def _encrypt_validator(self, secret):
-        state_persistor = StatePersistor(
-            self._models, self._controllers,
-            persistence_file='private_data.yml')
+        state_persistor = StatePersistorRegistry.get(
+            self._models, self._controllers, 'private_data.yml')
 
         property_name = 'encryption_key_checker'
         property_value = 'encryption_key_checker'
@@ -138,18 +151,5 @@ class EncryptionKeyGenerator(GeneratorPlugin):
         info = {property_name: property_value}
         state_persistor.persist_info(info)
 
-    def _was_persisted_value_encrypted(self, property_name):
-        secure_property_name = '%s__is_secure' % property_name
-
-        state_persistor = StatePersistor(
-            self._models, self._controllers,
-            persistence_file='private_data.yml')
-
-        value = state_persistor.recall_info([secure_property_name])
-        if value is None:
-            return False
-
-        return value is not None
-
     def get_dependencies(self):
         return []
@@ -16,9 +16,10 @@
 import logging
 import logging.config
 
-from netaddr import IPNetwork, IPAddress, AddrFormatError
 from helion_configurationprocessor.cp.model.ValidatorPlugin \
     import ValidatorPlugin
+from helion_configurationprocessor.cp.model.NetworkAddressIndex \
+    import NetworkAddressIndex
 from helion_configurationprocessor.cp.model.CPLogging \
     import CPLogging as KenLog
 
@@ -65,6 +66,7 @@ class DeployerNetworkLifecycleMgrValidator(ValidatorPlugin):
         self._iface_models = self._get_dict_from_config_value(version, 'interface-models')
         self._network_groups = self._get_dict_from_config_value(version, 'network-groups')
         self._networks = self._get_dict_from_config_value(version, 'networks')
+        self._network_index = NetworkAddressIndex.get(self._networks)
         self._bm_servers = self._get_config_value(version, 'servers')
 
     def _validate_control_planes(self, component_all_servers, component_on_server):
@@ -160,26 +162,7 @@ class DeployerNetworkLifecycleMgrValidator(ValidatorPlugin):
         return def_net_grp
 
     def _network_from_address(self, s):
-        for net_name, net in self._networks.iteritems():
-            if 'cidr' in net:
-                ip_net = IPNetwork(unicode(net['cidr']))
-                net_start = ip_net[1]
-                net_end = ip_net[-2]
-
-                if 'start-address' in net:
-                    net_start = IPAddress(net['start-address'])
-
-                if 'end-address' in net:
-                    net_end = IPAddress(net['end-address'])
-
-                try:
-                    server_ip = IPAddress(s['ip-addr'])
-                except AddrFormatError:
-                    return None
-                else:
-                    if net_start <= server_ip <= net_end:
-                        return net_name
-        return None
+        return self._network_index.lookup(s['ip-addr'])
 
     def _check_server_interface(self, s, network):
         net_group = self._networks[network]['network-group']
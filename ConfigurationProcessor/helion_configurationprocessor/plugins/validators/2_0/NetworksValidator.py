@@ -20,6 +20,10 @@ from helion_configurationprocessor.cp.model.ValidatorPlugin \
     import ValidatorPlugin
 from helion_configurationprocessor.cp.model.CPLogging \
     import CPLogging as KenLog
+from helion_configurationprocessor.cp.model.AddressRanges \
+    import AddressRanges
+from helion_configurationprocessor.cp.model.NetworkTable \
+    import NetworkTable
 
 from netaddr import IPNetwork, IPAddress, AddrFormatError
 
@@ -74,54 +78,27 @@ class NetworksValidator(ValidatorPlugin):
     def _validate_no_cidr_overlap(self, networks):
 
         #
-        # Check no two networks have the same cidr
+        # Check no two networks have overlapping address ranges
         #
-        cidrs = {}
-        overlaps = {}
+        ranges = AddressRanges()
         for net in networks:
             net_cidr = net.get('cidr')
             if not net_cidr:
                 continue
 
             # Note: this validator run after each cidr has been validated
-            ip_net = IPNetwork(unicode(net['cidr']))
-            net_start = ip_net[1]
-            net_end = ip_net[-2]
-            if 'start-address' in net:
-                net_start = IPAddress(net['start-address'])
-            if 'end-address' in net:
-                net_end = IPAddress(net['end-address'])
+            space = NetworkTable.compile(net)
 
-            cidrs[net['name']] = {'cidr': net['cidr'],
-                                  'start': net_start,
-                                  'end': net_end}
-
-        for net_name, net in cidrs.iteritems():
-            for other_net_name, other_net in cidrs.iteritems():
-                if net_name == other_net_name:
-                    continue
-                net_start = net['start']
-                net_end = net['end']
-                net_cidr = net['cidr']
-                other_net_start = other_net['start']
-                other_net_end = other_net['end']
-                other_net_cidr = other_net['cidr']
-
-                if ((other_net_start <= net_start <= other_net_end)
-                        or (other_net_start <= net_end <= other_net_end)):
-                    if net_name not in overlaps:
-                        overlaps[net_name] = []
-                    overlaps[net_name].append(other_net_name)
-
-                    # check we haven't already reported this the other way round
-                    if net_name not in overlaps.get(other_net_name, []):
-                        msg = ("Address range of networks %s (%s: %s to %s) "
-                               "and %s (%s: %s to %s) overlap." %
-                               (net_name, net_cidr, net_start, net_end,
-                                other_net_name, other_net_cidr,
-                                other_net_start, other_net_end))
-                        self.add_error(msg)
-                        self._valid = False
+            ranges.add(net['name'], space.start, space.end, net['cidr'])
+
+        for net, other_net in ranges.overlaps():
+            msg = ("Address range of networks %s (%s: %s to %s) "
+                   "and %s (%s: %s to %s) overlap." %
+                   (net.name, net.value, net.start, net.end,
+                    other_net.name, other_net.value,
+                    other_net.start, other_net.end))
+            self.add_error(msg)
+            self._valid = False
 
     def _validate_cidr(self, net):
         if 'cidr' in net:
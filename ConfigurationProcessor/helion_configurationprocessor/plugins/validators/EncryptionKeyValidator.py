@@ -37,6 +37,10 @@ class EncryptionKeyValidator(ValidatorPlugin):
     def is_compatible_with_cloud(self, args):
         return True
 
+    def is_parallel_safe(self):
+        # The key's complexity score is printed to the console
+        return False
+
     def validate(self):
         LOG.info('%s()' % KenLog.fcn())
 
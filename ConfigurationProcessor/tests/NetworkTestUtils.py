@@ -0,0 +1,151 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from netaddr import IPAddress
+from netaddr import IPNetwork
+
+
+# Networks that the random ones only hit by chance.  Their address
+# ranges do not overlap.
+EDGE_NETWORKS = {
+    # A gateway outside the cidr
+    'gateway-outside-cidr': {
+        'name': 'gateway-outside-cidr', 'cidr': '10.0.0.0/29',
+        'gateway-ip': '192.168.0.1'},
+    # A gateway in the cidr but outside the start and end addresses
+    'gateway-outside-range': {
+        'name': 'gateway-outside-range', 'cidr': '10.0.1.0/28',
+        'start-address': '10.0.1.4', 'end-address': '10.0.1.10',
+        'gateway-ip': '10.0.1.1'},
+    # Host bits set in the cidr
+    'host-bits': {
+        'name': 'host-bits', 'cidr': '10.0.2.77/28',
+        'gateway-ip': '10.0.2.65'},
+    # IPv6 has no broadcast address, but the last address is still
+    # excluded
+    'ipv6': {
+        'name': 'ipv6', 'cidr': 'fd00::/126', 'gateway-ip': 'fd00::1'}}
+
+
+def random_cidr(r, prefixlens=(8, 30), ipv6_prefixlens=(48, 126),
+                ipv6=0.3):
+    """A cidr, often with host bits set, that is IPv6 with a
+    probability of ipv6.
+    """
+    if r.random() >= ipv6:
+        return '%d.%d.%d.%d/%d' % (r.randint(1, 223), r.randint(0, 255),
+                                   r.randint(0, 255), r.randint(0, 255),
+                                   r.randint(*prefixlens))
+
+    return 'fd%02x:%x::%x/%d' % (r.randint(0, 255), r.randint(0, 0xffff),
+                                 r.randint(0, 0xffff),
+                                 r.randint(*ipv6_prefixlens))
+
+
+def random_network(r, ipv6=0.3):
+    """A small network, with or without start and end addresses and a
+    gateway, which may be outside the cidr.  Returns the network and its
+    IPNetwork.
+    """
+    net = {'name': 'net', 'cidr': random_cidr(r, (24, 30), (118, 126),
+                                              ipv6)}
+
+    ip_net = IPNetwork(net['cidr'])
+    if r.random() < 0.3:
+        net['start-address'] = str(ip_net[r.randint(1, 2)])
+    if r.random() < 0.3:
+        net['end-address'] = str(ip_net[-r.randint(2, 3)])
+    if r.random() < 0.6:
+        net['gateway-ip'] = str(r.choice([ip_net[r.choice([0, 1, 2, -2, -1])],
+                                          IPAddress('192.168.0.1')]))
+
+    return net, ip_net
+
+
+def random_networks(r):
+    """Networks of any size, which may overlap, with a network that has
+    no cidr.
+    """
+    networks = {}
+    for i in range(r.randint(1, 10)):
+        net = {'name': 'net%d' % i, 'cidr': random_cidr(r),
+               'vlanid': r.randint(1, 4094)}
+        if r.random() < 0.3:
+            net['tagged-vlan'] = False
+        networks[net['name']] = net
+
+    networks['no-cidr'] = {'name': 'no-cidr'}
+    return networks
+
+
+def random_disjoint_networks(r):
+    """Networks whose address ranges do not overlap, as the validators
+    require, but whose cidrs may be the same or nested.  Use
+    random_address() for addresses in and around them.
+    """
+    networks = {}
+
+    def add(cidr, **kwargs):
+        net = {'name': 'net%d' % len(networks), 'cidr': cidr}
+        for k, v in kwargs.items():
+            net[k.replace('_', '-')] = v
+        networks[net['name']] = net
+
+    for block in range(r.randint(1, 6)):
+        mode = r.randint(0, 4)
+        if mode == 0:
+            add('10.%d.0.0/16' % block)
+        elif mode == 1:
+            # Host bits set in the cidr
+            add('10.%d.3.7/16' % block, start_address='10.%d.0.20' % block,
+                gateway_ip='10.%d.0.1' % block)
+        elif mode == 2:
+            add('10.%d.0.0/16' % block, start_address='10.%d.0.10' % block,
+                end_address='10.%d.99.255' % block)
+            add('10.%d.0.0/16' % block, start_address='10.%d.100.0' % block,
+                end_address='10.%d.200.0' % block)
+        elif mode == 3:
+            add('10.%d.0.0/16' % block, end_address='10.%d.99.255' % block)
+            add('10.%d.150.0/24' % block)
+        else:
+            add('fd00:%x::/64' % block, end_address='fd00:%x::ffff' % block)
+            add('fd00:%x::1:0/112' % block)
+
+    add('192.168.0.0/30')
+    networks['no-cidr'] = {'name': 'no-cidr'}
+
+    return networks
+
+
+def random_address(r):
+    block = r.randint(0, 6)
+    choice = r.randint(0, 9)
+    if choice < 6:
+        return '10.%d.%d.%d' % (block, r.choice([0, 99, 100, 150, 200, 255]),
+                                r.choice([0, 1, 10, 20, 128, 255]))
+    elif choice < 8:
+        return 'fd00:%x::%s' % (block, r.choice(['0', '1', 'ffff', '1:0',
+                                                 '1:5', '1:ffff', '2:0']))
+    elif choice == 8:
+        return '192.168.0.%d' % r.randint(0, 4)
+    else:
+        return r.choice(['not-an-address', '10.0.0', ''])
+
+
+def edge_addresses(net):
+    """Every address of the cidr of net, and those either side of it."""
+    ip_net = IPNetwork(unicode(net['cidr']))
+    return [str(ipaddr)
+            for ipaddr in [ip_net[0] - 1] + list(ip_net) + [ip_net[-1] + 1]]
@@ -0,0 +1,58 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import random
+
+
+class CloudConfig(object):
+    def __init__(self, path):
+        self._path = path
+
+    def get_persistent_path(self, models):
+        return self._path
+
+
+def random_operations(persistors, seed, count=200):
+    """Apply the same random operations to each of persistors, and
+    return what recall_info() returned after each one.
+    """
+    r = random.Random(seed)
+    results = []
+    for _ in range(count):
+        op = r.choice(['persist', 'persist', 'delete', 'commit',
+                       'rollback', 'recall'])
+        key = 'key-%d' % r.randint(0, 9)
+        value = {'id': r.randint(0, 99), 'state': r.choice(['a', 'b'])}
+
+        recalled = []
+        for persistor in persistors:
+            if op == 'persist':
+                persistor.persist_info({key: value})
+            elif op == 'delete':
+                persistor.delete_info([key])
+            elif op == 'commit':
+                persistor.commit()
+            elif op == 'rollback':
+                persistor.rollback()
+
+            recalled_id = None
+            if op == 'recall' and persistor.recall_info([key]) is not None:
+                recalled_id = persistor.recall_info([key, 'id'])
+
+            recalled.append((recalled_id, dict(persistor.recall_info())))
+
+        results.append(recalled)
+
+    return results
@@ -0,0 +1,275 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import importlib
+import random
+import unittest
+
+from netaddr import IPAddress
+from netaddr import IPNetwork
+
+from helion_configurationprocessor.cp.model.AddressSpace \
+    import AddressSpace
+from helion_configurationprocessor.cp.model.v2_0.AddressPool \
+    import AddressPool
+
+from .NetworkTestUtils import EDGE_NETWORKS
+from .NetworkTestUtils import random_network
+
+
+CloudCpLiteGenerator = importlib.import_module(
+    'helion_configurationprocessor.plugins.generators.2_0.'
+    'CloudCpLiteGenerator').CloudCpLiteGenerator
+
+
+class FakePersistor(object):
+    def __init__(self, data):
+        self.data = data
+
+    def recall_info(self, lookup_array=None):
+        if not lookup_array:
+            return self.data
+
+        return self.data.get(lookup_array[0])
+
+    def persist_info(self, info_dict):
+        self.data.update(info_dict)
+
+
+class ListAllocator(object):
+    """The list of every address of a network that AddressPool replaced
+    in CloudCpLiteGenerator, with the allocate_address() that scanned it.
+    """
+    def __init__(self, net, persistor, server_addresses):
+        self._persistor = persistor
+        self.messages = []
+        self.errors = []
+
+        ip_net = IPNetwork(unicode(net['cidr']))
+        hosts = list(ip_net.iter_hosts())
+        net_start = IPAddress(net.get('start-address', hosts[0]))
+        net_end = IPAddress(net.get('end-address', hosts[-1]))
+
+        self.addresses = []
+        for ipaddr in hosts:
+            addr = str(ipaddr)
+            if (addr != net.get('gateway-ip', '') and
+                    net_start <= ipaddr <= net_end):
+                self.addresses.append({'addr': addr, 'free': True})
+
+        for f in self.addresses:
+            addr = f['addr']
+            pi = persistor.recall_info([addr])
+            if pi:
+                f.update({'free': bool(pi['free']),
+                          'used-by': pi['used-by'],
+                          'host': pi['host'],
+                          'server-id': pi.get('server-id'),
+                          'persisted': True,
+                          'allocated': False})
+            elif addr in server_addresses:
+                f.update({'free': False, 'used-by': "", 'host': "",
+                          'server-id': server_addresses[addr],
+                          'persisted': False, 'allocated': False})
+            else:
+                f.update({'free': True, 'used-by': "", 'host': "",
+                          'server-id': "", 'persisted': False,
+                          'allocated': False})
+
+    def allocate_address(self, used_by, host="", net_name="", addr=None,
+                         server_id=None):
+        result = None
+        for f in self.addresses:
+            if addr:
+                if f['addr'] != addr:
+                    continue
+                elif (f['free'] or f['host'] == host or
+                        f['server-id'] == server_id):
+                    result = f
+                    self.messages.append(
+                        "Using address %s for %s %s on network %s" %
+                        (addr, used_by, host, net_name))
+                    break
+                else:
+                    self.errors.append(
+                        "Could not allocate address %s from network %s "
+                        "for %s %s, already used by %s %s" %
+                        (addr, net_name, used_by, host, f['used-by'],
+                         f['host']))
+
+            elif f['used-by'] == used_by and f['host'] == host:
+                result = f
+                self.messages.append(
+                    "Using persisted address %s for %s %s on network %s" %
+                    (f['addr'], used_by, host, net_name))
+                break
+
+        if not result and not addr:
+            for f in self.addresses:
+                if f['free']:
+                    self.messages.append(
+                        "Allocated address %s for %s %s on network %s" %
+                        (f['addr'], used_by, host, net_name))
+                    result = f
+                    break
+
+        if result:
+            result.update({'free': False, 'used-by': used_by, 'host': host,
+                           'server-id': server_id, 'allocated': True})
+            self._persistor.persist_info({result['addr']: result})
+            return result['addr']
+
+        self.errors.append("Could not allocate address from network %s "
+                           "for %s %s" % (net_name, used_by, host))
+        return None
+
+
+def random_state(r, addresses):
+    persisted = {}
+    server_addresses = {}
+    for _ in range(r.randint(0, len(addresses) // 2)):
+        addr = r.choice(addresses + ['10.9.9.9', '10.1.2.300'])
+        if r.random() < 0.6:
+            persisted[addr] = r.choice([
+                {}, {'free': r.random() < 0.3,
+                     'used-by': r.choice(['svc-a', 'svc-b', 'svc-c']),
+                     'host': r.choice(['h1', 'h2', 'h3']),
+                     'server-id': r.choice([None, 's1', 's2'])}])
+        else:
+            server_addresses[addr] = r.choice(['s1', 's2', 's3'])
+
+    return persisted, server_addresses
+
+
+def make_pool(generator, net, persisted, server_addresses):
+    space = AddressSpace.from_network(net)
+    return AddressPool(space, generator.generate_addresses(
+        space, generator._address_values(persisted),
+        generator._address_values(server_addresses)))
+
+
+def held(addresses):
+    return [dict(f) for f in addresses if f['allocated'] or f['persisted']]
+
+
+class TestAddressPool(unittest.TestCase):
+    def _generator(self, persistor):
+        generator = CloudCpLiteGenerator.__new__(CloudCpLiteGenerator)
+        generator.messages = []
+        generator.error_messages = []
+        generator.explain = generator.messages.append
+        generator.add_error = generator.error_messages.append
+        generator._address_state_persistor = persistor
+        return generator
+
+    def _check_same_as_list(self, r, net, msg):
+        addresses = [str(ipaddr) for ipaddr in IPNetwork(net['cidr'])]
+        persisted, server_addresses = random_state(r, addresses)
+
+        baseline = ListAllocator(net, FakePersistor(dict(persisted)),
+                                 server_addresses)
+        generator = self._generator(FakePersistor(dict(persisted)))
+        pool = make_pool(generator, net, persisted, server_addresses)
+
+        for _ in range(r.randint(1, len(addresses) + 5)):
+            kwargs = {'used_by': r.choice(['svc-a', 'svc-b', 'svc-c']),
+                      'host': r.choice(['h1', 'h2', 'h3', 'h4']),
+                      'net_name': 'net',
+                      'server_id': r.choice([None, 's1', 's2', 's4'])}
+            if r.random() < 0.3:
+                kwargs['addr'] = r.choice(addresses + ['10.9.9.9'])
+
+            self.assertEqual(
+                generator.allocate_address(pool, **kwargs),
+                baseline.allocate_address(**kwargs), (msg, kwargs))
+            self.assertEqual(generator.messages, baseline.messages)
+            self.assertEqual(generator.error_messages, baseline.errors)
+
+        self.assertEqual(held(pool), held(baseline.addresses), msg)
+        self.assertEqual(
+            generator._address_state_persistor.data,
+            baseline._persistor.data, msg)
+
+    def test_same_as_list(self):
+        for seed in range(300):
+            r = random.Random(seed)
+            net, _ = random_network(r, ipv6=0)
+            self._check_same_as_list(r, net, seed)
+
+    def test_edge_networks(self):
+        # The list had every address of an IPv6 network but the first,
+        # so only compare with it for IPv4
+        for name, net in EDGE_NETWORKS.items():
+            if ':' in net['cidr']:
+                continue
+
+            for seed in range(20):
+                self._check_same_as_list(random.Random(seed), net,
+                                         (name, seed))
+
+        generator = self._generator(FakePersistor(dict()))
+        pool = make_pool(generator, EDGE_NETWORKS['ipv6'], dict(), dict())
+        self.assertEqual(generator.allocate_address(pool, 'svc', 'h1'),
+                         'fd00::2')
+        self.assertIsNone(generator.allocate_address(pool, 'svc', 'h2'))
+        self.assertIsNone(generator.allocate_address(pool, 'svc', 'h3',
+                                                     addr='fd00::3'))
+
+    def test_get(self):
+        space = AddressSpace('10.0.0.0/29', gateway_ip='10.0.0.1')
+        pool = AddressPool(space, [
+            {'addr': '10.0.0.3', 'free': False, 'used-by': 'svc',
+             'host': 'h1', 'server-id': 's1', 'persisted': True,
+             'allocated': False}])
+
+        self.assertIsNone(pool.get('10.0.0.1'))
+        self.assertIsNone(pool.get('10.0.0.7'))
+        self.assertIsNone(pool.get('not-an-address'))
+        self.assertEqual(pool.get('10.0.0.3')['used-by'], 'svc')
+        self.assertTrue(pool.get('10.0.0.2')['free'])
+        self.assertIs(pool.get_used_by('svc', 'h1'), pool.get('10.0.0.3'))
+        self.assertIsNone(pool.get_used_by('svc', 'h2'))
+
+        self.assertEqual(pool.get_free()['addr'], '10.0.0.2')
+        pool.allocate(pool.get_free(), 'svc', 'h2', 's2')
+        self.assertEqual(pool.get_free()['addr'], '10.0.0.4')
+        self.assertIs(pool.get_used_by('svc', 'h2'), pool.get('10.0.0.2'))
+
+        # Reallocating an address moves it to its new user
+        pool.allocate(pool.get('10.0.0.3'), 'other', 'h1', 's1')
+        self.assertIsNone(pool.get_used_by('svc', 'h1'))
+        self.assertIs(pool.get_used_by('other', 'h1'), pool.get('10.0.0.3'))
+
+    def test_full(self):
+        pool = AddressPool(AddressSpace('10.0.0.0/30'))
+        f = pool.get_free()
+        self.assertEqual(f['addr'], '10.0.0.1')
+        pool.allocate(f, 'svc', 'h1', 's1')
+        f = pool.get_free()
+        self.assertEqual(f['addr'], '10.0.0.2')
+        pool.allocate(f, 'svc', 'h2', 's2')
+        self.assertIsNone(pool.get_free())
+        self.assertEqual([f['addr'] for f in pool],
+                         ['10.0.0.1', '10.0.0.2'])
+
+    def test_no_space(self):
+        pool = AddressPool()
+        self.assertIsNone(pool.get('10.0.0.1'))
+        self.assertIsNone(pool.get_free())
+        self.assertEqual(list(pool), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import random
+import unittest
+
+from netaddr import IPAddress
+
+from helion_configurationprocessor.cp.model.AddressRanges \
+    import AddressRanges
+
+
+def overlapping_pairs(ranges):
+    """The comparison of every pair of ranges that AddressRanges
+    replaced in NetworksValidator, as a set of pairs of names.
+    """
+    overlaps = set()
+    for name, start, end in ranges:
+        for other_name, other_start, other_end in ranges:
+            if name == other_name:
+                continue
+
+            if ((other_start <= start <= other_end) or
+                    (other_start <= end <= other_end)):
+                overlaps.add(frozenset([name, other_name]))
+
+    return overlaps
+
+
+def random_ranges(r):
+    ranges = []
+    for i in range(r.randint(0, 30)):
+        version = r.choice([4, 4, 6])
+        base = 0x0a000000 if version == 4 else 0xfd00 << 112
+        start = base + r.randint(0, 200)
+        end = start + r.choice([0, 0, 1, 5, 20, 100])
+        ranges.append(('net%d' % i, IPAddress(start, version),
+                       IPAddress(end, version)))
+
+    return ranges
+
+
+class TestAddressRanges(unittest.TestCase):
+    def test_same_as_pairwise(self):
+        for seed in range(300):
+            ranges = random_ranges(random.Random(seed))
+
+            address_ranges = AddressRanges()
+            for name, start, end in ranges:
+                address_ranges.add(name, start, end)
+
+            overlaps = address_ranges.overlaps()
+            pairs = set(frozenset([a.name, b.name]) for a, b in overlaps)
+
+            # Each overlap is reported once
+            self.assertEqual(len(pairs), len(overlaps), seed)
+            self.assertEqual(pairs, overlapping_pairs(ranges), seed)
+
+    def test_order(self):
+        for seed in range(100):
+            ranges = random_ranges(random.Random(seed))
+
+            address_ranges = AddressRanges()
+            for name, start, end in ranges:
+                address_ranges.add(name, start, end)
+
+            for first, second in address_ranges.overlaps():
+                self.assertLessEqual(
+                    (int(first.start), int(first.end)),
+                    (int(second.start), int(second.end)))
+
+    def test_containment(self):
+        address_ranges = AddressRanges()
+        address_ranges.add('outer', IPAddress('10.0.0.1'),
+                           IPAddress('10.0.0.254'), '10.0.0.0/24')
+        address_ranges.add('inner', IPAddress('10.0.0.10'),
+                           IPAddress('10.0.0.20'), '10.0.0.0/24')
+        address_ranges.add('v6', IPAddress('::a00:a'), IPAddress('::a00:14'))
+
+        self.assertEqual(
+            [(a.name, b.name) for a, b in address_ranges.overlaps()],
+            [('outer', 'inner')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import random
+import unittest
+
+from netaddr import IPAddress
+from netaddr import IPNetwork
+
+from helion_configurationprocessor.cp.model.AddressSpace \
+    import AddressSpace
+
+from .NetworkTestUtils import EDGE_NETWORKS
+from .NetworkTestUtils import random_network
+
+
+def enumerated_hosts(net):
+    """The host addresses of a network as CloudCpLiteGenerator listed
+    them before AddressSpace.  For IPv6 this uses the second last address
+    of the cidr as the end, as the validators and consume_address did.
+    """
+    ip_net = IPNetwork(unicode(net['cidr']))
+    if ip_net.version == 4:
+        hosts = list(ip_net.iter_hosts())
+    else:
+        hosts = [IPAddress(v, 6) for v in range(int(ip_net[1]),
+                                                int(ip_net[-2]) + 1)]
+
+    net_start = IPAddress(net.get('start-address', hosts[0]))
+    net_end = IPAddress(net.get('end-address', hosts[-1]))
+
+    return [str(ipaddr) for ipaddr in hosts
+            if str(ipaddr) != net.get('gateway-ip', '') and
+            net_start <= ipaddr <= net_end]
+
+
+def consume_address(addr, net):
+    """consume_address() from before AddressSpace."""
+    ip_net = IPNetwork(unicode(net['cidr']))
+    net_start = ip_net[1]
+    net_end = ip_net[-2]
+
+    if 'start-address' in net:
+        net_start = IPAddress(net['start-address'])
+
+    if 'end-address' in net:
+        net_end = IPAddress(net['end-address'])
+
+    return net_start <= IPAddress(addr) <= net_end
+
+
+class TestAddressSpace(unittest.TestCase):
+    def _check_network(self, net, msg):
+        ip_net = IPNetwork(unicode(net['cidr']))
+        space = AddressSpace.from_network(net)
+        hosts = enumerated_hosts(net)
+
+        self.assertEqual(space.version, ip_net.version)
+        self.assertEqual(space.size, len(hosts), msg)
+
+        # Stepping through the values gives the same addresses
+        stepped = []
+        value = space.next_value(space.first)
+        while value is not None:
+            stepped.append(space.address(value))
+            value = space.next_value(value + 1)
+        self.assertEqual(stepped, hosts, msg)
+
+        hosts = set(hosts)
+        for ipaddr in list(ip_net) + [ip_net[0] - 1, ip_net[-1] + 1]:
+            addr = str(ipaddr)
+            self.assertEqual(addr in space, addr in hosts, (msg, addr))
+            self.assertEqual(space.has_value(ipaddr.value),
+                             addr in hosts, (msg, addr))
+            self.assertEqual(space.value(addr) is not None,
+                             addr in hosts, (msg, addr))
+            self.assertEqual(space.in_range(addr),
+                             consume_address(addr, net), (msg, addr))
+
+        return space
+
+    def test_same_as_enumeration(self):
+        for seed in range(150):
+            net, _ = random_network(random.Random(seed))
+            self._check_network(net, (seed, net))
+
+    def test_edge_networks(self):
+        spaces = dict((name, self._check_network(net, name))
+                      for name, net in EDGE_NETWORKS.items())
+
+        space = spaces['gateway-outside-cidr']
+        self.assertEqual(space.size, 6)
+        self.assertNotIn('192.168.0.1', space)
+
+        space = spaces['gateway-outside-range']
+        self.assertEqual(space.size, 7)
+        self.assertNotIn('10.0.1.1', space)
+        self.assertFalse(space.in_range('10.0.1.1'))
+
+        space = spaces['host-bits']
+        self.assertEqual(space.address(space.next_value(space.first)),
+                         '10.0.2.66')
+        self.assertIn('10.0.2.77', space)
+        self.assertIn('10.0.2.78', space)
+        self.assertNotIn('10.0.2.79', space)
+
+        space = spaces['ipv6']
+        self.assertEqual(space.size, 1)
+        self.assertIn('fd00::2', space)
+        self.assertNotIn('fd00::3', space)
+        self.assertFalse(space.in_range('fd00::3'))
+
+    def test_other_values(self):
+        space = AddressSpace('10.0.0.0/24')
+        for value in [None, '', 'not-an-address', '10.0.0', 12,
+                      'fd00::1', IPAddress('fd00::1')]:
+            self.assertFalse(space.in_range(value))
+            self.assertIsNone(space.value(value))
+            self.assertNotIn(value, space)
+
+        self.assertEqual(space.value(IPAddress('10.0.0.5')),
+                         int(IPAddress('10.0.0.5')))
+
+    def test_large_ipv6(self):
+        space = AddressSpace('fd00::/64', gateway_ip='fd00::1')
+        self.assertEqual(space.size, 2 ** 64 - 3)
+        self.assertEqual(space.address(space.next_value(space.first)),
+                         'fd00::2')
+        self.assertIn('fd00::ffff:ffff:ffff:fffe', space)
+        self.assertNotIn('fd00::ffff:ffff:ffff:ffff', space)
+        self.assertIsNone(space.next_value(space.last + 1))
+
+    def test_empty(self):
+        space = AddressSpace('10.0.0.0/24', start_address='10.0.0.20',
+                             end_address='10.0.0.10')
+        self.assertEqual(space.size, 0)
+        self.assertIsNone(space.next_value(space.first))
+
+
+if __name__ == '__main__':
+    unittest.main()
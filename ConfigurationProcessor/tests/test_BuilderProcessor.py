@@ -0,0 +1,209 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import importlib
+import os
+import shutil
+import signal
+import tempfile
+import unittest
+
+from helion_configurationprocessor.cp.model.BuilderPlugin \
+    import ArtifactMode
+from helion_configurationprocessor.cp.model.BuilderPlugin \
+    import BuilderPlugin
+from helion_configurationprocessor.cp.model.PluginRegistry \
+    import PluginRegistry
+from helion_configurationprocessor.cp.model.v2_0.CloudModel \
+    import CloudModel
+from helion_configurationprocessor.cp.processor.BuilderProcessor \
+    import BuilderProcessor
+
+
+NAMESPACE = 'helion.configurationprocessor.builder'
+
+PARENT_PID = os.getpid()
+
+
+class _TestBuilder(BuilderPlugin):
+    def __init__(self, instructions, models, controllers, slug):
+        super(_TestBuilder, self).__init__(
+            2.0, instructions, models, controllers, slug)
+
+        self._cloud_internal = CloudModel.internal(models['CloudModel'])
+
+    def _write_artifact(self, text):
+        filename = os.path.join(self._instructions['output_dir'],
+                                self._slug)
+        with open(filename, 'w') as fp:
+            fp.write(text)
+
+        self.add_artifact(filename, ArtifactMode.CREATED)
+
+
+class ModelWriterBuilder(_TestBuilder):
+    def __init__(self, instructions, models, controllers):
+        super(ModelWriterBuilder, self).__init__(
+            instructions, models, controllers, 'model-writer')
+
+    def build(self):
+        CloudModel.put(self._cloud_internal, 'written', os.getpid())
+        self._write_artifact('writer')
+
+    def is_parallel_safe(self):
+        return False
+
+
+class ModelReaderBuilder(_TestBuilder):
+    def __init__(self, instructions, models, controllers):
+        super(ModelReaderBuilder, self).__init__(
+            instructions, models, controllers, 'model-reader')
+
+    def build(self):
+        self._write_artifact(
+            str(CloudModel.get(self._cloud_internal, 'written')))
+
+    def get_dependencies(self):
+        return ['model-writer']
+
+
+class WorkerBuilder(_TestBuilder):
+    def __init__(self, instructions, models, controllers):
+        super(WorkerBuilder, self).__init__(
+            instructions, models, controllers, 'worker')
+
+    def build(self):
+        self.add_warning('built in %d' % os.getpid())
+        self._write_artifact('worker')
+
+
+class FailingBuilder(_TestBuilder):
+    def __init__(self, instructions, models, controllers):
+        super(FailingBuilder, self).__init__(
+            instructions, models, controllers, 'failing')
+
+    def build(self):
+        self.add_error('failed')
+
+
+class KilledBuilder(_TestBuilder):
+    def __init__(self, instructions, models, controllers):
+        super(KilledBuilder, self).__init__(
+            instructions, models, controllers, 'killed')
+
+    def build(self):
+        # As if the worker was killed for using too much memory
+        if os.getpid() != PARENT_PID:
+            os.kill(os.getpid(), signal.SIGKILL)
+
+
+class TestBuilderProcessor(unittest.TestCase):
+    def setUp(self):
+        self._output_dir = tempfile.mkdtemp()
+
+        PluginRegistry.clear()
+        PluginRegistry._namespaces[NAMESPACE] = {
+            'model-writer': ModelWriterBuilder,
+            'model-reader': ModelReaderBuilder,
+            'worker': WorkerBuilder,
+            'failing': FailingBuilder,
+            'killed': KilledBuilder}
+
+    def tearDown(self):
+        PluginRegistry.clear()
+        shutil.rmtree(self._output_dir)
+
+    def _build(self, workers, builders=None):
+        instructions = {
+            'builders': builders or ['model-reader', 'worker',
+                                     'model-writer', 'failing'],
+            'builder_workers': workers,
+            'model_version': 2.0,
+            'site_config_path': self._output_dir,
+            'output_dir': self._output_dir}
+        models = {'CloudModel': dict()}
+
+        processor = BuilderProcessor(instructions, models, dict())
+        processor.process()
+
+        return processor, CloudModel.internal(models['CloudModel'])
+
+    def _read(self, name):
+        with open(os.path.join(self._output_dir, name)) as fp:
+            return fp.read()
+
+    def _check_build(self, workers):
+        processor, cloud_internal = self._build(workers)
+
+        # The writer ran in this process, so its write to the model
+        # was seen by the builder that depends on it
+        self.assertEqual(cloud_internal.get('written'), os.getpid())
+        self.assertEqual(self._read('model-reader'), str(os.getpid()))
+        self.assertEqual(self._read('worker'), 'worker')
+
+        worker = processor.load_plugin('builder', 'worker', None).driver
+        self.assertEqual(len(worker.warnings), 1)
+        self.assertEqual(
+            worker.get_artifacts(),
+            ['(+) %s' % os.path.join(self._output_dir, 'worker')])
+
+        self.assertFalse(processor.ok)
+        self.assertEqual(len(processor.errors), 1)
+        self.assertIn('failed', processor.errors[0])
+
+        return worker
+
+    def test_serial_build(self):
+        worker = self._check_build(1)
+        self.assertEqual(worker.warnings, ['built in %d' % os.getpid()])
+
+    def test_parallel_build(self):
+        worker = self._check_build(2)
+        self.assertNotEqual(worker.warnings, ['built in %d' % os.getpid()])
+
+    def test_killed_worker(self):
+        processor, _ = self._build(2, ['worker', 'killed'])
+
+        self.assertEqual(self._read('worker'), 'worker')
+        self.assertFalse(processor.ok)
+        self.assertEqual(len(processor.errors), 1)
+        self.assertIn('Builder killed encountered an exception: the worker '
+                      'process running it exited unexpectedly',
+                      processor.errors[0])
+
+
+class TestBuilderParallelSafety(unittest.TestCase):
+    # Builders that update the cloud model or print to the console must
+    # be run in the main process
+    UNSAFE_BUILDERS = [
+        ('2_0.AnsGroupVarsBuilder', 'AnsGroupVarsBuilder'),
+        ('2_0.AnsHostVarsBuilder', 'AnsHostVarsBuilder'),
+        ('2_0.AnsibleHostsBuilder', 'AnsibleHostsBuilder'),
+        ('2_0.FirewallInfoBuilder', 'FirewallInfoBuilder')]
+
+    def test_unsafe_builders_opt_out(self):
+        for module_name, class_name in self.UNSAFE_BUILDERS:
+            module = importlib.import_module(
+                'helion_configurationprocessor.plugins.builders.%s' %
+                module_name)
+            cls = getattr(module, class_name)
+
+            # is_parallel_safe() does not depend on the constructor
+            self.assertFalse(cls.is_parallel_safe(cls.__new__(cls)),
+                             class_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import base64
+import importlib
+import os
+import random
+import tempfile
+import unittest
+
+from cryptography.fernet import Fernet
+
+from helion_configurationprocessor.cp.model.CPSecurity import CPSecurity
+
+
+AnsEncryptArtifactsBuilder = importlib.import_module(
+    'helion_configurationprocessor.plugins.builders.Ansible.'
+    'AnsEncryptArtifactsBuilder').AnsEncryptArtifactsBuilder
+
+
+class TestCPSecurityBatch(unittest.TestCase):
+    def setUp(self):
+        self._key = Fernet.generate_key()
+        self._other_key = Fernet.generate_key()
+
+    def tearDown(self):
+        CPSecurity.clear()
+
+    def _check_many(self, count, workers):
+        plaintexts = ['secret-%d' % i for i in range(count)]
+        ciphertexts = CPSecurity.encrypt_many(self._key, plaintexts,
+                                              workers=workers)
+
+        self.assertEqual(len(ciphertexts), count)
+        self.assertEqual(len(set(ciphertexts)), count)
+        self.assertEqual([CPSecurity.decrypt(self._key, c)
+                          for c in ciphertexts], plaintexts)
+
+        ciphertexts[0] = CPSecurity.encrypt(self._other_key, 'other')
+        ciphertexts[1] = 'not a token'
+        expected = [CPSecurity.decrypt(self._key, c) for c in ciphertexts]
+        self.assertEqual(expected[:2], [None, None])
+        self.assertEqual(CPSecurity.decrypt_many(self._key, ciphertexts,
+                                                 workers=workers), expected)
+
+    def test_many(self):
+        self._check_many(10, 1)
+
+    def test_many_in_workers(self):
+        self._check_many(600, 4)
+
+    def test_small_batch_in_workers(self):
+        self._check_many(10, 4)
+
+    def test_many_from_generator(self):
+        ciphertexts = CPSecurity.encrypt_many(
+            self._key, ('secret-%d' % i for i in range(3)))
+        self.assertEqual(CPSecurity.decrypt_many(self._key, iter(ciphertexts)),
+                         ['secret-0', 'secret-1', 'secret-2'])
+
+    def test_fernet_cached(self):
+        fernet = CPSecurity._get_fernet(self._key)
+        self.assertIs(CPSecurity._get_fernet(self._key), fernet)
+
+        CPSecurity.clear()
+        self.assertIsNot(CPSecurity._get_fernet(self._key), fernet)
+
+
+class TestCPSecurityIsToken(unittest.TestCase):
+    def tearDown(self):
+        CPSecurity.clear()
+
+    def test_tokens(self):
+        r = random.Random(0)
+        for _ in range(200):
+            key = Fernet.generate_key()
+            plaintext = ''.join(chr(r.randint(0, 255))
+                                for _ in range(r.randint(0, 100)))
+            ciphertext = CPSecurity.encrypt(key, plaintext)
+
+            self.assertTrue(CPSecurity.is_token(ciphertext))
+            self.assertTrue(CPSecurity.is_token(unicode(ciphertext)))
+
+    def test_not_tokens(self):
+        key = Fernet.generate_key()
+        token = CPSecurity.encrypt(key, 'secret')
+        data = base64.urlsafe_b64decode(token)
+
+        for value in [None, 12, ['a'], {'a': token}, '', 'password',
+                      'a' * 200, token[:-4], token.rstrip('='),
+                      base64.urlsafe_b64encode('\x81' + data[1:]),
+                      base64.urlsafe_b64encode(data[:-1]),
+                      base64.urlsafe_b64encode(data + 'a'),
+                      u'\xe9' + token]:
+            self.assertFalse(CPSecurity.is_token(value))
+
+    def test_same_as_decrypt(self):
+        """Anything decrypt() accepts is a token, so is_token() never
+        hides a value that trying every word would have decrypted.
+        """
+        key = Fernet.generate_key()
+        token = CPSecurity.encrypt(key, 'secret')
+
+        values = [token, token + '\n', ' ' + token, token + 'AAAA',
+                  token.replace('-', '+').replace('_', '/'),
+                  token[:-1] + '!', token[:50] + '.' + token[50:]]
+
+        r = random.Random(0)
+        for _ in range(500):
+            chars = list(token)
+            for _ in range(r.randint(1, 3)):
+                chars.insert(r.randint(0, len(chars)),
+                             r.choice('+/-_=.!\n AZaz09'))
+            values.append(''.join(chars))
+
+        for value in values:
+            if CPSecurity.decrypt(key, value) is not None:
+                self.assertTrue(CPSecurity.is_token(value), value)
+
+
+class TestCPSecurityFindTokens(unittest.TestCase):
+    def setUp(self):
+        self._key = Fernet.generate_key()
+
+        # Tokens with two, one and no '=' of base64 padding, which
+        # depends on the number of blocks of ciphertext
+        self._tokens = dict()
+        for i in range(3):
+            plaintext = 'secret-' + 'x' * (i * 16)
+            token = CPSecurity.encrypt(self._key, plaintext)
+            padding = len(token) - len(token.rstrip('='))
+            self._tokens.setdefault(padding, (token, plaintext))
+        self.assertEqual(sorted(self._tokens), [0, 1, 2])
+
+    def tearDown(self):
+        CPSecurity.clear()
+
+    def test_find_and_replace(self):
+        for token, plaintext in self._tokens.values():
+            plaintexts = {token: plaintext}
+            for template in ['password: %s\n', '{"password": "%s"}\n',
+                             "password: '%s'\n", 'values: [%s, %s]\n',
+                             '--password=%s;\n']:
+                count = template.count('%s')
+                line = template % ((token,) * count)
+
+                self.assertEqual(CPSecurity.find_tokens(line),
+                                 [token] * count, line)
+                self.assertEqual(CPSecurity.replace_tokens(line, plaintexts),
+                                 template % ((plaintext,) * count))
+
+    def test_not_replaced(self):
+        token, plaintext = self._tokens[1]
+        other_token = CPSecurity.encrypt(Fernet.generate_key(), 'other')
+
+        for line in ['password: gAAAA\n', 'prefix%s\n' % token,
+                     'a: %s\n' % token[:-10], 'b: %s\n' % other_token]:
+            self.assertEqual(CPSecurity.replace_tokens(
+                line, {token: plaintext, other_token: None}), line)
+
+        self.assertEqual(CPSecurity.find_tokens('prefix%s' % token), [])
+        self.assertEqual(CPSecurity.find_tokens(token[:-10]), [])
+
+    def test_builder_decrypts_file_contents(self):
+        token, plaintext = self._tokens[0]
+        lines = ['{"password": "%s", "user": "admin"}\n' % token,
+                 "other: 'gAAAA is not a token'\n"]
+
+        fd, file_name = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            builder = AnsEncryptArtifactsBuilder.__new__(
+                AnsEncryptArtifactsBuilder)
+            builder._decrypt_file_contents(file_name, list(lines),
+                                           {token: plaintext})
+            with open(file_name) as fp:
+                self.assertEqual(fp.readlines(), [
+                    '{"password": "%s", "user": "admin"}\n' % plaintext,
+                    lines[1]])
+        finally:
+            os.remove(file_name)
+
+
+class TestCPSecurityRekey(unittest.TestCase):
+    def setUp(self):
+        self._prev_key = Fernet.generate_key()
+        self._key = Fernet.generate_key()
+        self._other_key = Fernet.generate_key()
+
+    def tearDown(self):
+        CPSecurity.clear()
+
+    def _check_rekey(self, count, workers):
+        plaintexts = ['secret-%d' % i for i in range(count)]
+        ciphertexts = [CPSecurity.encrypt(self._prev_key, p)
+                       for p in plaintexts]
+
+        # Values that the previous key does not decrypt
+        ciphertexts[1] = CPSecurity.encrypt(self._other_key, 'other')
+        ciphertexts[2] = 'not a token'
+        ciphertexts[3] = None
+
+        values = CPSecurity.rekey(self._prev_key, self._key, ciphertexts,
+                                  workers=workers)
+
+        self.assertEqual(len(values), count)
+        self.assertEqual(values[1:4], [None, None, None])
+        for i in [0] + range(4, count):
+            self.assertEqual(CPSecurity.decrypt(self._key, values[i]),
+                             plaintexts[i])
+            self.assertIsNone(CPSecurity.decrypt(self._prev_key, values[i]))
+
+    def test_rekey(self):
+        self._check_rekey(10, 1)
+
+    def test_rekey_in_workers(self):
+        self._check_rekey(600, 4)
+
+    def test_rekey_nothing(self):
+        self.assertEqual(CPSecurity.rekey(self._prev_key, self._key, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import importlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import simplejson as json
+
+from helion_configurationprocessor.cp.model.NetworkAddressIndex \
+    import NetworkAddressIndex
+from helion_configurationprocessor.cp.model.NetworkTable \
+    import NetworkTable
+from helion_configurationprocessor.cp.model.StatePersistor \
+    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
+
+from .StatePersistorTestUtils import CloudConfig
+
+
+CloudCpLiteGenerator = importlib.import_module(
+    'helion_configurationprocessor.plugins.generators.2_0.'
+    'CloudCpLiteGenerator').CloudCpLiteGenerator
+CloudModelFinalizer = importlib.import_module(
+    'helion_configurationprocessor.plugins.finalizers.2_0.'
+    'CloudModelFinalizer').CloudModelFinalizer
+
+
+class OutputCloudConfig(CloudConfig):
+    def __init__(self, path, output_path):
+        super(OutputCloudConfig, self).__init__(path)
+        self._output_path = output_path
+
+    def get_output_path(self, models):
+        return self._output_path
+
+
+def cloud_model():
+    """A minimal cloud: one server in a single cluster on one network."""
+    return {
+        'services': [{'name': 'svc', 'components': {'api': ['comp-a']}}],
+        'service-components': [
+            {'name': 'comp-a', 'mnemonic': 'CMP-A',
+             'endpoints': [{'port': 5000, 'has-vip': False,
+                            'roles': ['public']}]}],
+        'control-planes': [
+            {'name': 'cp1', 'region-name': 'region1',
+             'clusters': [{'name': 'c1', 'server-role': 'ROLE',
+                           'member-count': 1,
+                           'service-components': ['comp-a']}]}],
+        'network-groups': [
+            {'name': 'MGMT', 'component-endpoints': ['default'],
+             'hostname': True, 'routes': ['default']}],
+        'networks': [
+            {'name': 'MGMT-NET', 'network-group': 'MGMT',
+             'cidr': '10.0.0.0/24', 'gateway-ip': '10.0.0.1',
+             'vlanid': 10, 'tagged-vlan': False}],
+        'interface-models': [
+            {'name': 'IFACE',
+             'network-interfaces': [{'name': 'eth0',
+                                     'device': {'name': 'eth0'},
+                                     'network-groups': ['MGMT']}]}],
+        'disk-models': [{'name': 'DISK', 'volume-groups': []}],
+        'server-roles': [{'name': 'ROLE', 'interface-model': 'IFACE',
+                          'disk-model': 'DISK'}],
+        'servers': [{'id': 'srv1', 'ip-addr': '10.0.0.5', 'role': 'ROLE'}],
+    }
+
+
+class TestCloudCpLiteGenerator(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._output_path = os.path.join(self._dir, 'output')
+
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+
+    def tearDown(self):
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+        NetworkAddressIndex.clear()
+        NetworkTable.clear()
+        shutil.rmtree(self._dir)
+
+    def test_internal_model_is_serializable(self):
+        models = {'CloudDescription': {'cloud': {'name': 'test'}},
+                  'CloudModel': {'2.0': cloud_model()}}
+        instructions = {'cloud_output_path': self._output_path,
+                        'cloud_version': 2.0,
+                        'remove_deleted_servers': False,
+                        'free_unused_addresses': False}
+        controllers = {'CloudConfig': OutputCloudConfig(
+            os.path.join(self._dir, 'state') + os.sep, self._output_path)}
+
+        generator = CloudCpLiteGenerator(instructions, models, controllers)
+        generator.generate()
+        self.assertEqual(generator.errors, [])
+
+        internal = models['CloudModel']['internal']
+        self.assertEqual(
+            internal['address_allocations']['MGMT']['MGMT-NET'].keys(),
+            ['10.0.0.5'])
+
+        # The finalizer writes the whole model, internal data included
+        finalizer = CloudModelFinalizer(instructions, models, controllers,
+                                        {})
+        finalizer.finalize()
+
+        with open(os.path.join(self._output_path, 'internal',
+                               'CloudModel.json')) as fp:
+            written = json.load(fp)
+
+        self.assertEqual(sorted(written['internal']), sorted(internal))
+
+
+if __name__ == '__main__':
+    unittest.main()
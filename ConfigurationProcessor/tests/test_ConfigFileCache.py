@@ -0,0 +1,149 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from helion_configurationprocessor.cp.model.ConfigFileCache \
+    import ConfigFileCache
+from helion_configurationprocessor.cp.model.JsonConfigFile \
+    import JsonConfigFile
+from helion_configurationprocessor.cp.model.YamlConfigFile \
+    import YamlConfigFile
+
+
+DOCUMENTS = {
+    'servers.yml': (
+        'product:\n'
+        '  version: 2\n'
+        'servers:\n'
+        '  - id: one\n'
+        '    role: CONTROLLER\n'
+        '  - id: two\n'
+        '    role: COMPUTE\n'),
+    'duplicates.yml': (
+        'product:\n'
+        '  version: 2\n'
+        'name: first\n'
+        'name: second\n'),
+    'unhashable.yml': (
+        '? [one, two]\n'
+        ': servers\n'),
+    'networks.json': json.dumps(
+        {'product': {'version': 2},
+         'networks': [{'name': 'MGMT', 'cidr': '10.0.0.0/24'}]}),
+}
+
+
+class TestConfigFileCache(unittest.TestCase):
+    def setUp(self):
+        ConfigFileCache.clear()
+        self._dir = tempfile.mkdtemp()
+        for file_name, text in DOCUMENTS.items():
+            self._write(file_name, text)
+
+    def tearDown(self):
+        ConfigFileCache.clear()
+        shutil.rmtree(self._dir)
+
+    def _path(self, file_name):
+        return os.path.join(self._dir, file_name)
+
+    def _write(self, file_name, text):
+        with open(self._path(file_name), 'w') as fp:
+            fp.write(text)
+
+    @staticmethod
+    def _direct_load(path):
+        """Load a file the way callers did before ConfigFileCache."""
+        if path.endswith('.json'):
+            config_file = JsonConfigFile('config_file', path)
+        else:
+            config_file = YamlConfigFile('config_file', path)
+        config_file.load()
+        return config_file
+
+    def assertSameLoad(self, cached, direct):
+        self.assertIs(type(cached), type(direct))
+        self.assertEqual(cached.contents, direct.contents)
+        self.assertEqual(cached.warnings, direct.warnings)
+        self.assertEqual(cached.errors, direct.errors)
+        self.assertEqual(cached.is_loaded, direct.is_loaded)
+
+    def test_same_as_direct_load(self):
+        for file_name in DOCUMENTS:
+            path = self._path(file_name)
+            self.assertSameLoad(ConfigFileCache.load(path),
+                                self._direct_load(path))
+
+    def test_parsed_once(self):
+        path = self._path('servers.yml')
+        config_file = ConfigFileCache.load(path)
+        self.assertIs(ConfigFileCache.load(path), config_file)
+        self.assertIs(ConfigFileCache.load(os.path.join(
+            self._dir, '.', 'servers.yml')), config_file)
+
+    def test_changed_file_is_reloaded(self):
+        path = self._path('servers.yml')
+        config_file = ConfigFileCache.load(path)
+
+        self._write('servers.yml', DOCUMENTS['servers.yml'] +
+                    '  - id: three\n    role: COMPUTE\n')
+        reloaded = ConfigFileCache.load(path)
+        self.assertIsNot(reloaded, config_file)
+        self.assertEqual(len(reloaded.contents['servers']), 3)
+        self.assertSameLoad(reloaded, self._direct_load(path))
+
+    def test_clear(self):
+        path = self._path('servers.yml')
+        config_file = ConfigFileCache.load(path)
+        ConfigFileCache.clear()
+        self.assertIsNot(ConfigFileCache.load(path), config_file)
+
+    def test_missing_and_unknown_files(self):
+        self.assertIsNone(ConfigFileCache.load(self._path('servers.txt')))
+
+        path = self._path('missing.yml')
+        self.assertIsNone(ConfigFileCache.get_stamp(path))
+        self.assertRaises(IOError, ConfigFileCache.load, path)
+        self.assertEqual(ConfigFileCache._documents, dict())
+
+    def test_preload_same_as_direct_load(self):
+        paths = [self._path(file_name) for file_name in DOCUMENTS]
+        ConfigFileCache.preload(paths + [self._path('missing.yml')], 2)
+        self.assertEqual(len(ConfigFileCache._documents), len(paths))
+
+        for path in paths:
+            config_file = ConfigFileCache.load(path)
+            self.assertIs(ConfigFileCache._documents[path][1], config_file)
+            self.assertSameLoad(config_file, self._direct_load(path))
+
+    def test_preload_skips_cached_files(self):
+        paths = [self._path(file_name) for file_name in DOCUMENTS]
+        cached = ConfigFileCache.load(paths[0])
+        ConfigFileCache.preload(paths, 2)
+        self.assertIs(ConfigFileCache.load(paths[0]), cached)
+
+    def test_preload_serial_leaves_files_to_load(self):
+        paths = [self._path(file_name) for file_name in DOCUMENTS]
+        ConfigFileCache.preload(paths, 1)
+        self.assertEqual(ConfigFileCache._documents, dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
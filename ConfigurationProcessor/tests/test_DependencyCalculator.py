@@ -0,0 +1,163 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import random
+import unittest
+
+from helion_configurationprocessor.cp.model.DependencyCalculator \
+    import DependencyCalculator
+
+
+class FakePlugin(object):
+    def __init__(self, slug, dependencies):
+        self.slug = slug
+        self._dependencies = dependencies
+
+    def get_dependencies(self):
+        return self._dependencies
+
+
+def scan_order(plugins):
+    """The order the plugin-by-plugin scan that DependencyCalculator
+    replaced gave for plugins with no missing or circular dependencies:
+    repeatedly take the first plugin whose dependencies have all been
+    taken.
+    """
+    remaining = [(p.slug, set(p.get_dependencies())) for p in plugins]
+    order = []
+    while remaining:
+        for elem in remaining:
+            if not elem[1]:
+                break
+        remaining.remove(elem)
+        order.append(elem[0])
+        for _, dependencies in remaining:
+            dependencies.discard(elem[0])
+
+    return order
+
+
+def random_plugins(r):
+    count = r.randint(1, 25)
+    slugs = ['plugin-%d' % i for i in range(count)]
+    r.shuffle(slugs)
+
+    # Only depend on plugins earlier in slugs, so there are no cycles,
+    # then load the plugins in a random order
+    plugins = []
+    for i, slug in enumerate(slugs):
+        dependencies = r.sample(slugs[:i], r.randint(0, min(i, 3)))
+        plugins.append(FakePlugin(slug, dependencies))
+    r.shuffle(plugins)
+
+    return plugins
+
+
+def calculate(plugins):
+    dc = DependencyCalculator(plugins)
+    dc.calculate()
+    return dc
+
+
+class TestDependencyCalculator(unittest.TestCase):
+    def test_same_order_as_scan(self):
+        for seed in range(300):
+            plugins = random_plugins(random.Random(seed))
+
+            dc = calculate(plugins)
+            self.assertTrue(dc.ok)
+            self.assertEqual(dc.errors, [])
+            self.assertEqual(dc.get(), scan_order(plugins))
+
+    def test_levels(self):
+        for seed in range(300):
+            plugins = random_plugins(random.Random(seed))
+            dependencies = dict((p.slug, p.get_dependencies())
+                                for p in plugins)
+
+            dc = calculate(plugins)
+            levels = dc.get_levels()
+            self.assertEqual(sorted(sum(levels, [])), sorted(dc.get()))
+
+            level_of = dict()
+            for level, slugs in enumerate(levels):
+                for slug in slugs:
+                    level_of[slug] = level
+
+            # Each plugin is in the level after its latest dependency
+            for slug, level in level_of.items():
+                expected = max([level_of[dep] + 1
+                                for dep in dependencies[slug]] or [0])
+                self.assertEqual(level, expected)
+
+    def test_dependencies_not_changed(self):
+        plugins = [FakePlugin('b', ['a']), FakePlugin('a', [])]
+        calculate(plugins)
+        self.assertEqual(plugins[0].get_dependencies(), ['a'])
+
+    def test_circular(self):
+        plugins = [FakePlugin('a', []),
+                   FakePlugin('b', ['a', 'd']),
+                   FakePlugin('c', ['b']),
+                   FakePlugin('d', ['c']),
+                   FakePlugin('e', ['d'])]
+
+        dc = calculate(plugins)
+        self.assertFalse(dc.ok)
+        self.assertEqual(dc.errors, [
+            'Circular dependency detected: b -> d -> c -> b'])
+        self.assertEqual(dc.get(), [])
+        self.assertEqual(dc.get_levels(), [])
+
+    def test_mutual(self):
+        dc = calculate([FakePlugin('a', ['b']), FakePlugin('b', ['a'])])
+        self.assertEqual(dc.errors, [
+            'Circular dependency detected: a -> b -> a'])
+
+    def test_self(self):
+        dc = calculate([FakePlugin('a', ['a'])])
+        self.assertEqual(dc.errors, [
+            'Circular dependency detected: a -> a'])
+
+    def test_separate_cycles(self):
+        dc = calculate([FakePlugin('a', ['b']), FakePlugin('b', ['a']),
+                        FakePlugin('c', ['d']), FakePlugin('d', ['c'])])
+        self.assertEqual(dc.errors, [
+            'Circular dependency detected: a -> b -> a',
+            'Circular dependency detected: c -> d -> c'])
+
+    def test_missing(self):
+        plugins = [FakePlugin('a', []),
+                   FakePlugin('b', ['a', 'x']),
+                   FakePlugin('c', ['b'])]
+
+        dc = calculate(plugins)
+        self.assertFalse(dc.ok)
+        self.assertEqual(dc.errors, [
+            'Missing dependency detected: b depends on x, '
+            'which has not been loaded'])
+        self.assertEqual(dc.get(), [])
+
+    def test_calculate_again(self):
+        dc = DependencyCalculator([FakePlugin('b', ['a']),
+                                   FakePlugin('a', [])])
+        dc.calculate()
+        dc.calculate()
+        self.assertEqual(dc.get(), ['a', 'b'])
+        self.assertEqual(dc.get_levels(), [['a'], ['b']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+
+from cryptography.fernet import Fernet
+
+from helion_configurationprocessor.cp.model.CPSecurity import CPSecurity
+from helion_configurationprocessor.cp.model.StatePersistor \
+    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
+from helion_configurationprocessor.plugins.generators.EncryptionKeyGenerator \
+    import EncryptionKeyGenerator
+
+from .StatePersistorTestUtils import CloudConfig
+
+
+class TestEncryptionKeyGeneratorRekey(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'persistent_state') + os.sep
+        self._controllers = {'CloudConfig': CloudConfig(self._path)}
+
+        self._prev_key = Fernet.generate_key()
+        self._key = Fernet.generate_key()
+
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+
+    def tearDown(self):
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+        CPSecurity.clear()
+        shutil.rmtree(self._dir)
+
+    def _write_private_data(self, private_data):
+        StatePersistor(None, self._controllers,
+                       'private_data.yml').persist_info(private_data)
+
+    def _read_private_data(self):
+        return StatePersistor(None, self._controllers,
+                              'private_data.yml').recall_info()
+
+    def _rekey(self):
+        generator = EncryptionKeyGenerator(
+            {'previous_encryption_key': self._prev_key,
+             'encryption_key': self._key}, None, self._controllers)
+        return generator, generator.generate()
+
+    def test_secure_and_plaintext_values(self):
+        self._write_private_data({
+            'encryption_key_checker': CPSecurity.encrypt(
+                self._prev_key, 'encryption_key_checker'),
+            'secure': CPSecurity.encrypt(self._prev_key, 'secret'),
+            'secure__is_secure': True,
+            'plaintext': 'generated without a key',
+            'plaintext__is_secure': False,
+            'unflagged': 'no flag'})
+
+        generator, result = self._rekey()
+        self.assertTrue(result)
+        self.assertEqual(generator.errors, [])
+
+        private_data = self._read_private_data()
+        self.assertEqual(CPSecurity.decrypt(self._key, private_data['secure']),
+                         'secret')
+        self.assertEqual(
+            CPSecurity.decrypt(self._key,
+                               private_data['encryption_key_checker']),
+            'encryption_key_checker')
+        self.assertEqual(private_data['plaintext'], 'generated without a key')
+        self.assertEqual(private_data['unflagged'], 'no flag')
+        self.assertIs(private_data['plaintext__is_secure'], False)
+
+    def test_value_that_does_not_decrypt(self):
+        checker = CPSecurity.encrypt(self._prev_key, 'encryption_key_checker')
+        other = CPSecurity.encrypt(Fernet.generate_key(), 'other')
+        private_data = {'encryption_key_checker': checker,
+                        'secure': CPSecurity.encrypt(self._prev_key, 'a'),
+                        'secure__is_secure': True,
+                        'other': other,
+                        'other__is_secure': True}
+        self._write_private_data(private_data)
+
+        generator, result = self._rekey()
+        self.assertFalse(result)
+        self.assertEqual(len(generator.errors), 1)
+        self.assertTrue(generator.errors[0].endswith(': other'))
+
+        # Nothing is changed
+        self.assertEqual(self._read_private_data(), private_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from helion_configurationprocessor.cp.model.JournalStatePersistor \
+    import JournalStatePersistor
+from helion_configurationprocessor.cp.model.StatePersistor \
+    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
+
+from .StatePersistorTestUtils import CloudConfig
+from .StatePersistorTestUtils import random_operations
+
+
+class TestJournalStatePersistor(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'persistent_state') + os.sep
+        self._controllers = {'CloudConfig': CloudConfig(self._path)}
+
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+
+    def tearDown(self):
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+        shutil.rmtree(self._dir)
+
+    def _persistor(self):
+        return JournalStatePersistor(None, self._controllers, 'test.yml',
+                                     persistence_path=self._path,
+                                     write_behind=True)
+
+    def _read_yaml(self):
+        with open(self._path + 'test.yml') as fp:
+            return yaml.safe_load(fp)
+
+    def test_same_as_yaml(self):
+        yaml_path = os.path.join(self._dir, 'yaml') + os.sep
+        for seed in range(20):
+            persistors = [
+                StatePersistor(None, None, 'test%d.yml' % seed,
+                               persistence_path=yaml_path,
+                               write_behind=True),
+                JournalStatePersistor(None, None, 'test%d.yml' % seed,
+                                      persistence_path=self._path,
+                                      write_behind=True)]
+
+            # Compact part way through some of the runs
+            persistors[1].COMPACT_THRESHOLD = 10 + seed * 5
+
+            for recalled in random_operations(persistors, seed):
+                self.assertEqual(recalled[0], recalled[1])
+
+            for persistor in persistors:
+                persistor.commit()
+
+            self.assertEqual(
+                StatePersistor(None, None, 'test%d.yml' % seed,
+                               persistence_path=yaml_path).recall_info(),
+                JournalStatePersistor(None, None, 'test%d.yml' % seed,
+                                      persistence_path=self._path
+                                      ).recall_info())
+
+    def test_appends_to_journal(self):
+        with self._persistor() as persistor:
+            persistor.persist_info({'a': 1, 'b': 2})
+
+        with self._persistor() as persistor:
+            persistor.delete_info(['a'])
+
+        self.assertFalse(os.path.exists(self._path + 'test.yml'))
+        self.assertEqual(self._persistor().recall_info(), {'b': 2})
+
+    def test_discards_torn_record(self):
+        with self._persistor() as persistor:
+            persistor.persist_info({'a': 1})
+
+        with self._persistor() as persistor:
+            persistor.persist_info({'b': 2})
+
+        # A commit interrupted part way through writing its record
+        journal_file = self._persistor().journal_file
+        with open(journal_file) as fp:
+            text = fp.read()
+        with open(journal_file, 'w') as fp:
+            fp.write(text[:-len('...\n')])
+
+        persistor = self._persistor()
+        self.assertEqual(persistor.recall_info(), {'a': 1})
+
+        with persistor:
+            persistor.persist_info({'c': 3})
+
+        self.assertEqual(self._persistor().recall_info(), {'a': 1, 'c': 3})
+
+        # The journal is a complete stream of YAML documents again
+        with open(journal_file) as fp:
+            self.assertEqual(len(list(yaml.safe_load_all(fp))), 2)
+
+    def test_compacts_at_threshold(self):
+        persistor = self._persistor()
+        persistor.COMPACT_THRESHOLD = 3
+        for i in range(4):
+            with persistor:
+                persistor.persist_info({'key-%d' % i: i})
+
+        # The fourth record went over the threshold, so the state was
+        # written to the snapshot instead
+        self.assertEqual(self._read_yaml(),
+                         dict(('key-%d' % i, i) for i in range(4)))
+        self.assertFalse(os.path.exists(persistor.journal_file))
+
+    def test_export_all_compacts(self):
+        with self._persistor() as persistor:
+            persistor.persist_info({'a': 1})
+
+        # As in a run that only checkpoints, where nothing has opened the
+        # persistent state
+        StatePersistorRegistry.clear()
+        StatePersistorRegistry.configure(
+            {'persistent_state_backend': 'journal'})
+        StatePersistorRegistry.export_all(None, self._controllers)
+
+        self.assertEqual(self._read_yaml(), {'a': 1})
+        self.assertFalse(os.path.exists(self._path + 'test.yml.journal'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import importlib
+import random
+import unittest
+
+from netaddr import AddrFormatError
+from netaddr import IPAddress
+from netaddr import IPNetwork
+
+from helion_configurationprocessor.cp.model.NetworkAddressIndex \
+    import NetworkAddressIndex
+from helion_configurationprocessor.cp.model.NetworkTable \
+    import NetworkTable
+
+from .NetworkTestUtils import EDGE_NETWORKS
+from .NetworkTestUtils import edge_addresses
+from .NetworkTestUtils import random_address
+from .NetworkTestUtils import random_disjoint_networks
+
+
+CloudCpLiteGenerator = importlib.import_module(
+    'helion_configurationprocessor.plugins.generators.2_0.'
+    'CloudCpLiteGenerator').CloudCpLiteGenerator
+
+
+def network_from_address(networks, address):
+    """The scan of every network that NetworkAddressIndex replaces."""
+    for net_name, net in networks.iteritems():
+        if 'cidr' in net:
+            ip_net = IPNetwork(unicode(net['cidr']))
+            net_start = ip_net[1]
+            net_end = ip_net[-2]
+
+            if 'start-address' in net:
+                net_start = IPAddress(net['start-address'])
+
+            if 'end-address' in net:
+                net_end = IPAddress(net['end-address'])
+
+            try:
+                server_ip = IPAddress(address)
+            except AddrFormatError:
+                return None
+            else:
+                if net_start <= server_ip <= net_end:
+                    return net_name
+    return None
+
+
+class TestNetworkAddressIndex(unittest.TestCase):
+    def tearDown(self):
+        NetworkAddressIndex.clear()
+        NetworkTable.clear()
+
+    def test_same_as_scan(self):
+        for seed in range(200):
+            r = random.Random(seed)
+            networks = random_disjoint_networks(r)
+            index = NetworkAddressIndex(networks)
+            for _ in range(100):
+                address = random_address(r)
+                self.assertEqual(index.lookup(address),
+                                 network_from_address(networks, address),
+                                 (seed, address))
+
+    def test_edge_networks(self):
+        index = NetworkAddressIndex(EDGE_NETWORKS)
+        for net in EDGE_NETWORKS.values():
+            for address in edge_addresses(net):
+                self.assertEqual(
+                    index.lookup(address),
+                    network_from_address(EDGE_NETWORKS, address), address)
+
+        self.assertIsNone(index.lookup('192.168.0.1'))
+        self.assertIsNone(index.lookup('10.0.1.1'))
+        self.assertEqual(index.lookup('10.0.1.10'), 'gateway-outside-range')
+        self.assertIsNone(index.lookup('10.0.1.11'))
+        self.assertIsNone(index.lookup('10.0.2.64'))
+        self.assertEqual(index.lookup('10.0.2.77'), 'host-bits')
+        self.assertEqual(index.lookup('fd00::2'), 'ipv6')
+        self.assertIsNone(index.lookup('fd00::3'))
+
+    def test_get_shares_index(self):
+        networks = random_disjoint_networks(random.Random(0))
+
+        index = NetworkAddressIndex.get(networks)
+        self.assertIs(NetworkAddressIndex.get(networks), index)
+        self.assertIs(NetworkAddressIndex.get(networks.values()), index)
+
+        changed = dict(networks)
+        changed['new'] = {'name': 'new', 'cidr': '172.16.0.0/24'}
+        self.assertIsNot(NetworkAddressIndex.get(changed), index)
+        self.assertEqual(
+            NetworkAddressIndex.get(changed).lookup('172.16.0.5'), 'new')
+
+        NetworkAddressIndex.clear()
+        self.assertIsNot(NetworkAddressIndex.get(networks), index)
+
+    def test_generator_addresses_by_network(self):
+        generator = CloudCpLiteGenerator.__new__(CloudCpLiteGenerator)
+
+        for seed in range(100):
+            r = random.Random(seed)
+            networks = random_disjoint_networks(r)
+
+            persisted = {}
+            server_addresses = {}
+            for i in range(100):
+                address = random_address(r)
+                if r.random() < 0.5:
+                    persisted[address] = {'free': r.random() < 0.3,
+                                          'used-by': 'c%d' % i,
+                                          'host': 'h%d' % i}
+                else:
+                    server_addresses[address] = 'server%d' % i
+
+            persisted_values = generator._address_values(persisted)
+            server_values = generator._address_values(server_addresses)
+
+            index = NetworkAddressIndex.get(networks)
+            persisted_by_net = generator._addresses_by_network(
+                index, persisted_values)
+            server_by_net = generator._addresses_by_network(
+                index, server_values)
+
+            # Each network gets the same addresses as when it picked them
+            # out of all of the addresses itself
+            for name, net in networks.items():
+                if 'cidr' not in net:
+                    continue
+
+                space = NetworkTable.compile(net)
+                self.assertEqual(
+                    generator.generate_addresses(
+                        space, persisted_by_net.get(name, {}),
+                        server_by_net.get(name, {})),
+                    generator.generate_addresses(
+                        space, persisted_values, server_values),
+                    (seed, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import importlib
+import random
+import unittest
+
+import netaddr
+
+from helion_configurationprocessor.cp.model.AddressSpace \
+    import AddressSpace
+from helion_configurationprocessor.cp.model.NetworkTable \
+    import NetworkTable
+
+from .NetworkTestUtils import EDGE_NETWORKS
+from .NetworkTestUtils import edge_addresses
+from .NetworkTestUtils import random_cidr
+from .NetworkTestUtils import random_networks
+
+
+AnsHostVarsBuilder = importlib.import_module(
+    'helion_configurationprocessor.plugins.builders.2_0.'
+    'AnsHostVarsBuilder').AnsHostVarsBuilder
+
+
+def route_info(route, gateway):
+    """AnsHostVarsBuilder.getRouteInfo() from before NetworkTable."""
+    if route['default']:
+        return '0.0.0.0', '0.0.0.0', gateway
+
+    ip_network = netaddr.IPNetwork(route['cidr'])
+    return str(ip_network.network), str(ip_network.netmask), gateway
+
+
+class TestNetworkTable(unittest.TestCase):
+    def tearDown(self):
+        NetworkTable.clear()
+
+    def test_same_as_netaddr(self):
+        for seed in range(200):
+            r = random.Random(seed)
+            networks = random_networks(r)
+            table = NetworkTable(networks)
+
+            self.assertEqual(list(table), sorted(n for n in networks
+                                                 if n != 'no-cidr'))
+            self.assertEqual(len(table), len(networks) - 1)
+            self.assertNotIn('no-cidr', table)
+            self.assertIsNone(table.get('no-cidr'))
+
+            for name in table:
+                net = networks[name]
+                compiled = table[name]
+                ip_network = netaddr.IPNetwork(unicode(net['cidr']))
+
+                self.assertEqual(compiled.name, name)
+                self.assertEqual(compiled.vlanid, net['vlanid'])
+                self.assertEqual(compiled.tagged_vlan,
+                                 net.get('tagged-vlan', True))
+                self.assertEqual(compiled.version, ip_network.version)
+                self.assertEqual(compiled.network, str(ip_network.network))
+                self.assertEqual(compiled.netmask, str(ip_network.netmask))
+                self.assertEqual(compiled.prefixlen, ip_network.prefixlen)
+                self.assertEqual(compiled.first, int(ip_network[1]))
+                self.assertEqual(compiled.last, int(ip_network[-2]))
+
+                info = NetworkTable.cidr_info(net['cidr'])
+                self.assertEqual(info, (ip_network.version,
+                                        str(ip_network.network),
+                                        str(ip_network.netmask),
+                                        ip_network.prefixlen))
+
+    def test_edge_networks(self):
+        table = NetworkTable(EDGE_NETWORKS)
+        self.assertEqual(list(table), sorted(EDGE_NETWORKS))
+
+        # A compiled network has the addresses of its address space
+        for name, net in EDGE_NETWORKS.items():
+            compiled = table[name]
+            space = AddressSpace.from_network(net)
+            self.assertEqual((compiled.first, compiled.last, compiled.size),
+                             (space.first, space.last, space.size), name)
+            for addr in edge_addresses(net):
+                self.assertEqual(addr in compiled, addr in space,
+                                 (name, addr))
+
+        compiled = table['gateway-outside-cidr']
+        self.assertEqual(compiled.size, 6)
+        self.assertNotIn('192.168.0.1', compiled)
+
+        compiled = table['gateway-outside-range']
+        self.assertEqual(compiled.first, int(netaddr.IPAddress('10.0.1.4')))
+        self.assertEqual(compiled.last, int(netaddr.IPAddress('10.0.1.10')))
+        self.assertNotIn('10.0.1.1', compiled)
+
+        compiled = table['host-bits']
+        self.assertEqual((compiled.network, compiled.netmask,
+                          compiled.prefixlen),
+                         ('10.0.2.64', '255.255.255.240', 28))
+        self.assertEqual(NetworkTable.cidr_info('10.0.2.77/28'),
+                         (4, '10.0.2.64', '255.255.255.240', 28))
+        self.assertEqual(compiled.first, int(netaddr.IPAddress('10.0.2.65')))
+        self.assertEqual(compiled.last, int(netaddr.IPAddress('10.0.2.78')))
+
+        compiled = table['ipv6']
+        self.assertEqual(compiled.version, 6)
+        self.assertEqual(compiled.last, int(netaddr.IPAddress('fd00::2')))
+        self.assertNotIn('fd00::3', compiled)
+
+    def test_compiled_once(self):
+        net = {'name': 'net', 'cidr': '10.0.0.0/24'}
+        compiled = NetworkTable.compile(net)
+        self.assertIs(NetworkTable.compile(dict(net)), compiled)
+        self.assertIs(NetworkTable([net])['net'], compiled)
+        self.assertIs(NetworkTable.cidr_info('10.0.0.0/24'),
+                      NetworkTable.cidr_info('10.0.0.0/24'))
+
+        changed = dict(net, **{'gateway-ip': '10.0.0.1'})
+        self.assertIsNot(NetworkTable.compile(changed), compiled)
+        self.assertNotIn('10.0.0.1', NetworkTable.compile(changed))
+
+        NetworkTable.clear()
+        self.assertIsNot(NetworkTable.compile(net), compiled)
+
+    def test_route_info(self):
+        builder = AnsHostVarsBuilder.__new__(AnsHostVarsBuilder)
+        for seed in range(100):
+            r = random.Random(seed)
+            networks = random_networks(r)
+            builder._network_table = NetworkTable(networks)
+
+            routes = [{'cidr': '0.0.0.0/0', 'net_name': None,
+                       'default': True},
+                      {'cidr': random_cidr(r), 'net_name': 'elsewhere',
+                       'default': False}]
+            for name, net in networks.items():
+                if 'cidr' in net:
+                    routes.append({'cidr': net['cidr'], 'net_name': name,
+                                   'default': False})
+
+            for route in routes:
+                self.assertEqual(builder.getRouteInfo(route, '10.0.0.1'),
+                                 route_info(route, '10.0.0.1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+
+from helion_configurationprocessor.cp.model import ParsedFileStore \
+    as parsed_file_store
+from helion_configurationprocessor.cp.model.ParsedFileStore \
+    import ParsedFileStore
+from helion_configurationprocessor.cp.model.YamlConfigFile \
+    import YamlConfigFile
+
+
+class TestParsedFileStore(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._store_path = os.path.join(self._dir, 'cache', 'input.pickle')
+        self._file_name = os.path.join(self._dir, 'servers.yml')
+        self._write('servers:\n  - id: one\n  - id: one\n'
+                    'name: a\nname: b\n')
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _write(self, text):
+        with open(self._file_name, 'w') as fp:
+            fp.write(text)
+
+    def _load(self, store):
+        config_file = YamlConfigFile('config_file', self._file_name)
+        store.load(config_file)
+        return config_file
+
+    def _direct_load(self):
+        config_file = YamlConfigFile('config_file', self._file_name)
+        config_file.load()
+        return config_file
+
+    def assertSameLoad(self, config_file, direct):
+        self.assertEqual(config_file.contents, direct.contents)
+        self.assertEqual(config_file.warnings, direct.warnings)
+        self.assertEqual(config_file.errors, direct.errors)
+        self.assertEqual(config_file.is_loaded, direct.is_loaded)
+
+    def test_restored_across_runs(self):
+        store = ParsedFileStore(self._store_path)
+        self.assertFalse(store.restore(
+            YamlConfigFile('config_file', self._file_name)))
+        self.assertSameLoad(self._load(store), self._direct_load())
+        store.flush()
+        self.assertTrue(os.path.isfile(self._store_path))
+
+        store = ParsedFileStore(self._store_path)
+        config_file = YamlConfigFile('config_file', self._file_name)
+        self.assertTrue(store.restore(config_file))
+        self.assertSameLoad(config_file, self._direct_load())
+
+        # Each restore gives the caller its own objects
+        other = YamlConfigFile('config_file', self._file_name)
+        store.restore(other)
+        self.assertIsNot(other.contents, config_file.contents)
+
+    def test_changed_file_is_parsed(self):
+        store = ParsedFileStore(self._store_path)
+        self._load(store)
+        store.flush()
+
+        self._write('servers:\n  - id: two\n')
+        store = ParsedFileStore(self._store_path)
+        config_file = YamlConfigFile('config_file', self._file_name)
+        self.assertFalse(store.restore(config_file))
+        self.assertSameLoad(self._load(store), self._direct_load())
+
+    def test_unused_entries_are_dropped(self):
+        store = ParsedFileStore(self._store_path)
+        self._load(store)
+        store.flush()
+
+        self._write('servers:\n  - id: two\n')
+        store = ParsedFileStore(self._store_path)
+        self._load(store)
+        store.flush()
+
+        self.assertEqual(len(ParsedFileStore(self._store_path)._entries), 1)
+
+    def test_other_parser_version_is_ignored(self):
+        store = ParsedFileStore(self._store_path)
+        self._load(store)
+        store.flush()
+
+        version = parsed_file_store.PARSER_VERSION
+        parsed_file_store.PARSER_VERSION = version + '-other'
+        try:
+            store = ParsedFileStore(self._store_path)
+        finally:
+            parsed_file_store.PARSER_VERSION = version
+
+        self.assertFalse(store.restore(
+            YamlConfigFile('config_file', self._file_name)))
+
+    def test_unreadable_store_is_ignored(self):
+        os.makedirs(os.path.dirname(self._store_path))
+        with open(self._store_path, 'w') as fp:
+            fp.write('not a pickle')
+
+        store = ParsedFileStore(self._store_path)
+        self.assertSameLoad(self._load(store), self._direct_load())
+
+
+if __name__ == '__main__':
+    unittest.main()
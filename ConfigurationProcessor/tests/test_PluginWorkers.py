@@ -0,0 +1,134 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import signal
+import sys
+import unittest
+
+from helion_configurationprocessor.cp.model import PluginWorkers \
+    as plugin_workers
+from helion_configurationprocessor.cp.model.PluginWorkers \
+    import PluginWorkers
+
+
+PARENT_PID = os.getpid()
+
+_run_in_worker = plugin_workers._run_in_worker
+
+
+def _die_before_start(args):
+    """Run a plugin in a worker, except that the worker given the second
+    plugin dies after taking it but before starting it.
+    """
+    if args[0] == 1:
+        os._exit(1)
+
+    return _run_in_worker(args)
+
+
+class FakePlugin(object):
+    def __init__(self, action='run'):
+        self._action = action
+        self.pid = None
+
+    def run(self):
+        self.pid = os.getpid()
+
+        # Never take the test process down with a plugin that failed to
+        # start in a worker
+        if self.pid == PARENT_PID:
+            return
+
+        if self._action == 'kill':
+            os.kill(self.pid, signal.SIGKILL)
+        elif self._action == 'exit':
+            sys.exit(0)
+        elif self._action == 'raise':
+            raise ValueError('failed')
+
+    def get_worker_state(self):
+        return self.pid
+
+    def set_worker_state(self, state):
+        self.pid = state
+
+
+class TestPluginWorkers(unittest.TestCase):
+    def _run(self, actions, workers=2):
+        plugins = [('plugin%d' % i, FakePlugin(action))
+                   for i, action in enumerate(actions)]
+        pool = PluginWorkers(plugins, 'run', workers)
+        return dict(plugins), pool, pool.results()
+
+    def test_results(self):
+        plugins, pool, results = self._run(['run', 'run', 'raise', 'run'])
+
+        self.assertEqual(sorted(results), sorted(plugins))
+        for name, plugin in plugins.items():
+            self.assertTrue(pool.is_running(name))
+            self.assertNotEqual(plugin.pid, PARENT_PID)
+
+        duration, error, error_traceback = results['plugin2']
+        self.assertIsNone(duration)
+        self.assertEqual(error, 'failed')
+        self.assertIn('ValueError', error_traceback)
+
+        for name in ['plugin0', 'plugin1', 'plugin3']:
+            self.assertEqual(results[name][1:], (None, None))
+
+    def test_serial(self):
+        plugins, pool, results = self._run(['run', 'run'], workers=1)
+        self.assertFalse(pool.is_running('plugin0'))
+        self.assertEqual(results, dict())
+
+    def _check_lost(self, action):
+        plugins, pool, results = self._run(['run', action, 'run', 'run'])
+
+        self.assertEqual(sorted(results), sorted(plugins))
+        duration, error, error_traceback = results['plugin1']
+        self.assertIsNone(duration)
+        self.assertIn('exited unexpectedly', error)
+
+        for name in ['plugin0', 'plugin2', 'plugin3']:
+            self.assertEqual(results[name][1:], (None, None))
+            self.assertNotEqual(plugins[name].pid, PARENT_PID)
+
+        return error
+
+    def test_killed_worker(self):
+        error = self._check_lost('kill')
+        self.assertIn('exit code -%d' % signal.SIGKILL, error)
+
+    def test_exited_worker(self):
+        error = self._check_lost('exit')
+        self.assertIn('exit code 0', error)
+
+    def test_lost_before_start(self):
+        timeout = plugin_workers._LOST_TIMEOUT
+        plugin_workers._LOST_TIMEOUT = 0
+        plugin_workers._run_in_worker = _die_before_start
+        try:
+            plugins, pool, results = self._run(['run', 'run', 'run'])
+        finally:
+            plugin_workers._LOST_TIMEOUT = timeout
+            plugin_workers._run_in_worker = _run_in_worker
+
+        # The plugin is left for the caller to run itself
+        self.assertEqual(sorted(results), ['plugin0', 'plugin2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
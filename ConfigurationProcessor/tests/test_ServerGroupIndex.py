@@ -0,0 +1,188 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import random
+import unittest
+
+from helion_configurationprocessor.cp.model.v2_0.ServerGroup \
+    import ServerGroup
+from helion_configurationprocessor.cp.model.v2_0.ServerGroupIndex \
+    import ServerGroupIndex
+
+
+ROLES = ['A', 'B', 'C']
+STATES = ['available', 'available', 'allocated', 'deleted']
+
+
+def build_groups(r):
+    """A random tree of server groups with servers, and a default group.
+    Called twice with the same seed it builds two identical trees.
+    """
+    groups = [{'name': 'g%d' % i} for i in range(r.randint(1, 8))]
+    for i, group in enumerate(groups[1:], 1):
+        if r.random() < 0.7:
+            ServerGroup.add_group(groups[r.randint(0, i - 1)], group)
+
+    default = {'name': 'default'}
+    for i in range(r.randint(0, 30)):
+        ServerGroup.add_server(r.choice(groups + [default]),
+                               {'id': 's%d' % i, 'role': r.choice(ROLES),
+                                'state': r.choice(STATES)})
+
+    return groups, default
+
+
+def all_servers(groups, default):
+    servers = []
+    for group in groups + [default]:
+        servers.extend(group.get('servers', []))
+
+    return servers
+
+
+class TestServerGroupIndexGetServer(unittest.TestCase):
+    def test_same_as_server_group(self):
+        for seed in range(300):
+            r = random.Random(seed)
+            groups, default = build_groups(random.Random(seed))
+            indexed_groups, indexed_default = build_groups(
+                random.Random(seed))
+            index = ServerGroupIndex()
+
+            for step in range(60):
+                op = r.random()
+                if op < 0.1:
+                    # A new server, after the groups have been searched
+                    i = r.randint(0, len(groups))
+                    server = {'id': 'new%d' % step, 'role': r.choice(ROLES),
+                              'state': 'available'}
+                    ServerGroup.add_server((groups + [default])[i],
+                                           dict(server))
+                    ServerGroup.add_server(
+                        (indexed_groups + [indexed_default])[i], server)
+                    continue
+
+                if op < 0.2:
+                    # A server that moves back into the available state
+                    servers = all_servers(groups, default)
+                    if servers:
+                        i = r.randint(0, len(servers) - 1)
+                        servers[i]['state'] = 'available'
+                        index.set_state(
+                            all_servers(indexed_groups, indexed_default)[i],
+                            'available')
+                    continue
+
+                zones = r.sample(range(len(groups)),
+                                 r.randint(0, len(groups)))
+                roles = r.sample(ROLES, r.randint(1, 2))
+                use_default = r.random() < 0.7
+
+                server, zone = ServerGroup.get_server(
+                    [groups[i] for i in zones], 'available', roles,
+                    default if use_default else None)
+                indexed_server, indexed_zone = index.get_server(
+                    [indexed_groups[i] for i in zones], 'available', roles,
+                    indexed_default if use_default else None)
+
+                self.assertEqual(
+                    (server and server['id'], zone),
+                    (indexed_server and indexed_server['id'], indexed_zone),
+                    (seed, step))
+
+                # Allocate it, as the generator does
+                if server:
+                    server['state'] = 'allocated'
+                    indexed_server['state'] = 'allocated'
+
+    def test_added_sub_group(self):
+        parent = {'name': 'parent'}
+        index = ServerGroupIndex()
+        self.assertEqual(index.get_server([parent], 'available', ['A']),
+                         (None, None))
+
+        child = {'name': 'child'}
+        ServerGroup.add_group(parent, child)
+        server = {'id': 's1', 'role': 'A', 'state': 'available'}
+        ServerGroup.add_server(child, server)
+
+        self.assertEqual(index.get_server([parent], 'available', ['A']),
+                         (server, 'parent'))
+
+
+def add_networks(r, groups, default):
+    """Add networks to the groups in build_groups(), some of them None."""
+    for group in groups + [default]:
+        for i in range(r.randint(0, 3)):
+            network = '%s-net%d' % (group['name'], i)
+            ServerGroup.add_network(group, r.choice([network, None]),
+                                    'ng%d' % r.randint(0, 4))
+
+
+class TestServerGroupIndexZoneAndNetwork(unittest.TestCase):
+    def test_same_as_server_group(self):
+        for seed in range(300):
+            r = random.Random(seed)
+            groups, default = build_groups(r)
+            add_networks(r, groups, default)
+            index = ServerGroupIndex()
+
+            for step in range(40):
+                if r.random() < 0.1:
+                    # A new server, after the groups have been searched
+                    ServerGroup.add_server(
+                        r.choice(groups + [default]),
+                        {'id': 'new%d' % step, 'role': 'A',
+                         'state': 'available'})
+
+                zones = [groups[i] for i in r.sample(
+                    range(len(groups)), r.randint(0, len(groups)))]
+                use_default = default if r.random() < 0.7 else None
+                server_id = r.choice(['s%d' % r.randint(0, 32),
+                                      'new%d' % r.randint(0, 40)])
+                self.assertEqual(
+                    index.get_zone(zones, server_id, use_default),
+                    ServerGroup.get_zone(zones, server_id, use_default),
+                    (seed, step))
+
+                group = r.choice(groups + [None, {}])
+                net_group = 'ng%d' % r.randint(0, 5)
+                self.assertEqual(
+                    index.find_network(group, net_group, use_default),
+                    ServerGroup.find_network(group, net_group, use_default),
+                    (seed, step))
+
+    def test_nearest_network(self):
+        parent = {'name': 'parent'}
+        child = {'name': 'child'}
+        ServerGroup.add_group(parent, child)
+        ServerGroup.add_network(parent, 'parent-net', 'MGMT')
+        ServerGroup.add_network(parent, 'parent-ext', 'EXT')
+        ServerGroup.add_network(child, 'child-net', 'MGMT')
+
+        default = {'name': 'default'}
+        ServerGroup.add_network(default, 'default-net', 'OTHER')
+
+        index = ServerGroupIndex()
+        self.assertEqual(index.find_network(child, 'MGMT'), 'child-net')
+        self.assertEqual(index.find_network(child, 'EXT'), 'parent-ext')
+        self.assertEqual(index.find_network(parent, 'MGMT'), 'parent-net')
+        self.assertIsNone(index.find_network(child, 'OTHER'))
+        self.assertEqual(index.find_network(child, 'OTHER', default),
+                         'default-net')
+
+
+if __name__ == '__main__':
+    unittest.main()
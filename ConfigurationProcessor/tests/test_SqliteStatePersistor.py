@@ -0,0 +1,136 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from helion_configurationprocessor.cp.model.SqliteStatePersistor \
+    import SqliteStatePersistor
+from helion_configurationprocessor.cp.model.StatePersistor \
+    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
+
+from .StatePersistorTestUtils import CloudConfig
+from .StatePersistorTestUtils import random_operations
+
+
+class TestSqliteStatePersistor(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'persistent_state') + os.sep
+        self._controllers = {'CloudConfig': CloudConfig(self._path)}
+
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+
+    def tearDown(self):
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+        shutil.rmtree(self._dir)
+
+    def _persistor(self, path=None):
+        return SqliteStatePersistor(None, self._controllers, 'test.yml',
+                                    persistence_path=path or self._path,
+                                    write_behind=True)
+
+    def _write_yaml(self, data):
+        if not os.path.isdir(self._path):
+            os.makedirs(self._path)
+
+        with open(self._path + 'test.yml', 'w') as fp:
+            yaml.safe_dump(data, fp)
+
+    def _read_yaml(self):
+        with open(self._path + 'test.yml') as fp:
+            return yaml.safe_load(fp)
+
+    def test_same_as_yaml(self):
+        yaml_path = os.path.join(self._dir, 'yaml') + os.sep
+        for seed in range(20):
+            persistors = [
+                StatePersistor(None, None, 'test%d.yml' % seed,
+                               persistence_path=yaml_path,
+                               write_behind=True),
+                SqliteStatePersistor(None, None, 'test%d.yml' % seed,
+                                     persistence_path=self._path,
+                                     write_behind=True)]
+
+            for recalled in random_operations(persistors, seed):
+                self.assertEqual(recalled[0], recalled[1])
+
+            # What was committed is what a new persistor sees
+            for persistor in persistors:
+                persistor.commit()
+
+            self.assertEqual(
+                StatePersistor(None, None, 'test%d.yml' % seed,
+                               persistence_path=yaml_path).recall_info(),
+                SqliteStatePersistor(None, None, 'test%d.yml' % seed,
+                                     persistence_path=self._path
+                                     ).recall_info())
+
+    def test_imports_yaml(self):
+        self._write_yaml({'a': 1, 'b': {'c': 2}})
+
+        self.assertEqual(self._persistor().recall_info(),
+                         {'a': 1, 'b': {'c': 2}})
+
+    def test_keeps_changes_over_unchanged_yaml(self):
+        self._write_yaml({'a': 1})
+
+        with self._persistor() as persistor:
+            persistor.persist_info({'a': 2})
+
+        self.assertEqual(self._persistor().recall_info(), {'a': 2})
+
+    def test_reimports_changed_yaml(self):
+        self._write_yaml({'a': 1, 'b': 2})
+
+        persistor = self._persistor()
+        persistor.persist_info({'c': 3})
+        persistor.export_yaml()
+
+        self._write_yaml({'a': 99})
+        self.assertEqual(self._persistor().recall_info(), {'a': 99})
+
+    def test_export_all_opens_persisted_files(self):
+        with self._persistor() as persistor:
+            persistor.persist_info({'a': 1})
+
+        self.assertFalse(os.path.exists(self._path + 'test.yml'))
+
+        # As in a run that only checkpoints, where nothing has opened the
+        # persistent state
+        StatePersistorRegistry.clear()
+        StatePersistorRegistry.configure(
+            {'persistent_state_backend': 'sqlite'})
+        StatePersistorRegistry.export_all(None, self._controllers)
+
+        self.assertEqual(self._read_yaml(), {'a': 1})
+
+        # The export is not imported again over later changes
+        with self._persistor() as persistor:
+            persistor.persist_info({'a': 2})
+
+        self.assertEqual(self._persistor().recall_info(), {'a': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
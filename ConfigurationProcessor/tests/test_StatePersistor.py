@@ -0,0 +1,138 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from helion_configurationprocessor.cp.model.StatePersistor \
+    import StatePersistor
+from helion_configurationprocessor.cp.model.StatePersistorRegistry \
+    import StatePersistorRegistry
+
+from .StatePersistorTestUtils import CloudConfig
+
+
+class TestStatePersistor(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'persistent_state') + os.sep
+        self._controllers = {'CloudConfig': CloudConfig(self._path)}
+
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+
+    def tearDown(self):
+        StatePersistorRegistry.clear()
+        StatePersistor._uncommitted.clear()
+        shutil.rmtree(self._dir)
+
+    def _persistor(self, write_behind=False):
+        return StatePersistor(None, self._controllers, 'test.yml',
+                              write_behind=write_behind)
+
+    def _read_yaml(self):
+        with open(self._path + 'test.yml') as fp:
+            return yaml.safe_load(fp)
+
+    def test_write_through(self):
+        persistor = self._persistor()
+        self.assertEqual(persistor.persistence_file, self._path + 'test.yml')
+        self.assertEqual(persistor.recall_info(), dict())
+
+        persistor.persist_info({'a': {'id': 1}, 'b': {'id': 2}})
+        self.assertEqual(self._read_yaml(), {'a': {'id': 1}, 'b': {'id': 2}})
+
+        persistor.delete_info(['a', 'missing'])
+        self.assertEqual(self._read_yaml(), {'b': {'id': 2}})
+        self.assertEqual(persistor.recall_info(['b', 'id']), 2)
+
+        self.assertEqual(self._persistor().recall_info(), {'b': {'id': 2}})
+
+    def test_commit(self):
+        persistor = self._persistor(write_behind=True)
+        persistor.persist_info({'a': 1})
+        persistor.persist_info({'b': 2})
+        persistor.delete_info(['a'])
+
+        self.assertFalse(os.path.exists(self._path + 'test.yml'))
+        self.assertEqual(persistor.recall_info(), {'b': 2})
+
+        persistor.commit()
+        self.assertEqual(self._read_yaml(), {'b': 2})
+        self.assertNotIn(persistor, StatePersistor._uncommitted)
+
+    def test_rollback(self):
+        persistor = self._persistor(write_behind=True)
+        persistor.persist_info({'a': 1})
+        persistor.commit()
+
+        persistor.persist_info({'a': 2, 'b': 3})
+        persistor.rollback()
+        self.assertEqual(persistor.recall_info(), {'a': 1})
+        self.assertEqual(self._read_yaml(), {'a': 1})
+        self.assertNotIn(persistor, StatePersistor._uncommitted)
+
+    def test_context_manager(self):
+        with self._persistor(write_behind=True) as persistor:
+            persistor.persist_info({'a': 1})
+        self.assertEqual(self._read_yaml(), {'a': 1})
+
+        try:
+            with persistor:
+                persistor.persist_info({'a': 2})
+                raise ValueError()
+        except ValueError:
+            pass
+
+        self.assertEqual(persistor.recall_info(), {'a': 1})
+        self.assertEqual(self._read_yaml(), {'a': 1})
+
+    def test_commit_all(self):
+        persistors = [
+            StatePersistor(None, self._controllers, 'test%d.yml' % i,
+                           write_behind=True) for i in range(3)]
+        for i, persistor in enumerate(persistors[:2]):
+            persistor.persist_info({'id': i})
+
+        self.assertEqual(StatePersistor._uncommitted, set(persistors[:2]))
+        StatePersistor.commit_all()
+        self.assertEqual(StatePersistor._uncommitted, set())
+
+        for i in range(2):
+            with open(self._path + 'test%d.yml' % i) as fp:
+                self.assertEqual(yaml.safe_load(fp), {'id': i})
+        self.assertFalse(os.path.exists(self._path + 'test2.yml'))
+
+    def test_failed_write_leaves_file(self):
+        persistor = self._persistor()
+        persistor.persist_info({'a': 1})
+        mode = os.stat(persistor.persistence_file).st_mode
+
+        self.assertRaises(yaml.representer.RepresenterError,
+                          persistor.persist_info, {'a': object()})
+        self.assertEqual(self._read_yaml(), {'a': 1})
+        self.assertEqual(os.listdir(self._path), ['test.yml'])
+
+        persistor.persist_info({'a': 2})
+        self.assertEqual(self._read_yaml(), {'a': 2})
+        self.assertEqual(os.stat(persistor.persistence_file).st_mode, mode)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import unittest
+
+from helion_configurationprocessor.cp.model.PluginRegistry \
+    import PluginRegistry
+from helion_configurationprocessor.cp.model.ValidatorPlugin \
+    import ValidatorPlugin
+from helion_configurationprocessor.cp.processor.ValidatorProcessor \
+    import ValidatorProcessor
+from helion_configurationprocessor.plugins.validators.EncryptionKeyValidator \
+    import EncryptionKeyValidator
+
+
+NAMESPACE = 'helion.configurationprocessor.validator'
+
+
+class _TestValidator(ValidatorPlugin):
+    def __init__(self, instructions, config_files, slug):
+        super(_TestValidator, self).__init__(
+            2.0, instructions, config_files, slug)
+
+    def validate(self):
+        # Record where the validator ran and what it was told about the
+        # validators before it
+        self.add_warning('validated in %d' % os.getpid())
+        self.add_warning('success %s' % sorted(
+            self._instructions['validator_success'].items()))
+        return True
+
+
+class FirstValidator(_TestValidator):
+    def __init__(self, instructions, config_files):
+        super(FirstValidator, self).__init__(
+            instructions, config_files, 'first')
+
+
+class FailingValidator(_TestValidator):
+    def __init__(self, instructions, config_files):
+        super(FailingValidator, self).__init__(
+            instructions, config_files, 'failing')
+
+    def validate(self):
+        self.add_error('failed')
+        return False
+
+
+class SecondValidator(_TestValidator):
+    def __init__(self, instructions, config_files):
+        super(SecondValidator, self).__init__(
+            instructions, config_files, 'second')
+
+    def get_dependencies(self):
+        return ['first']
+
+
+class SkippedValidator(_TestValidator):
+    def __init__(self, instructions, config_files):
+        super(SkippedValidator, self).__init__(
+            instructions, config_files, 'skipped')
+
+    def get_dependencies(self):
+        return ['failing']
+
+
+class KeyValidator(EncryptionKeyValidator):
+    # Keeps is_parallel_safe() from EncryptionKeyValidator
+    def validate(self):
+        self.add_warning('validated in %d' % os.getpid())
+        return super(KeyValidator, self).validate()
+
+
+class TestValidatorProcessor(unittest.TestCase):
+    def setUp(self):
+        PluginRegistry.clear()
+        PluginRegistry._namespaces[NAMESPACE] = {
+            'first': FirstValidator,
+            'failing': FailingValidator,
+            'second': SecondValidator,
+            'skipped': SkippedValidator,
+            'encryption-key': KeyValidator}
+
+    def tearDown(self):
+        PluginRegistry.clear()
+
+    def _validate(self, workers):
+        instructions = {
+            'validators': ['skipped', 'second', 'encryption-key',
+                           'failing', 'first'],
+            'validator_workers': workers,
+            'model_version': 2.0,
+            'cloud_input_path': '/nonexistent/cloud.yml'}
+
+        processor = ValidatorProcessor(instructions, dict())
+        processor.process()
+
+        return processor, instructions
+
+    def _driver(self, processor, name):
+        return processor.load_plugin('validator', name, None).driver
+
+    def _check_validate(self, workers):
+        processor, instructions = self._validate(workers)
+
+        success = {
+            'first': True,
+            'failing': False,
+            'second': True,
+            'skipped': False,
+            'encryption-key': True}
+        self.assertEqual(instructions['validator_success'], success)
+
+        # The validators in the first level had finished, and their
+        # success recorded, before the second level was started
+        second = self._driver(processor, 'second')
+        self.assertEqual(second.warnings[1],
+                         'success %s' % sorted(success.items()))
+
+        # The warnings and errors of each validator are reported
+        self.assertFalse(processor.ok)
+        self.assertEqual(len(processor.errors), 1)
+        self.assertIn('failing', processor.errors[0])
+        self.assertIn('failed', processor.errors[0])
+        self.assertEqual(len(processor.warnings), 3)
+        self.assertFalse(self._driver(processor, 'skipped').warnings)
+
+        # The encryption key validator prints to the console, so it is
+        # always run in this process
+        key = self._driver(processor, 'encryption-key')
+        self.assertEqual(key.warnings, ['validated in %d' % os.getpid()])
+
+        return self._driver(processor, 'first')
+
+    def test_serial_validate(self):
+        first = self._check_validate(1)
+        self.assertEqual(first.warnings[0], 'validated in %d' % os.getpid())
+
+    def test_parallel_validate(self):
+        first = self._check_validate(2)
+        self.assertNotEqual(first.warnings[0],
+                            'validated in %d' % os.getpid())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#
+# (c) Copyright 2015 Hewlett Packard Enterprise Development Company LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from helion_configurationprocessor.cp.model.YamlConfigFile \
+    import YamlConfigFile
+
+
+class TestYamlConfigFile(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _load(self, text, check_duplicates=True):
+        path = os.path.join(self._dir, 'input.yml')
+        with open(path, 'w') as fp:
+            fp.write(text)
+
+        config_file = YamlConfigFile('config_file', path)
+        config_file.load(check_duplicates=check_duplicates)
+        return config_file
+
+    def test_same_as_safe_load(self):
+        text = ('product:\n'
+                '  version: 2\n'
+                'defaults: &defaults\n'
+                '  mtu: 1500\n'
+                '  tagged: false\n'
+                'networks:\n'
+                '  - name: MGMT\n'
+                '    <<: *defaults\n'
+                '    cidr: 10.0.0.0/24\n'
+                '  - name: EXT\n'
+                '    <<: *defaults\n'
+                '    mtu: 9000\n'
+                'count: 3\n'
+                'ratio: 0.5\n'
+                'empty:\n')
+
+        config_file = self._load(text)
+        self.assertTrue(config_file.is_loaded)
+        self.assertEqual(config_file.contents, yaml.safe_load(text))
+        self.assertEqual(config_file.warnings, [])
+        self.assertEqual(config_file.errors, [])
+
+    def test_duplicate_keys(self):
+        text = ('name: first\n'
+                'servers:\n'
+                '  - id: one\n'
+                '    id: two\n'
+                'name: second\n')
+
+        config_file = self._load(text)
+        self.assertTrue(config_file.is_loaded)
+        self.assertTrue(config_file.is_valid())
+        self.assertEqual(config_file.contents,
+                         {'name': 'second', 'servers': [{'id': 'two'}]})
+
+        self.assertEqual(len(config_file.warnings), 1)
+        warning = config_file.warnings[0]
+        self.assertTrue(warning.startswith(
+            'Found issues in file %s\n' % config_file.path))
+        self.assertIn('found duplicate key (name)', warning)
+        self.assertIn('found duplicate key (id)', warning)
+
+    def test_duplicate_keys_not_checked(self):
+        config_file = self._load('name: first\nname: second\n',
+                                 check_duplicates=False)
+        self.assertEqual(config_file.contents, {'name': 'second'})
+        self.assertEqual(config_file.warnings, [])
+
+    def test_merge_keys_not_reported(self):
+        text = ('base: &base\n'
+                '  a: 1\n'
+                'other: &other\n'
+                '  b: 2\n'
+                'merged:\n'
+                '  <<: *base\n'
+                '  <<: *other\n'
+                '  a: 3\n')
+
+        config_file = self._load(text)
+        self.assertEqual(config_file.warnings, [])
+        self.assertEqual(config_file.contents['merged']['a'], 3)
+
+    def test_unparseable_file(self):
+        config_file = self._load('? [one, two]\n: servers\n')
+        self.assertFalse(config_file.is_loaded)
+        self.assertFalse(config_file.is_valid())
+        self.assertEqual(len(config_file.errors), 1)
+        self.assertTrue(config_file.errors[0].startswith(
+            'Cannot parse file %s\n' % config_file.path))
+
+    def test_only_safe_tags(self):
+        config_file = self._load(
+            'value: !!python/object/apply:os.getcwd []\n')
+        self.assertFalse(config_file.is_loaded)
+        self.assertEqual(len(config_file.errors), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
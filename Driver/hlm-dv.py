@@ -16,6 +16,7 @@
 import os
 import sys
 import getpass
+import multiprocessing
 
 from helion_configurationprocessor.cp.model.CPSecurity \
     import CPSecurity
@@ -33,28 +34,14 @@ def _get_options():
     return user_instructions
 
 
-def _decrypt_file(instructions, file_name):
-    fp = open(file_name, 'r')
-    lines = fp.readlines()
-    fp.close()
-
+def _decrypt_file(file_name, lines, plaintexts):
     need_to_write = False
     for i in range(len(lines)):
-        line = lines[i]
-        if line.find('='):
+        line = CPSecurity.replace_tokens(lines[i], plaintexts)
+        if line != lines[i]:
+            lines[i] = line
             need_to_write = True
 
-            tokens = line.split()
-            for t in tokens:
-                if t.endswith('='):
-                    plaintext = CPSecurity.decrypt(
-                        instructions['encryption_key'], t)
-                    if plaintext is None:
-                        print('error: Incorrect Decryption Key')
-                        sys.exit(-1)
-
-                    lines[i] = line.replace(t, plaintext)
-
     if need_to_write:
         print('Updating %s' % file_name)
         fp = open(file_name, 'w')
@@ -64,11 +51,33 @@ def _decrypt_file(instructions, file_name):
 
 
 def _decrypt_directory(instructions, directory):
+    contents = []
     for root, dirs, files in os.walk(directory):
         for f in files:
             file_name = os.path.join(root, f)
             if os.path.isfile(file_name):
-                _decrypt_file(instructions, file_name)
+                fp = open(file_name, 'r')
+                contents.append((file_name, fp.readlines()))
+                fp.close()
+
+    # Decrypt the tokens of all of the files in one batch
+    tokens = set()
+    for file_name, lines in contents:
+        for line in lines:
+            tokens.update(CPSecurity.find_tokens(line))
+
+    tokens = sorted(tokens)
+    plaintexts = CPSecurity.decrypt_many(
+        instructions['encryption_key'], tokens,
+        workers=multiprocessing.cpu_count())
+
+    if None in plaintexts:
+        print('error: Incorrect Decryption Key')
+        sys.exit(-1)
+
+    plaintexts = dict(zip(tokens, plaintexts))
+    for file_name, lines in contents:
+        _decrypt_file(file_name, lines, plaintexts)
 
 
 if __name__ == "__main__":